@@ -0,0 +1,171 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - CacheEntry (line 35):
+        - content_digest(content: Union[str, Iterable[str]]) -> str (line 42)
+        - HeaderCache (line 52):
+            - load(cls, path: Path, options: Optional[Dict[str, Any]] = None) -> 'HeaderCache' (line 80)
+            - save() -> None (line 106)
+            - _key(path: Path) -> str (line 123)
+            - is_fresh(path: Path) -> bool (line 126)
+            - matches(path: Path, content: Union[str, Iterable[str]]) -> bool (line 141)
+            - record(path: Path, content: Union[str, Iterable[str]]) -> None (line 146)
+            - subset(paths: Iterable[Path]) -> 'HeaderCache' (line 157)
+            - merge(other: 'HeaderCache') -> None (line 167)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+
+from . import __version__
+
+# * Default cache file name, created in the current working directory
+CACHE_FILE_NAME = ".agent-docstrings-cache"
+# ! Bump whenever a parser or header change alters output without a release
+PARSER_VERSION = 2
+
+
+class CacheEntry(NamedTuple):
+    """Stores the state of a file whose header was current after the last run."""
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def content_digest(content: Union[str, Iterable[str]]) -> str:
+    """Return a short, stable hash of *content*, given whole or in chunks."""
+    if isinstance(content, str):
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in content:
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class HeaderCache:
+    """In-memory view of the on-disk cache of files with a current header.
+
+    Entries are keyed by absolute path and store the file size, modification
+    time and a hash of the content written (or confirmed) by the last run. A
+    matching ``stat`` lets :func:`agent_docstrings.core.process_file` skip
+    reading, parsing and formatting the file entirely; a changed ``stat`` with
+    an unchanged content hash still skips parsing. The whole cache is discarded
+    when the package version, :data:`PARSER_VERSION` or any output-affecting
+    option differs from the run that wrote it.
+
+    Args:
+        path (Path): Location of the cache file.
+        options (Optional[Dict[str, Any]]): Output-affecting options of the
+            current run. A cache written with different options is discarded.
+    """
+
+    def __init__(self, path: Path, options: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.options: Dict[str, Any] = dict(options or {})
+        self.entries: Dict[str, CacheEntry] = {}
+        # * Modification time of the cache file when it was loaded. Files with
+        # * an mtime at or after it may have been edited again within the same
+        # * timestamp tick, so their ``stat`` alone cannot be trusted.
+        self.saved_ns = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, options: Optional[Dict[str, Any]] = None) -> "HeaderCache":
+        """Load the cache at *path*, returning an empty cache if it is unusable."""
+        cache = cls(path, options)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+                saved_ns = os.fstat(f.fileno()).st_mtime_ns
+        except (OSError, ValueError):
+            return cache
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != __version__
+            or data.get("parser_version") != PARSER_VERSION
+            or data.get("options") != cache.options
+        ):
+            return cache
+        try:
+            cache.entries = {
+                key: CacheEntry(*value) for key, value in data["entries"].items()
+            }
+        except (KeyError, TypeError, ValueError):
+            cache.entries = {}
+            return cache
+        cache.saved_ns = saved_ns
+        return cache
+
+    def save(self) -> None:
+        """Write the cache back to disk if it changed since it was loaded."""
+        if not self.dirty:
+            return
+        data = {
+            "version": __version__,
+            "parser_version": PARSER_VERSION,
+            "options": self.options,
+            "entries": {key: list(entry) for key, entry in self.entries.items()},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def is_fresh(self, path: Path) -> bool:
+        """Return *True* if *path* is unchanged according to ``stat`` alone."""
+        entry = self.entries.get(self._key(path))
+        if entry is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (
+            st.st_size == entry.size
+            and st.st_mtime_ns == entry.mtime_ns
+            and entry.mtime_ns < self.saved_ns
+        )
+
+    def matches(self, path: Path, content: Union[str, Iterable[str]]) -> bool:
+        """Return *True* if *content* equals the content recorded for *path*."""
+        entry = self.entries.get(self._key(path))
+        return entry is not None and entry.digest == content_digest(content)
+
+    def record(self, path: Path, content: Union[str, Iterable[str]]) -> None:
+        """Remember that *path* currently holds *content* with a current header."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self.entries[self._key(path)] = CacheEntry(
+            size=st.st_size, mtime_ns=st.st_mtime_ns, digest=content_digest(content)
+        )
+        self.dirty = True
+
+    def subset(self, paths: Iterable[Path]) -> "HeaderCache":
+        """Return a copy restricted to *paths*, suitable for a worker process."""
+        part = HeaderCache(self.path, self.options)
+        part.saved_ns = self.saved_ns
+        for path in paths:
+            key = self._key(path)
+            if key in self.entries:
+                part.entries[key] = self.entries[key]
+        return part
+
+    def merge(self, other: "HeaderCache") -> None:
+        """Merge entries recorded by a worker's :meth:`subset` copy."""
+        if other.dirty:
+            self.entries.update(other.entries)
+            self.dirty = True
@@ -7,11 +7,33 @@
     --- END AUTO-GENERATED DOCSTRING ---
 """
 import argparse
+import json
+import re
 import sys
 from pathlib import Path
 
 from . import core
+from .git import GitError
 from . import __version__
+from .cache import CACHE_FILE_NAME
+from .profiling import Profiler
+
+
+# * Multipliers of the suffixes accepted by --max-file-size
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+_SIZE_RE = re.compile(r"(\d+)([KMG]?)", re.IGNORECASE)
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte count such as ``"2000"``, ``"512K"`` or ``"4M"``.
+
+    Raises:
+        argparse.ArgumentTypeError: If *text* is not a size.
+    """
+    match = _SIZE_RE.fullmatch(text.strip())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
 
 
 def main():
@@ -21,10 +43,21 @@ def main():
     generated by *setuptools* and the internal API provided by
     :pymod:`agent_docstrings.core`.
     """
+    if sys.argv[1:2] == ["watch"]:
+        from . import watch
+
+        watch.main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["serve"]:
+        from . import server
+
+        server.main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Generate file-level docstrings summarizing classes and functions.",
         formatter_class=argparse.RawTextHelpFormatter,
-        epilog="Example:\n  agent-docstrings ./src ./libs"
+        epilog="Example:\n  agent-docstrings ./src ./libs\n  agent-docstrings watch ./src\n  agent-docstrings serve"
     )
     parser.add_argument(
         "paths",
@@ -48,6 +81,94 @@ def main():
         action="store_true",
         help="Enable experimental beta features that may have breaking changes."
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Process files with N worker processes (0 = one per CPU, default: 1).",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=CACHE_FILE_NAME,
+        default=None,
+        metavar="FILE",
+        help=(
+            "Skip files that are unchanged since the last run, using a cache\n"
+            f"stored in FILE (default: {CACHE_FILE_NAME})."
+        ),
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=core.DISCOVERY_MODES,
+        default="walk",
+        help=(
+            "How to find files in directories: 'walk' the file system, or list\n"
+            "the files of the git work tree with git ('git'; falls back to\n"
+            "walking outside a repository). Default: walk."
+        ),
+    )
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--changed-since",
+        metavar="REF",
+        default=None,
+        help=(
+            "Only process files changed since the merge base of REF and HEAD,\n"
+            "including uncommitted and untracked files (requires git)."
+        ),
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only process files with staged changes (requires git).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Do not write files; list files with stale headers and exit with 1 if any, or if a file fails.",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Do not write files; print a unified diff for every stale header and exit with 1 if any, or if a file fails.",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="Embed a hash of the code in every header and skip parsing files whose hash matches.",
+    )
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="Flush every written file to disk before it replaces the original.",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        metavar="SIZE",
+        type=parse_size,
+        default=None,
+        help="Skip files larger than SIZE bytes; K, M and G suffixes are accepted.",
+    )
+    parser.add_argument(
+        "--no-sniff",
+        dest="sniff",
+        action="store_false",
+        help="Do not skip files whose first bytes look binary or minified.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage timings, per-language totals and the slowest files.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="FILE",
+        default=None,
+        help="Write the profiling report as JSON to FILE ('-' for stdout).",
+    )
 
     args = parser.parse_args()
 
@@ -61,7 +182,63 @@ def main():
             print(f"Error: Path is not a file or directory at '{p_str}'", file=sys.stderr)
             sys.exit(1)
 
-    core.discover_and_process_files(args.paths, args.verbose, args.beta)
+    if args.jobs < 0:
+        print("Error: --jobs must be zero or a positive integer", file=sys.stderr)
+        sys.exit(1)
+
+    profiler = Profiler() if args.profile or args.profile_json else None
+    try:
+        worker_stats = core.discover_and_process_files(
+            args.paths,
+            args.verbose,
+            args.beta,
+            jobs=args.jobs,
+            cache_file=args.cache,
+            profiler=profiler,
+            discovery=args.discovery,
+            changed_since=args.changed_since,
+            staged=args.staged,
+            check=args.check,
+            diff=args.diff,
+            fingerprint=args.fingerprint,
+            fsync=args.fsync,
+            max_file_size=args.max_file_size,
+            sniff=args.sniff,
+        )
+    except GitError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    # * Keep stdout a clean report with --check and --diff
+    log = sys.stderr if args.check or args.diff else sys.stdout
+    if args.verbose and args.jobs != 1 and worker_stats:
+        for stats in worker_stats.values():
+            print(
+                f"Worker {stats.pid}: {stats.files} files in {stats.chunks} chunks "
+                f"({stats.seconds:.2f}s)",
+                file=log,
+            )
+    if profiler is not None:
+        profiler.stop()
+        if args.profile:
+            print(profiler.format_table(), file=log)
+        if args.profile_json == "-":
+            print(json.dumps(profiler.to_dict(), indent=2))
+        elif args.profile_json:
+            Path(args.profile_json).write_text(
+                json.dumps(profiler.to_dict(), indent=2), encoding="utf-8"
+            )
+    if args.check or args.diff:
+        stale = sum(stats.stale for stats in worker_stats.values())
+        failed = sum(stats.failed for stats in worker_stats.values())
+        if stale:
+            print(f"{stale} file(s) would be updated.", file=sys.stderr)
+        if failed:
+            print(f"{failed} file(s) could not be processed.", file=sys.stderr)
+        if stale or failed:
+            sys.exit(1)
+        if args.diff:
+            # * Keep stdout a clean patch
+            return
     print("Done.")
 
 if __name__ == "__main__":
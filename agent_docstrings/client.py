@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - default_socket_path() -> Path (line 36)
+        - ServerError (line 52):
+        - Client (line 56):
+            - __enter__() -> 'Client' (line 84)
+            - __exit__(*exc_info: object) -> None (line 87)
+            - close() -> None (line 90)
+            - request(op: str, **fields: Any) -> Dict[str, Any] (line 94)
+            - process(paths: List[str], **options: Any) -> str (line 110)
+            - toc(text: str, name: str) -> Dict[str, Any] (line 115)
+        - _process_locally(args: argparse.Namespace) -> None (line 120)
+        - main(argv: Optional[List[str]] = None) -> None (line 136)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# ! Keep this module free of imports from the rest of the package: the client
+# ! exists to avoid loading the parsers on every invocation.
+
+SOCKET_ENV = "AGENT_DOCSTRINGS_SOCKET"
+CONNECT_TIMEOUT = 1.0
+
+
+def default_socket_path() -> Path:
+    """Return the socket the server listens on by default.
+
+    ``$AGENT_DOCSTRINGS_SOCKET`` takes precedence, followed by a per-user
+    socket in ``$XDG_RUNTIME_DIR`` or the temporary directory.
+    """
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return Path(configured)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "agent-docstrings.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return Path(tempfile.gettempdir()) / f"agent-docstrings-{uid}.sock"
+
+
+class ServerError(RuntimeError):
+    """Raised when the server cannot be reached or rejects a request."""
+
+
+class Client:
+    """Connection to a running ``agent-docstrings serve`` process.
+
+    Requests and responses are single lines of JSON. One connection can send
+    any number of requests, so editors can keep it open.
+
+    Args:
+        socket_path (Optional[Path]): Socket of the server; see
+            :func:`default_socket_path`.
+
+    Raises:
+        ServerError: If no server is listening on the socket.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        if not hasattr(socket, "AF_UNIX"):
+            raise ServerError("Unix domain sockets are not supported on this platform")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            self._sock.connect(str(self.socket_path))
+        except OSError as e:
+            self._sock.close()
+            raise ServerError(f"No server listening on {self.socket_path}: {e}") from e
+        self._sock.settimeout(None)
+        self._file = self._sock.makefile("rwb")
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """Send a request and return the server's response.
+
+        Raises:
+            ServerError: If the connection is lost or the request failed.
+        """
+        self._file.write(json.dumps({"op": op, **fields}).encode("utf-8") + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ServerError("The server closed the connection")
+        response: Dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise ServerError(response.get("error", "request failed"))
+        return response
+
+    def process(self, paths: List[str], **options: Any) -> str:
+        """Process *paths* on the server and return the output it printed."""
+        resolved = [os.path.abspath(p) for p in paths]
+        output: str = self.request("process", paths=resolved, **options)["output"]
+        return output
+
+    def toc(self, text: str, name: str) -> Dict[str, Any]:
+        """Return the regenerated ``text`` and ``toc`` of a buffer named *name*."""
+        return self.request("toc", text=text, name=name)
+
+
+def _process_locally(args: argparse.Namespace) -> None:
+    from . import cli
+
+    argv = [*args.paths]
+    if args.verbose:
+        argv.append("--verbose")
+    if args.beta:
+        argv.append("--beta")
+    if args.changed_since:
+        argv += ["--changed-since", args.changed_since]
+    if args.staged:
+        argv.append("--staged")
+    sys.argv = ["agent-docstrings", *argv]
+    cli.main()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of ``agent-docstrings-client``."""
+    parser = argparse.ArgumentParser(
+        prog="agent-docstrings-client",
+        description="Send requests to a running 'agent-docstrings serve' process.",
+    )
+    parser.add_argument("paths", metavar="PATH", nargs="*", help="Files or directories to process.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+    parser.add_argument("--beta", action="store_true", help="Enable experimental beta features.")
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument("--changed-since", metavar="REF", help="Only process files changed since REF.")
+    changes.add_argument("--staged", action="store_true", help="Only process staged files.")
+    parser.add_argument(
+        "--toc",
+        metavar="NAME",
+        help="Print the table of contents of the buffer read from stdin; NAME selects the language.",
+    )
+    parser.add_argument("--socket", type=Path, help="Server socket (default: %s)." % default_socket_path())
+    parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Fail instead of processing in this process when no server is running.",
+    )
+    args = parser.parse_args(argv)
+    if not args.paths and not args.toc:
+        parser.error("PATH or --toc is required")
+
+    try:
+        client = Client(args.socket)
+    except ServerError as e:
+        if args.no_fallback or args.toc:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        _process_locally(args)
+        return
+
+    try:
+        with client:
+            if args.toc:
+                print(client.toc(sys.stdin.read(), args.toc)["toc"])
+                return
+            output = client.process(
+                args.paths,
+                verbose=args.verbose,
+                beta=args.beta,
+                changed_since=args.changed_since,
+                staged=args.staged,
+            )
+    except ServerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(output, end="")
+    print("Done.")
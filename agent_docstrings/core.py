@@ -16,23 +16,46 @@ from __future__ import annotations
     --- END AUTO-GENERATED DOCSTRING ---
 """
 import os
-import fnmatch
+import io
+import sys
+import time
+import contextlib
+import difflib
+import functools
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Callable, Dict, Tuple, Set
+from typing import (
+    List, Callable, Dict, Iterable, Iterator, Tuple, Set, NamedTuple, Optional, Sequence, TextIO, Union,
+    overload,
+)
 import re
 
 from . import __version__
 # * Template for the auto-generated header line
 DOCSTRING_HEADER_TEMPLATE = "Table of content is automatically generated by Agent Docstrings v{version}"
+# * Optional header line carrying a hash of the code outside the header
+FINGERPRINT_LABEL = "Fingerprint: "
+_FINGERPRINT_RE = re.compile(re.escape(FINGERPRINT_LABEL) + r"([0-9a-f]{16})\b")
+_FINGERPRINT_PLACEHOLDER = "0" * 16
 from .languages.common import (
     COMMENT_STYLES,
     ClassInfo,
     SignatureInfo,
-    remove_agent_docstring,
+    agent_docstring_end,
     DOCSTRING_START_MARKER,
     DOCSTRING_END_MARKER,
 )
-from .languages import generic, kotlin, python, java, go, powershell, delphi
+from .languages import generic, kotlin, python, java, go, powershell, delphi, treesitter
+from . import git
+from .cache import HeaderCache
+from .ignore import Gitignore, GitignoreStack, IgnoreRules, cached_rules, load_ancestor_gitignores
+from . import profiling
+from .profiling import Profiler
+from . import stream
+from .stream import MappedSource
+from .writer import FileWriter, WriteFailure, write_atomic
 
 DEFAULT_IGNORE_DIRS = {
     ".git",
@@ -50,6 +73,45 @@ DEFAULT_IGNORE_DIRS = {
     "obj",
 }
 
+# * File discovery strategies: walk the file system or ask git
+DISCOVERY_MODES = ("walk", "git")
+
+# * Upper bound on the number of files sent to a worker process at once
+MAX_CHUNK_SIZE = 256
+# * Number of Go files parsed by a single batched parser invocation
+GO_BATCH_SIZE = 256
+# * Files at least this large are processed through a memory-mapped view
+# * instead of being read into memory whole, and without syntax trees
+LARGE_FILE_SIZE = 4 * 1024 * 1024
+# * Initial and largest size of the region at the start of a large file that
+# * is decoded to find the preserved prefix and a previously generated header
+HEAD_SIZE = 64 * 1024
+MAX_HEAD_SIZE = 16 * 1024 * 1024
+# * Bytes read from the start of every file to detect binary and minified files
+SNIFF_SIZE = 8 * 1024
+# * A sniffed file with a line this long, and lines this long on average, is minified
+MINIFIED_LINE_LENGTH = 1000
+MINIFIED_AVERAGE_LINE_LENGTH = 200
+
+# * Header format of old versions, removed by agent_docstring_end()
+_LEGACY_PYTHON_HEADER_RE = re.compile(r'\s*"""\s*Classes/Functions:')
+
+
+class WorkerStats(NamedTuple):
+    """Stores aggregated processing statistics for a single worker process."""
+    pid: int
+    files: int
+    chunks: int
+    seconds: float
+    stale: int = 0
+    failed: int = 0
+
+
+class SkippedFile(NamedTuple):
+    """A discovered file that was not processed, and the reason."""
+    path: Path
+    reason: str
+
 
 def parse_gitignore(gitignore_path: Path) -> Set[str]:
     """Parse .gitignore file and return set of ignore patterns.
@@ -89,15 +151,11 @@ def is_path_ignored(path: Path, ignore_patterns: Set[str], root_dir: Path) -> bo
     """
     try:
         rel_path = path.relative_to(root_dir).as_posix()
-        for pattern in ignore_patterns:
-            if pattern.endswith("/") and path.is_dir():
-                if fnmatch.fnmatch(rel_path + "/", pattern):
-                    return True
-            elif fnmatch.fnmatch(rel_path, pattern.rstrip("/")):
-                return True
     except ValueError:
-        pass
-    return False
+        return False
+    rules = cached_rules(frozenset(ignore_patterns))
+    # * Only directory-only patterns need to know whether *path* is a directory
+    return rules.is_ignored(rel_path, rules.has_dir_patterns and path.is_dir())
 
 
 def load_blacklist_whitelist(directory: Path) -> Tuple[Set[str], Set[str]]:
@@ -159,15 +217,160 @@ def should_process_file(
         bool: True if file should be processed, False otherwise.
     """
     rel_path_str = file_path.relative_to(root_dir).as_posix()
-    if whitelist and not any(
-        fnmatch.fnmatch(rel_path_str, pattern) for pattern in whitelist
+    rules = cached_rules(
+        frozenset(ignore_patterns), frozenset(blacklist), frozenset(whitelist)
+    )
+    return rules.should_process(
+        rel_path_str, rules.has_dir_patterns and file_path.is_dir()
+    )
+
+
+def _scan_directory(
+    root: Path,
+    rules: IgnoreRules,
+    gitignores: Optional[GitignoreStack] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[Path]:
+    """Return the files below *root* that pass *rules* and the gitignore files.
+
+    Walks the tree with ``os.scandir`` so directory-ness comes from the
+    directory entries, and builds relative paths incrementally instead of
+    calling ``Path.relative_to`` per file. The ``.gitignore`` file of every
+    visited directory is loaded when the walk enters it and applies to that
+    subtree only; ignored directories are pruned without being listed. Like
+    ``os.walk``, symbolic links to directories are not followed and
+    unreadable directories are skipped.
+    """
+    found: List[Path] = []
+    stack = [(str(root), "", gitignores or GitignoreStack())]
+    while stack:
+        directory, rel_dir, scope = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        with profiling.stage(profiler, "ignore"):
+            for entry in entries:
+                if entry.name == ".gitignore" and entry.is_file():
+                    scope = scope.push(Gitignore.from_file(Path(entry.path), strip=len(rel_dir)))
+                    break
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if (
+                        entry.name not in DEFAULT_IGNORE_DIRS
+                        and not entry.is_symlink()
+                        and not rules.is_ignored(rel_path, True)
+                        and not scope.is_ignored(rel_path, True)
+                    ):
+                        subdirs.append((entry.path, rel_path + "/", scope))
+                elif rules.should_process(rel_path) and not scope.is_ignored(rel_path):
+                    found.append(Path(entry.path))
+        stack.extend(reversed(subdirs))
+    return found
+
+
+def sniff_file(
+    path: Path, max_file_size: Optional[int] = None, content: bool = True
+) -> Optional[str]:
+    """Return why *path* should not be processed, or None if it should.
+
+    Only the size and the first :data:`SNIFF_SIZE` bytes of the file are
+    read, so pathological files are rejected before they are read whole and
+    scanned by the parsers.
+
+    Args:
+        path (Path): File to check.
+        max_file_size (Optional[int], optional): Reject files larger than this
+            many bytes.
+        content (bool, optional): Reject files whose first bytes contain a NUL
+            byte (binary files) or look minified: a line of at least
+            :data:`MINIFIED_LINE_LENGTH` characters, with lines of at least
+            :data:`MINIFIED_AVERAGE_LINE_LENGTH` characters on average.
+
+    Returns:
+        Optional[str]: The reason to skip the file. Files that cannot be read
+        are not rejected here; :func:`process_file` reports their error.
+    """
+    if max_file_size is not None:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return None
+        if size > max_file_size:
+            return f"larger than {max_file_size} bytes ({size} bytes)"
+    if not content:
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        # * os.pread is not available on Windows, where the fresh descriptor is read instead
+        sample = os.pread(fd, SNIFF_SIZE, 0) if hasattr(os, "pread") else os.read(fd, SNIFF_SIZE)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    if b"\0" in sample:
+        return "binary content"
+    lines = sample.splitlines()
+    if (
+        lines
+        and max(map(len, lines)) >= MINIFIED_LINE_LENGTH
+        and len(sample) / len(lines) >= MINIFIED_AVERAGE_LINE_LENGTH
     ):
-        return False
-    if any(fnmatch.fnmatch(rel_path_str, pattern) for pattern in blacklist):
-        return False
-    if is_path_ignored(file_path, ignore_patterns, root_dir):
-        return False
-    return True
+        return "minified (long lines)"
+    return None
+
+
+def _sniff_files(
+    files: List[Path],
+    max_file_size: Optional[int],
+    content: bool,
+    profiler: Optional[Profiler] = None,
+    cache: Optional[HeaderCache] = None,
+) -> Tuple[List[Path], List[SkippedFile]]:
+    """Split *files* into those to process and those rejected by :func:`sniff_file`.
+
+    Files that are fresh in *cache* are skipped by processing without being
+    read, so only their size is checked and they are not opened.
+    """
+    kept: List[Path] = []
+    skipped: List[SkippedFile] = []
+    with profiling.stage(profiler, "sniff"):
+        for file_path in files:
+            fresh = cache is not None and cache.is_fresh(file_path)
+            reason = sniff_file(file_path, max_file_size, content and not fresh)
+            if reason is None:
+                kept.append(file_path)
+            else:
+                skipped.append(SkippedFile(file_path, reason))
+    return kept, skipped
+
+
+def _log_stream(dry_run: bool) -> TextIO:
+    """Return the stream for messages other than the report of a run.
+
+    With ``--check`` and ``--diff`` stdout only carries the stale files or
+    the patch, so that it can be piped, e.g. to ``git apply``.
+    """
+    return sys.stderr if dry_run else sys.stdout
+
+
+def _report_skipped(skipped: List[SkippedFile], dry_run: bool) -> None:
+    if not skipped:
+        return
+    out = _log_stream(dry_run)
+    print(f"Skipped {len(skipped)} file(s):", file=out)
+    for skipped_file in skipped:
+        print(f"  {skipped_file.path}: {skipped_file.reason}", file=out)
 
 
 # Mappings from file extension to language name and parser function
@@ -193,33 +396,71 @@ EXT_TO_LANG: Dict[str, str] = {
 }
 
 LANG_PARSERS: Dict[
-    str, Callable[[List[str]], Tuple[List[ClassInfo], List[SignatureInfo]]]
+    str, Callable[[Iterable[str]], Tuple[List[ClassInfo], List[SignatureInfo]]]
 ] = {
     "python": python.parse_python_file,
-    "kotlin": kotlin.parse_kotlin_file,
-    "javascript": lambda lines: generic.parse_generic_file(lines, "javascript"),
-    "typescript": lambda lines: generic.parse_generic_file(lines, "typescript"),
-    "csharp": lambda lines: generic.parse_generic_file(lines, "csharp"),
-    "cpp": lambda lines: generic.parse_generic_file(lines, "cpp"),
-    "c": lambda lines: generic.parse_generic_file(lines, "cpp"),  # C can be parsed like C++ (for functions)
-    "java": java.parse_java_file,
+    # * The tree-sitter backend falls back to the regex parsers without its grammars
+    "kotlin": treesitter.TreeSitterParser("kotlin", kotlin.parse_kotlin_file),
+    "javascript": treesitter.TreeSitterParser(
+        "javascript", lambda lines: generic.parse_generic_file(lines, "javascript")
+    ),
+    "typescript": treesitter.TreeSitterParser(
+        "typescript", lambda lines: generic.parse_generic_file(lines, "typescript")
+    ),
+    "csharp": treesitter.TreeSitterParser("csharp", lambda lines: generic.parse_generic_file(lines, "csharp")),
+    "cpp": treesitter.TreeSitterParser("cpp", lambda lines: generic.parse_generic_file(lines, "cpp")),
+    # C can be parsed like C++ (for functions)
+    "c": treesitter.TreeSitterParser("c", lambda lines: generic.parse_generic_file(lines, "cpp")),
+    "java": treesitter.TreeSitterParser("java", java.parse_java_file),
     "go": go.parse_go_file,
     "powershell": powershell.parse_powershell_file,
     "delphi": delphi.parse_delphi_file,
 }
 
 
+def _line_parser(
+    parser: Callable[[Iterable[str]], Tuple[List[ClassInfo], List[SignatureInfo]]],
+) -> Callable[[Iterable[str]], Tuple[List[ClassInfo], List[SignatureInfo]]]:
+    """Return the regex parser behind *parser* if it is a tree-sitter backend.
+
+    Used for files of at least :data:`LARGE_FILE_SIZE` bytes. A syntax tree
+    needs the whole source in memory and takes about 40 times its size,
+    whereas the regex parsers read the lines one by one.
+    """
+    if isinstance(parser, treesitter.TreeSitterParser):
+        return parser.fallback
+    return parser
+
+
+def _parser_backends() -> Dict[str, str]:
+    """Return the backend that parses each tree-sitter language in this environment.
+
+    Part of the cache options, as the two backends may list different
+    signatures for the same file.
+    """
+    return {
+        language: "tree-sitter" if parser.available else "regex"
+        for language, parser in LANG_PARSERS.items()
+        if isinstance(parser, treesitter.TreeSitterParser)
+    }
+
+
 def _get_header_content_lines(
     classes: List[ClassInfo],
     functions: List[SignatureInfo],
     language: str,
     line_offset: int,
+    fingerprint: Optional[str] = None,
 ) -> List[str]:
     """Return a list of lines for the header content."""
     style = COMMENT_STYLES[language]
     lines = [
         f"{style.prefix}{DOCSTRING_START_MARKER}",
         f"{style.prefix}{DOCSTRING_HEADER_TEMPLATE.format(version=__version__)}",
+    ]
+    if fingerprint is not None:
+        lines.append(f"{style.prefix}{FINGERPRINT_LABEL}{fingerprint}")
+    lines += [
         f"{style.prefix}",
         f"{style.prefix}Classes/Functions:",
     ]
@@ -255,11 +496,12 @@ def _format_header(
     functions: List[SignatureInfo],
     language: str,
     line_offset: int,
+    fingerprint: Optional[str] = None,
 ) -> str:
     """Return a formatted header block for *language*."""
     style = COMMENT_STYLES[language]
     content_lines = _get_header_content_lines(
-        classes, functions, language, line_offset
+        classes, functions, language, line_offset, fingerprint
     )
     header_parts = []
     if style.start:
@@ -270,20 +512,123 @@ def _format_header(
     return "\n".join(header_parts)
 
 
-def get_preserved_header_end_line(lines: List[str], language: str) -> int:
+def _header_line_count(
+    classes: List[ClassInfo],
+    functions: List[SignatureInfo],
+    language: str,
+    fingerprint: bool = False,
+) -> int:
+    """Return the number of lines :func:`_format_header` produces, without rendering it.
+
+    Assumes every name and signature fits on one line; see :func:`_render_toc`.
+    """
+    style = COMMENT_STYLES[language]
+    # * Start/end markers, version line, blank line and "Classes/Functions:"
+    count = 5 + bool(style.start) + bool(style.end) + len(functions) + fingerprint
+    stack = list(classes)
+    while stack:
+        ci = stack.pop()
+        count += 1 + len(ci.methods)
+        stack.extend(ci.inner_classes)
+    return count
+
+
+def _render_toc(
+    classes: List[ClassInfo],
+    functions: List[SignatureInfo],
+    language: str,
+    line_offset: Callable[[int], int],
+    fingerprint: Optional[str] = None,
+) -> List[str]:
+    """Render the header content lines in a single pass.
+
+    Line numbers depend on the length of the header itself, so *line_offset*
+    maps the header's line count to the offset added to every line number.
+    """
+    style = COMMENT_STYLES[language]
+    header_line_count = _header_line_count(
+        classes, functions, language, fingerprint is not None
+    )
+    lines = _get_header_content_lines(
+        classes, functions, language, line_offset(header_line_count), fingerprint
+    )
+    # ! A signature containing line breaks makes the header longer than counted
+    rendered_count = len("\n".join(lines).splitlines()) + bool(style.start) + bool(style.end)
+    if rendered_count != header_line_count:
+        lines = _get_header_content_lines(
+            classes, functions, language, line_offset(rendered_count), fingerprint
+        )
+    return lines
+
+
+def body_fingerprint(file_prefix: str, cleaned_body: str, more: Iterable[str] = ()) -> str:
+    """Return the fingerprint of a file's content outside its generated header.
+
+    *more* continues *cleaned_body* for files that are streamed in chunks.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{file_prefix}\0{cleaned_body}".encode("utf-8", errors="surrogatepass"))
+    for chunk in more:
+        digest.update(chunk.encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
+
+
+def _current_toc(
+    code_body: str,
+    file_prefix: str,
+    cleaned_body: str,
+    more: Iterable[str] = (),
+    start: int = 0,
+) -> Optional[str]:
+    """Return the table of contents of *code_body* if its fingerprint is current.
+
+    The header must have been written by this version of the tool and carry
+    the fingerprint of the code around it; the file then needs no parsing.
+    *code_body* may also be the whole file, with the body beginning at
+    offset *start*.
+    """
+    end = code_body.find(DOCSTRING_END_MARKER, start)
+    header_start = code_body.rfind(DOCSTRING_START_MARKER, start, end) if end >= 0 else -1
+    if header_start < 0:
+        return None
+    header = code_body[header_start:end]
+    if DOCSTRING_HEADER_TEMPLATE.format(version=__version__) not in header:
+        return None
+    match = _FINGERPRINT_RE.search(header)
+    if match is None or match.group(1) != body_fingerprint(file_prefix, cleaned_body, more):
+        return None
+    line_end = code_body.find("\n", end)
+    return code_body[code_body.rfind("\n", 0, header_start) + 1:line_end if line_end >= 0 else None]
+
+
+def _opens_generated_header(lines: Sequence[str], index: int, language: str) -> bool:
+    """Whether the comment opened on line *index* is a generated header.
+
+    DOCSTRING_START_MARKER must occur in one of its first five lines, before
+    the comment is closed.
+    """
+    closing = COMMENT_STYLES[language].end.strip()
+    for i in range(index, min(index + 5, len(lines))):
+        if DOCSTRING_START_MARKER in lines[i]:
+            return True
+        if closing in lines[i]:
+            return False
+    return False
+
+
+def get_preserved_header_end_line(lines: Sequence[str], language: str) -> int:
     """Determines the number of lines to preserve at the start of a file."""
     if not lines:
         return 0
 
     # ! Check if file starts with an agent-generated docstring
-    # * If so, don't preserve any header lines - let remove_agent_docstring handle it
+    # * If so, don't preserve any header lines - let agent_docstring_end handle it
     if lines and language != "python":
         style = COMMENT_STYLES.get(language)
         if style and lines[0].strip() == style.start.strip():
             # * Look for the docstring start marker in the next few lines
-            for i in range(min(5, len(lines))):
-                if DOCSTRING_START_MARKER in lines[i]:
-                    return 0  # Don't preserve any lines - this is an agent docstring
+            if _opens_generated_header(lines, 0, language):
+                return 0  # Don't preserve any lines - this is an agent docstring
 
     if language == "python":
         header_end = 0
@@ -349,6 +694,9 @@ def get_preserved_header_end_line(lines: List[str], language: str) -> int:
             continue
 
         if stripped.startswith("/*"):
+            # ! A generated header ends the preserved lines, like in Python
+            if _opens_generated_header(lines, i, language):
+                return i
             if "*/" not in stripped:
                 in_block_comment = True
             continue
@@ -368,156 +716,1075 @@ def get_preserved_header_end_line(lines: List[str], language: str) -> int:
     return len(lines)
 
 
-def process_file(path: Path, verbose: bool = False, beta: bool = False) -> None:
-    """Generate or refresh the header comment for *path*."""
+class _Lines(Sequence[str]):
+    """Lines of ``text[start:]`` as split by ``str.split("\\n")``, located on demand.
+
+    Only the lines that are accessed are looked up, so inspecting the start
+    of a file neither splits nor copies the rest of it.
+    """
+
+    def __init__(self, text: str, start: int = 0) -> None:
+        self.text = text
+        self._starts = [start]
+        self._count: Optional[int] = None
+
+    def start(self, index: int) -> int:
+        """Return the offset of line *index*, or ``len(text) + 1`` past the last line."""
+        starts = self._starts
+        past_end = len(self.text) + 1
+        while len(starts) <= index and starts[-1] < past_end:
+            newline = self.text.find("\n", starts[-1])
+            starts.append(past_end if newline < 0 else newline + 1)
+        return starts[index] if index < len(starts) else past_end
+
+    def end(self, index: int) -> int:
+        """Return the offset at which line *index* ends, before its newline."""
+        return self.start(index + 1) - 1
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self.text.count("\n", self._starts[0]) + 1
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        start = self.start(index)
+        if index < 0 or start > len(self.text):
+            raise IndexError(index)
+        return self.text[start:self.end(index)]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        pos = self._starts[0]
+        while (newline := text.find("\n", pos)) >= 0:
+            yield text[pos:newline]
+            pos = newline + 1
+        yield text[pos:]
+
+
+class ModuleDocstring(NamedTuple):
+    """Manual Python module docstring that a generated header is merged into.
+
+    Offsets are relative to the cleaned body, i.e. the code after the
+    preserved prefix and any previously generated header.
+    """
+    # * Start of the opening line and end of the closing line
+    start: int
+    end: int
+    # * Delimiter written on the opening and closing lines
+    delimiter: str
+    # * Range of the docstring text
+    inner: Tuple[int, int]
+    single_line: bool
+
+
+class HeaderLayout(NamedTuple):
+    """Regions at the start of a file, as located by :func:`locate_header`.
+
+    Offsets index the text of the file, which consists of the preserved
+    prefix ``text[:prefix_end]``, a newline unless the prefix is empty, and
+    the code body ``text[body_start:]``. A previously generated header
+    occupies ``text[body_start:header_end]``; in Python, a header merged
+    into the module docstring occupies the range *merged_header*.
+    """
+    header_end_line: int
+    prefix_end: int
+    body_start: int
+    header_end: int
+    merged_header: Optional[Tuple[int, int]]
+    docstring: Optional[ModuleDocstring]
+
+    @property
+    def has_header(self) -> bool:
+        """Whether the file holds a previously generated header."""
+        return self.header_end > self.body_start or self.merged_header is not None
+
+    def cleaned_body(self, text: str) -> str:
+        """Return the code body of *text* without the previously generated header."""
+        if self.merged_header is None:
+            return text[self.header_end:]
+        start, end = self.merged_header
+        return text[self.header_end:start] + text[end:]
+
+
+def _first_code_line(lines: _Lines) -> int:
+    """Return the index of the first line that is not blank, or -1."""
+    index = 0
+    try:
+        while not lines[index].strip():
+            index += 1
+    except IndexError:
+        return -1
+    return index
+
+
+def _merged_header(text: str, start: int) -> Optional[Tuple[int, int]]:
+    """Return the range of a header merged into the module docstring at *start*.
+
+    Merged headers follow a lone opening delimiter and end with the line of
+    DOCSTRING_END_MARKER.
+    """
+    lines = _Lines(text, start)
+    index = _first_code_line(lines)
+    if index < 0 or lines[index].strip() not in ('"""', "'''"):
+        return None
+    try:
+        if DOCSTRING_START_MARKER not in lines[index + 1]:
+            return None
+    except IndexError:
+        return None
+    end = text.find(DOCSTRING_END_MARKER, lines.start(index + 1))
+    line_end = text.find("\n", end) if end >= 0 else -1
+    if line_end < 0:
+        return None
+    return lines.start(index + 1), line_end + 1
+
+
+def _module_docstring(text: str, start: int) -> Optional[ModuleDocstring]:
+    """Return the manual module docstring opening ``text[start:]``, if any.
+
+    The docstring must be a single line, or have its delimiters on lines of
+    their own. Empty docstrings are ignored: merged with a header they would
+    read as a generated one. Offsets in the result are relative to *start*.
+    """
+    lines = _Lines(text, start)
+    index = _first_code_line(lines)
+    if index < 0:
+        return None
+    delim_line = lines[index].strip()
+    if not delim_line.startswith(('"""', "'''")):
+        return None
+    # * Docstrings holding a marker are generated ones that could not be removed
+    for i in range(index, index + 5):
+        try:
+            if DOCSTRING_START_MARKER in lines[i]:
+                return None
+        except IndexError:
+            break
+    opening = lines.start(index)
+    quotes = '"""' if delim_line.startswith('"""') else "'''"
+    if delim_line.endswith(quotes) and delim_line != quotes:
+        content_start = opening + lines[index].index(delim_line) + len(quotes)
+        content_end = content_start + len(delim_line) - 2 * len(quotes)
+        if not text[content_start:content_end].strip():
+            return None
+        inner = (content_start - start, content_end - start)
+        return ModuleDocstring(opening - start, lines.end(index) - start, quotes, inner, True)
+    # * The closing line repeats the opening line, e.g. a lone delimiter
+    search = lines.end(index)
+    while (found := text.find(delim_line, search)) >= 0:
+        line_start = text.rfind("\n", 0, found) + 1
+        line_end = text.find("\n", found)
+        line_end = len(text) if line_end < 0 else line_end
+        if text[line_start:line_end].strip() == delim_line:
+            inner_start = lines.start(index + 1)
+            if line_start <= inner_start or not text[inner_start:line_start - 1].strip():
+                return None
+            inner = (inner_start - start, line_start - 1 - start)
+            return ModuleDocstring(opening - start, line_end - start, delim_line, inner, False)
+        search = line_end
+    return None
+
+
+def locate_header(text: str, language: str) -> HeaderLayout:
+    """Locate the preserved prefix, the generated header and the module docstring.
+
+    A single pass over the start of *text* serves every step, instead of
+    splitting the file into lines and joining them again for each: the
+    preserved lines are found with :func:`get_preserved_header_end_line` on
+    lines located on demand, and the previously generated header with
+    :func:`agent_docstring_end` at the start of the code body.
+
+    Args:
+        text (str): Contents of the source file.
+        language (str): Canonical language name, e.g. ``"python"``.
+
+    Returns:
+        HeaderLayout: The offsets of the regions.
+    """
+    lines = _Lines(text)
+    header_end_line = get_preserved_header_end_line(lines, language)
+    next_start = lines.start(header_end_line)
+    body_start = min(next_start, len(text))
+    header_end = agent_docstring_end(text, language, body_start)
+    merged_header = None
+    docstring = None
+    if language == "python":
+        merged_header = _merged_header(text, header_end)
+        if merged_header is None:
+            docstring = _module_docstring(text, header_end)
+        else:
+            start, end = merged_header
+            docstring = _module_docstring(text[header_end:start] + text[end:], 0)
+    return HeaderLayout(
+        header_end_line, max(next_start - 1, 0), body_start, header_end, merged_header, docstring
+    )
+
+
+def _split_content(content: str, language: str) -> Tuple[int, str, str, str]:
+    """Split *content* into the preserved prefix and the code body.
+
+    Returns:
+        Tuple[int, str, str, str]: Number of preserved header lines, the
+        preserved prefix, the code body, and the code body without a previously
+        generated docstring.
+    """
+    layout = locate_header(content, language)
+    return (
+        layout.header_end_line,
+        content[:layout.prefix_end],
+        content[layout.body_start:],
+        layout.cleaned_body(content),
+    )
+
+
+class _FileHead(NamedTuple):
+    """Start of a large file, split like :func:`_split_content` splits a whole file."""
+    text: str
+    header_end_line: int
+    file_prefix: str
+    code_body: str
+    cleaned_body: str
+    # * Byte offset at which the rest of the code body starts
+    rest_offset: int
+
+
+def _locate_head(source: MappedSource, language: str) -> Optional[_FileHead]:
+    """Split the start of *source* into the preserved prefix and the code body.
+
+    The decoded region grows from :data:`HEAD_SIZE` until the split no longer
+    depends on what follows it, i.e. until both the preserved prefix and a
+    previously generated header end well inside it.
+
+    Returns:
+        Optional[_FileHead]: The split, or None if it cannot be determined
+        within :data:`MAX_HEAD_SIZE` bytes.
+    """
+    style = COMMENT_STYLES[language]
+    limit = HEAD_SIZE
+    while limit <= MAX_HEAD_SIZE:
+        text, end = source.head(limit)
+        limit *= 4
+        complete = end == source.size
+        layout = locate_header(text, language)
+        header_end_line = layout.header_end_line
+        first_lines = text.split("\n", 5)[:5]
+        # ! The last line is cut off, and up to five lines after the prefix are
+        # ! inspected. Go files keep everything up to a package clause that
+        # ! may come later, unless they start with a generated header.
+        if not complete and (
+            header_end_line + 5 >= text.count("\n")
+            or (
+                language == "go"
+                and header_end_line == 0
+                and not (
+                    first_lines[0].strip() == style.start.strip()
+                    and _opens_generated_header(first_lines, 0, language)
+                )
+            )
+        ):
+            continue
+        file_prefix = text[:layout.prefix_end]
+        code_body = text[layout.body_start:]
+        cleaned_body = layout.cleaned_body(text)
+        if not complete:
+            # * The removal patterns end by skipping whitespace, and the body
+            # * is stripped of leading whitespace when the header is inserted
+            if not cleaned_body.strip():
+                continue
+            # * A header that starts here might end beyond the decoded region
+            if not layout.has_header and code_body.lstrip().startswith(style.start.rstrip()) and (
+                DOCSTRING_START_MARKER in code_body
+                or source.find(DOCSTRING_START_MARKER, end) >= 0
+                or (language == "python" and _LEGACY_PYTHON_HEADER_RE.match(code_body))
+            ):
+                continue
+        return _FileHead(text, header_end_line, file_prefix, code_body, cleaned_body, end)
+    return None
+
+
+def _go_parser_source(content: str) -> str:
+    """Return the source string :func:`parse_go_file` will parse for *content*."""
+    cleaned_body = _split_content(content, "go")[3]
+    # * Same source string that parse_go_file() builds from the lines
+    return "\n".join(cleaned_body.splitlines())
+
+
+def _prefetch_go_files(
+    files: List[Path],
+    cache: Optional[HeaderCache] = None,
+    profiler: Optional[Profiler] = None,
+    fingerprint: bool = False,
+) -> None:
+    """Parse all Go files in *files* with one batched parser invocation.
+
+    The results are primed in :mod:`agent_docstrings.languages.go`, so the
+    following :func:`process_file` calls do not start a parser each.
+    """
+    sources = []
+    for file_path in files:
+        if EXT_TO_LANG.get(file_path.suffix.lower()) != "go":
+            continue
+        if cache is not None and cache.is_fresh(file_path):
+            continue
+        try:
+            if file_path.stat().st_size >= LARGE_FILE_SIZE:
+                # * Parsed on their own by process_file(), from a stream
+                continue
+            with profiling.stage(profiler, "read"):
+                content = file_path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        if content.strip():
+            with profiling.stage(profiler, "remove"):
+                _, file_prefix, code_body, cleaned_body = _split_content(content, "go")
+                if fingerprint and _current_toc(code_body, file_prefix, cleaned_body) is not None:
+                    continue
+                # * Same source string that parse_go_file() builds from the lines
+                sources.append("\n".join(cleaned_body.splitlines()))
+    with profiling.stage(profiler, "parse"):
+        go.prime_go_parser(sources)
+
+
+def _compose_content(
+    header_end_line: int,
+    file_prefix: str,
+    cleaned_body: str,
+    language: str,
+    classes: List[ClassInfo],
+    functions: List[SignatureInfo],
+    fingerprint: Optional[str] = None,
+    docstring: Optional[ModuleDocstring] = None,
+) -> Tuple[str, List[str]]:
+    """Insert a header listing *classes* and *functions* after *file_prefix*.
+
+    With *docstring*, a manual Python module docstring located in
+    *cleaned_body*, the header is merged into it instead.
+
+    Returns:
+        Tuple[str, List[str]]: The new content, and the table of contents
+        lines without comment delimiters. *fingerprint*, if given, is written
+        into the header.
+    """
+
+    # * An empty prefix, i.e. a single blank line, is dropped
+    prefix_lines = header_end_line if file_prefix else 0
+
+    if docstring is not None:
+        # * Merge the header into the manual module docstring
+        leading = cleaned_body[:docstring.start]
+        # * Leading empty lines are dropped below
+        dropped_lines = len(leading) - len(leading.lstrip("\n"))
+        # * A single-line docstring is split into an opening line, its text and a closing line
+        added_lines = 2 if docstring.single_line else 0
+
+        def merged_line_offset(header_line_count: int) -> int:
+            # * The docstring's own delimiters are not part of the header
+            return prefix_lines + header_line_count - 2 + added_lines - dropped_lines
+
+        toc_lines = _render_toc(classes, functions, language, merged_line_offset, fingerprint)
+        merged_body = "\n".join([
+            leading + docstring.delimiter,
+            *toc_lines,
+            cleaned_body[docstring.inner[0]:docstring.inner[1]],
+            docstring.delimiter + cleaned_body[docstring.end:],
+        ]).lstrip("\n")
+        if file_prefix:
+            new_content = file_prefix + "\n" + merged_body
+        else:
+            new_content = merged_body
+    else:
+        # Default behavior: insert separate docstring
+        code_body = cleaned_body.lstrip()
+        # * Parsed line numbers count the blank lines stripped from the body
+        dropped_lines = cleaned_body.count("\n", 0, len(cleaned_body) - len(code_body))
+
+        def line_offset(header_line_count: int) -> int:
+            # * Offset: preserved header lines + generated header lines
+            return prefix_lines + header_line_count - dropped_lines
+
+        toc_lines = _render_toc(classes, functions, language, line_offset, fingerprint)
+        style = COMMENT_STYLES[language]
+        final_header = "\n".join(
+            ([style.start] if style.start else []) + toc_lines + ([style.end] if style.end else [])
+        )
+        new_content_parts = []
+        if file_prefix:
+            new_content_parts.append(file_prefix)
+        new_content_parts.append(final_header)
+        new_content_parts.append(code_body)
+        # Use single newlines to test composition theory
+        new_content = "\n".join(filter(None, new_content_parts))
+    return new_content, toc_lines
+
+
+def _render_content(
+    content: str,
+    language: str,
+    parser: Callable[[List[str]], Tuple[List[ClassInfo], List[SignatureInfo]]],
+    profiler: Optional[Profiler] = None,
+    fingerprint: bool = False,
+) -> Tuple[str, str]:
+    """Regenerate the header of *content* without touching the file system.
+
+    With *fingerprint*, the header records a hash of the code outside it, and
+    content whose header carries a matching hash is returned without being
+    parsed.
+
+    Returns:
+        Tuple[str, str]: The new content, and the lines of the generated
+        table of contents without comment delimiters (empty if *content*
+        declares no classes or functions).
+    """
+    with profiling.stage(profiler, "remove"):
+        layout = locate_header(content, language)
+        file_prefix = content[:layout.prefix_end]
+        cleaned_body = layout.cleaned_body(content)
+        if fingerprint and layout.has_header:
+            toc = _current_toc(content, file_prefix, cleaned_body, start=layout.body_start)
+            if toc is not None:
+                return content, toc
+
+    with profiling.stage(profiler, "parse"):
+        classes, functions = parser(cleaned_body.splitlines())
+    if not classes and not functions:
+        # If all that was done was removing a docstring, write the cleaned content back
+        if layout.has_header:
+            return (file_prefix + "\n" + cleaned_body).lstrip(), ""
+        return content, ""
+
+    format_start = time.perf_counter()
+    # * The fingerprint covers the code as the next run will see it, so it is
+    # * filled in once the new content exists
+    placeholder = _FINGERPRINT_PLACEHOLDER if fingerprint else None
+    new_content, toc_lines = _compose_content(
+        layout.header_end_line,
+        file_prefix,
+        cleaned_body,
+        language,
+        classes,
+        functions,
+        placeholder,
+        layout.docstring,
+    )
+    toc = "\n".join(toc_lines)
+    if placeholder is not None:
+        _, new_prefix, _, new_cleaned = _split_content(new_content, language)
+        marker = FINGERPRINT_LABEL + placeholder
+        value = FINGERPRINT_LABEL + body_fingerprint(new_prefix, new_cleaned)
+        new_content = new_content.replace(marker, value, 1)
+        toc = toc.replace(marker, value, 1)
+    if profiler is not None:
+        profiler.add("format", time.perf_counter() - format_start)
+    return new_content, toc
+
+
+class RenderResult(NamedTuple):
+    """Content with a regenerated header, as returned by :func:`render`."""
+    text: str
+    toc: str
+
+
+def language_for(name: str) -> Optional[str]:
+    """Return the language of the file *name* from its extension, if supported."""
+    return EXT_TO_LANG.get(os.path.splitext(name)[1].lower())
+
+
+def render(text: str, language: str, fingerprint: bool = False) -> RenderResult:
+    """Regenerate the header of *text* in memory.
+
+    This is the pure core of :func:`process_file`: nothing is read from or
+    written to disk, so callers holding file contents can skip the file
+    system and run it from any thread or process.
+
+    Args:
+        text (str): Content of a source file.
+        language (str): Language name, e.g. ``"python"``; see
+            :func:`language_for` to derive it from a file name.
+        fingerprint (bool, optional): Embed a fingerprint of the code in the
+            header, and return *text* unparsed if its fingerprint matches.
+
+    Returns:
+        RenderResult: The new content, equal to *text* if its header is
+        current, and the table of contents without comment delimiters, empty
+        if *text* declares no classes or functions.
+
+    Raises:
+        ValueError: If *language* is not supported.
+    """
+    parser = LANG_PARSERS.get(language)
+    if parser is None:
+        raise ValueError(f"Unsupported language: {language!r}")
+    if not text.strip():
+        return RenderResult(text, "")
+    # * The threshold is in bytes, as for files; a character takes one to four
+    if len(text) * 4 >= LARGE_FILE_SIZE and len(text.encode("utf-8")) >= LARGE_FILE_SIZE:
+        parser = _line_parser(parser)
+    return RenderResult(*_render_content(text, language, parser, fingerprint=fingerprint))
+
+
+def render_batch(
+    items: Iterable[Tuple[str, str]], fingerprint: bool = False
+) -> List[Tuple[str, RenderResult]]:
+    """Render many in-memory files, e.g. the contents held by an agent.
+
+    Languages are derived from the names. Go sources are parsed with a single
+    batched parser invocation instead of one per file.
+
+    Args:
+        items (Iterable[Tuple[str, str]]): ``(name, text)`` pairs.
+        fingerprint (bool, optional): See :func:`render`.
+
+    Returns:
+        List[Tuple[str, RenderResult]]: ``(name, result)`` pairs in input
+        order; files of unsupported types are returned unchanged.
+    """
+    items = list(items)
+    go_sources = [
+        _go_parser_source(text)
+        for name, text in items
+        if language_for(name) == "go" and text.strip()
+    ]
+    if go_sources:
+        go.prime_go_parser(go_sources)
+    results = []
+    for name, text in items:
+        language = language_for(name)
+        if language is None:
+            results.append((name, RenderResult(text, "")))
+        else:
+            results.append((name, render(text, language, fingerprint)))
+    return results
+
+
+def unified_diff(path: Path, original: str, new: str) -> str:
+    """Return a unified diff from *original* to *new* for *path*, applicable with ``git apply``.
+
+    Paths in the headers are relative to the current directory, where the
+    patch is meant to be applied.
+    """
+    try:
+        name = Path(os.path.relpath(path)).as_posix()
+    except ValueError:
+        # ! On Windows a path on another drive has no relative form
+        name = path.as_posix().lstrip("/")
+    lines = difflib.unified_diff(
+        original.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile=f"a/{name}",
+        tofile=f"b/{name}",
+    )
+    # * Mark lines without a trailing newline the way diff and git do
+    return "".join(
+        line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
+        for line in lines
+    )
+
+
+def _process_large_file(
+    path: Path,
+    language: str,
+    parser: Callable[[Iterable[str]], Tuple[List[ClassInfo], List[SignatureInfo]]],
+    verbose: bool = False,
+    cache: Optional[HeaderCache] = None,
+    profiler: Optional[Profiler] = None,
+    check: bool = False,
+    fingerprint: bool = False,
+    writer: Optional[FileWriter] = None,
+) -> Optional[bool]:
+    """Process *path* without reading it into memory whole.
+
+    Only the start of the file is decoded. The parser reads the rest line by
+    line from the file, and the new content is streamed to the file that
+    replaces *path*. The result equals that of the in-memory path of
+    :func:`process_file`.
+
+    Returns:
+        Optional[bool]: True if the file was updated, or would be with
+        *check*; None if it has to be processed in memory instead, which is
+        the case when its header cannot be located near its start, when a
+        Python module docstring has to be merged with the header, or when a
+        new fingerprint has to be computed.
+    """
+    label = language.capitalize()
+    log = _log_stream(check)
+    with MappedSource(path) as source:
+        with profiling.stage(profiler, "remove"):
+            head = _locate_head(source, language)
+        if head is None:
+            return None
+        if cache is not None and cache.matches(path, source.chunks()):
+            cache.record(path, source.chunks())
+            if verbose:
+                print(f"No changes for {label}: {path}", file=log)
+            return False
+        cleaned_body = head.cleaned_body
+        if fingerprint:
+            with profiling.stage(profiler, "remove"):
+                current = cleaned_body != head.code_body and _current_toc(
+                    head.code_body, head.file_prefix, cleaned_body, source.chunks(head.rest_offset)
+                ) is not None
+            if not current:
+                return None
+            new_text = head.text
+        elif language == "python" and cleaned_body.lstrip().startswith(('"""', "'''")):
+            return None
+        else:
+            with profiling.stage(profiler, "parse"):
+                classes, functions = parser(
+                    itertools.chain(cleaned_body.splitlines(), source.lines(head.rest_offset))
+                )
+            with profiling.stage(profiler, "format"):
+                if classes or functions:
+                    new_text, _ = _compose_content(
+                        head.header_end_line, head.file_prefix, cleaned_body, language, classes, functions
+                    )
+                elif cleaned_body != head.code_body:
+                    new_text = (head.file_prefix + "\n" + cleaned_body).lstrip()
+                else:
+                    new_text = head.text
+
+    # * The rest of the file is identical, so comparing the starts suffices
+    if new_text == head.text:
+        if verbose:
+            print(f"No changes for {label}: {path}", file=log)
+        if cache is not None:
+            cache.record(path, stream.read_chunks(path))
+        return False
+    if check:
+        print(f"Would update {label}: {path}")
+        return True
+    with profiling.stage(profiler, "write"):
+        _write_file(
+            path,
+            itertools.chain([new_text], stream.read_chunks(path, head.rest_offset)),
+            writer,
+            None if cache is None else lambda: cache.record(path, stream.read_chunks(path)),
+        )
+    if verbose:
+        print(f"Processed {label}: {path}")
+    return True
+
+
+def _write_file(
+    path: Path,
+    content: Union[str, Iterable[str]],
+    writer: Optional[FileWriter],
+    on_written: Optional[Callable[[], None]],
+) -> None:
+    """Replace *path* with *content* through *writer*, or right away without one."""
+    if writer is not None:
+        writer.submit(path, content, on_written)
+        return
+    write_atomic(path, content)
+    if on_written is not None:
+        on_written()
+
+
+def process_file(
+    path: Path,
+    verbose: bool = False,
+    beta: bool = False,
+    cache: Optional[HeaderCache] = None,
+    profiler: Optional[Profiler] = None,
+    check: bool = False,
+    diff: bool = False,
+    fingerprint: bool = False,
+    writer: Optional[FileWriter] = None,
+) -> bool:
+    """Generate or refresh the header comment for *path*.
+
+    Args:
+        path (Path): Source file to process.
+        verbose (bool, optional): Enables per-file logging when *True*.
+        beta (bool, optional): Enables experimental beta features.
+        cache (Optional[HeaderCache], optional): Cache of files whose header
+            is already current. Files found in it are skipped without being
+            parsed, and processed files are recorded in it.
+        profiler (Optional[Profiler], optional): Receives the time spent in
+            every processing stage and the total time of the file.
+        check (bool, optional): Report a stale header instead of writing the
+            file.
+        diff (bool, optional): Like *check*, but print a unified diff of the
+            change.
+        fingerprint (bool, optional): Embed a fingerprint of the code in the
+            header and skip parsing files whose fingerprint matches.
+        writer (Optional[FileWriter], optional): Writer stage that replaces
+            the file in the background. Without one, the file is replaced
+            before this function returns. Either way the replacement is
+            atomic and keeps the file's permissions and line endings.
+
+    Returns:
+        bool: True if the file was updated, or would be with *check* or
+        *diff*.
+    """
+    return _process_file(
+        path, verbose, beta, cache, profiler, check, diff, fingerprint, writer
+    ) is True
+
+
+def _process_file(
+    path: Path,
+    verbose: bool = False,
+    beta: bool = False,
+    cache: Optional[HeaderCache] = None,
+    profiler: Optional[Profiler] = None,
+    check: bool = False,
+    diff: bool = False,
+    fingerprint: bool = False,
+    writer: Optional[FileWriter] = None,
+) -> Optional[bool]:
+    """Like :func:`process_file`, but return None if *path* failed.
+
+    The error is printed either way; the runs count failed files so that
+    ``--check`` and ``--diff`` do not pass files they could not read. With
+    those, messages other than the report go to stderr; see :func:`_log_stream`.
+    """
     ext = path.suffix.lower()
     if ext not in EXT_TO_LANG:
-        return
+        return False
     language = EXT_TO_LANG[ext]
     parser = LANG_PARSERS.get(language)
     if not parser:
-        return
+        return False
+    log = _log_stream(check or diff)
+    start = time.perf_counter()
     try:
-        original_content = path.read_text(encoding="utf-8", errors="ignore")
-        if not original_content.strip():
-            return
-        # * Skip regeneration when only generator version changed in header
-        lines = original_content.split('\n')
-        header_end_line = get_preserved_header_end_line(lines, language)
-        file_prefix = "\n".join(lines[:header_end_line])
-        code_body = "\n".join(lines[header_end_line:])
-        cleaned_body = remove_agent_docstring(code_body, language)
-
-        classes, functions = parser(cleaned_body.splitlines())
-        if not classes and not functions:
-            # If all that was done was removing a docstring, write the cleaned content back
-            if cleaned_body != code_body:
-                 path.write_text(
-                    (file_prefix + "\n" + cleaned_body).lstrip(),
-                    encoding="utf-8",
+        if cache is not None:
+            with profiling.stage(profiler, "cache"):
+                fresh = cache.is_fresh(path)
+            if fresh:
+                if verbose:
+                    print(f"No changes for {language.capitalize()}: {path}", file=log)
+                return False
+        if path.stat().st_size >= LARGE_FILE_SIZE:
+            parser = _line_parser(parser)
+            if not diff:
+                stale = _process_large_file(
+                    path, language, parser, verbose, cache, profiler, check, fingerprint, writer
                 )
-            return
+                if stale is not None:
+                    return stale
+        with profiling.stage(profiler, "read"):
+            original_content = path.read_text(encoding="utf-8", errors="ignore")
+        if cache is not None and cache.matches(path, original_content):
+            # * Only the timestamp changed; refresh it without re-parsing
+            cache.record(path, original_content)
+            if verbose:
+                print(f"No changes for {language.capitalize()}: {path}", file=log)
+            return False
+        if not original_content.strip():
+            if cache is not None:
+                cache.record(path, original_content)
+            return False
+        new_content, _ = _render_content(
+            original_content, language, parser, profiler, fingerprint
+        )
 
-        # ! Calculate the correct line offset for the final positions
-        # * First create a temporary header to count its lines
-        temp_header = _format_header(classes, functions, language, 0)
-        temp_header_lines = temp_header.splitlines()
-        
-        # * Calculate offset: preserved header lines + generated header lines
-        line_offset = header_end_line + len(temp_header_lines)
-        
-        # ! Language-specific adjustments for line numbering
-        if language == "go":
-            # * Go has a special case where the offset needs to be reduced by 1
-            line_offset -= 1
-        elif language == "python" and header_end_line > 0:
-            # * Python with preserved headers (shebang/encoding) needs adjustment
-            line_offset -= 1
-        
-        # * Now create the final header with correct line numbers
-        final_header = _format_header(classes, functions, language, line_offset)
-        
-        # Attempt to merge auto-generated header into existing manual docstring for Python
-        merged_body = None
-        if language == "python":
-            # Split cleaned body into lines
-            body_lines = cleaned_body.splitlines()
-            # Find first non-empty line
-            idx = 0
-            while idx < len(body_lines) and body_lines[idx].strip() == "":
-                idx += 1
-            # Check for manual docstring start
-            if idx < len(body_lines) and body_lines[idx].strip().startswith(('"""', "'''")):
-                delim_line = body_lines[idx].strip()
-                # Ensure it's not an existing auto-generated docstring
-                marker_present = False
-                for i in range(idx, min(idx + 5, len(body_lines))):
-                    if DOCSTRING_START_MARKER in body_lines[i]:
-                        marker_present = True
-                        break
-                if not marker_present:
-                    # Find end of manual docstring
-                    end_idx = None
-                    manual_inner = []
-                    delim = None
-                    
-                    delim_quotes = '"""' if delim_line.startswith('"""') else "'''"
-                    is_single_line = delim_line.endswith(delim_quotes) and delim_line != delim_quotes
-
-                    if is_single_line:
-                        end_idx = idx
-                        content_part = delim_line[len(delim_quotes):-len(delim_quotes)]
-                        if content_part:
-                             manual_inner = [content_part]
-                        delim = delim_quotes
-                    else:
-                        # Multi-line docstring
-                        delim = delim_line
-                        for j in range(idx + 1, len(body_lines)):
-                            if body_lines[j].strip() == delim:
-                                end_idx = j
-                                break
-                        if end_idx is not None:
-                            manual_inner = body_lines[idx + 1:end_idx]
-
-                    if end_idx is not None:
-                        # Compute auto header content lines with correct offset for merge
-                        # temp_header_lines holds the auto header lines including delimiters
-                        # content_lines length is temp_header_lines minus start/end markers
-                        offset_override = len(temp_header_lines) - 2
-                        # Generate only the header content lines (without triple-quote delimiters)
-                        header_inner = _get_header_content_lines(
-                            classes, functions, language, offset_override
-                        )
-                        merged_lines = []
-                        # Preserve leading blank lines before manual docstring
-                        merged_lines.extend(body_lines[:idx])
-                        # Start merged docstring with manual delimiter
-                        merged_lines.append(delim)
-                        # Insert auto-generated header content
-                        merged_lines.extend(header_inner)
-                        # Insert original manual docstring content
-                        merged_lines.extend(manual_inner)
-                        # Close merged docstring with manual delimiter
-                        merged_lines.append(delim)
-                        # Append rest of body after original docstring
-                        merged_lines.extend(body_lines[end_idx + 1:])
-                        merged_body = "\n".join(merged_lines)
-        if merged_body is not None:
-            if file_prefix:
-                new_content = file_prefix + "\n" + merged_body.lstrip("\n")
+        stale = new_content != original_content
+        if stale and (check or diff):
+            # ! Report only; the file and the cache are left untouched
+            if diff:
+                print(unified_diff(path, original_content, new_content), end="")
             else:
-                new_content = merged_body.lstrip("\n")
-        else:
-            # Default behavior: insert separate docstring
-            new_content_parts = []
-            if file_prefix:
-                new_content_parts.append(file_prefix)
-            new_content_parts.append(final_header)
-            new_content_parts.append(cleaned_body.lstrip())
-            # Use single newlines to test composition theory
-            new_content = "\n".join(filter(None, new_content_parts))
-
+                print(f"Would update {language.capitalize()}: {path}")
+            return True
         # Only write changes if content changed
-        if new_content != original_content:
-            path.write_text(new_content, encoding="utf-8")
+        if stale:
+            # * The cache entry needs the stat of the new file
+            with profiling.stage(profiler, "write"):
+                _write_file(
+                    path,
+                    new_content,
+                    writer,
+                    None if cache is None else functools.partial(cache.record, path, new_content),
+                )
             if verbose:
                 print(f"Processed {language.capitalize()}: {path}")
-        elif verbose:
+            return True
+        if verbose:
             # ! Provide verbose output even when no changes are made
-            print(f"No changes for {language.capitalize()}: {path}")
+            print(f"No changes for {language.capitalize()}: {path}", file=log)
+        if cache is not None:
+            cache.record(path, new_content)
+        return False
     except Exception as e:
-        print(f"Error processing {path}: {e}")
+        print(f"Error processing {path}: {e}", file=log)
+        return None
+    finally:
+        if profiler is not None:
+            profiler.record_file(str(path), language, time.perf_counter() - start)
 
 
-def discover_and_process_files(paths: List[str], verbose: bool = False, beta: bool = False) -> None:
-    """Recursively process all supported files inside *paths*.
+def _process_chunk(
+    chunk: List[Path],
+    verbose: bool,
+    beta: bool,
+    cache: Optional[HeaderCache] = None,
+    profile: bool = False,
+    check: bool = False,
+    diff: bool = False,
+    fingerprint: bool = False,
+    fsync: bool = False,
+) -> Tuple[List[Tuple[str, str]], WorkerStats, Optional[HeaderCache], Optional[Profiler]]:
+    """Process *chunk* inside a worker and capture its per-file output.
+
+    Output is buffered per file instead of being printed directly so that the
+    parent process can replay it in the original file order, keeping logs
+    identical to a serial run.
+
+    Returns:
+        Tuple[List[Tuple[str, str]], WorkerStats, Optional[HeaderCache], Optional[Profiler]]:
+        Captured stdout and stderr for every file in *chunk* (same order),
+        the statistics of this chunk, the chunk's cache with the entries
+        recorded by the worker and, when *profile* is set, the chunk's profiler.
+    """
+    start = time.perf_counter()
+    outputs: List[Tuple[str, str]] = []
+    profiler = Profiler() if profile else None
+    stale = failed = 0
+    writer = _file_writer(fsync, check or diff)
+    _prefetch_go_files(chunk, cache, profiler, fingerprint)
+    for file_path in chunk:
+        buffer = io.StringIO()
+        errors = io.StringIO()
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(errors):
+            result = _process_file(
+                file_path, verbose, beta, cache, profiler, check, diff, fingerprint, writer
+            )
+        if result is None:
+            failed += 1
+        else:
+            stale += result
+        outputs.append((buffer.getvalue(), errors.getvalue()))
+    if writer is not None:
+        # * Report failed writes with the output of their file
+        index = {file_path: i for i, file_path in enumerate(chunk)}
+        for failure in writer.close():
+            output, error_output = outputs[index[failure.path]]
+            outputs[index[failure.path]] = (output + _write_error(failure), error_output)
+    stats = WorkerStats(
+        pid=os.getpid(),
+        files=len(chunk),
+        chunks=1,
+        seconds=time.perf_counter() - start,
+        stale=stale,
+        failed=failed,
+    )
+    return outputs, stats, cache, profiler
+
+
+def _file_writer(fsync: bool, dry_run: bool) -> Optional[FileWriter]:
+    """Return the writer stage for a run, or None to write files inline.
+
+    Writing to the page cache is cheaper inline than handing it to a thread;
+    the writer stage pays off with *fsync*, whose flushes it batches and
+    overlaps with parsing.
+    """
+    return FileWriter(fsync=True) if fsync and not dry_run else None
+
+
+def _write_error(failure: WriteFailure) -> str:
+    return f"Error processing {failure.path}: {failure.error}\n"
+
+
+def _chunk_size(total: int, jobs: int) -> int:
+    """Return the number of files per chunk for *total* files and *jobs* workers.
+
+    Several chunks per worker keep the load balanced when file sizes differ,
+    while the upper bound keeps a single slow chunk from dominating the tail.
+    """
+    return max(1, min(MAX_CHUNK_SIZE, total // (jobs * 8)))
+
+
+def _process_in_parallel(
+    files: List[Path],
+    verbose: bool,
+    beta: bool,
+    jobs: int,
+    cache: Optional[HeaderCache] = None,
+    profiler: Optional[Profiler] = None,
+    check: bool = False,
+    diff: bool = False,
+    fingerprint: bool = False,
+    fsync: bool = False,
+) -> Dict[int, WorkerStats]:
+    """Process *files* with a pool of *jobs* worker processes."""
+    size = _chunk_size(len(files), jobs)
+    chunks = [files[i:i + size] for i in range(0, len(files), size)]
+    # * Each chunk only carries its own cache entries to keep IPC small
+    chunk_caches = [
+        cache.subset(chunk) if cache is not None else None for chunk in chunks
+    ]
+    worker_stats: Dict[int, WorkerStats] = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        # * ``map`` yields results in submission order, so output stays deterministic
+        results = executor.map(
+            _process_chunk,
+            chunks,
+            [verbose] * len(chunks),
+            [beta] * len(chunks),
+            chunk_caches,
+            [profiler is not None] * len(chunks),
+            [check] * len(chunks),
+            [diff] * len(chunks),
+            [fingerprint] * len(chunks),
+            [fsync] * len(chunks),
+        )
+        for outputs, stats, chunk_cache, chunk_profiler in results:
+            for output, error_output in outputs:
+                if output:
+                    print(output, end="")
+                if error_output:
+                    print(error_output, end="", file=sys.stderr)
+            if cache is not None and chunk_cache is not None:
+                cache.merge(chunk_cache)
+            if profiler is not None and chunk_profiler is not None:
+                profiler.merge(chunk_profiler)
+            previous = worker_stats.get(stats.pid)
+            if previous is not None:
+                stats = WorkerStats(
+                    pid=stats.pid,
+                    files=previous.files + stats.files,
+                    chunks=previous.chunks + stats.chunks,
+                    seconds=previous.seconds + stats.seconds,
+                    stale=previous.stale + stats.stale,
+                    failed=previous.failed + stats.failed,
+                )
+            worker_stats[stats.pid] = stats
+    return worker_stats
+
+
+def _list_git_files(root: Path, rules: IgnoreRules) -> Optional[List[Path]]:
+    """Return the files below *root* known to git that pass *rules*.
+
+    Files inside the default ignored directories are skipped as in a walk,
+    and files that are listed but missing from the work tree are left out.
+
+    Returns:
+        Optional[List[Path]]: The files, or *None* if *root* is not inside a
+        git work tree or git's file list cannot be obtained.
+    """
+    worktree = git.find_worktree(root)
+    if worktree is None:
+        return None
+    pathspec = _pathspec(root, worktree)
+    names = git.list_files(worktree, pathspec)
+    if names is None:
+        return None
+    return _select_git_files(worktree, pathspec, names, rules)
+
+
+def _pathspec(path: Path, worktree: Path) -> str:
+    """Return *path* relative to *worktree* in POSIX form, empty for the root."""
+    pathspec = path.relative_to(worktree).as_posix()
+    return "" if pathspec == "." else pathspec
+
+
+def _select_git_files(
+    worktree: Path, pathspec: str, names: Iterable[str], rules: IgnoreRules
+) -> List[Path]:
+    """Return the existing files among *names* below *pathspec* that pass *rules*.
+
+    *names* are relative to *worktree*; *rules* and the default ignored
+    directories are applied relative to *pathspec*.
+    """
+    prefix = pathspec + "/" if pathspec else ""
+    base = os.path.join(str(worktree), "")
+    found = []
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        rel_path = name[len(prefix):]
+        if any(part in DEFAULT_IGNORE_DIRS for part in rel_path.split("/")[:-1]):
+            continue
+        if not rules.should_process(rel_path):
+            continue
+        # * String paths avoid the cost of pathlib joins for every listed file
+        file_path = base + name
+        if os.path.isfile(file_path):
+            found.append(Path(file_path))
+    return found
+
+
+def _changed_files(
+    path: Path,
+    since: Optional[str],
+    staged: bool,
+    changes: Dict[Path, Set[str]],
+) -> List[Path]:
+    """Return the files in *path* that git reports as changed.
+
+    Directories get the same filtering as git discovery; a file path is kept
+    only if it changed. *changes* caches git's answer per work tree.
+
+    Raises:
+        git.GitError: If *path* is not in a git work tree or git fails.
+    """
+    worktree = git.find_worktree(path)
+    if worktree is None:
+        raise git.GitError(f"'{path}' is not inside a git work tree")
+    if worktree not in changes:
+        changes[worktree] = set(git.changed_files(worktree, since, staged))
+    names = changes[worktree]
+    pathspec = _pathspec(path, worktree)
+    if path.is_file():
+        return [path] if pathspec in names else []
+    blacklist_patterns, whitelist_patterns = load_blacklist_whitelist(path)
+    rules = IgnoreRules((), blacklist_patterns, whitelist_patterns)
+    return _select_git_files(worktree, pathspec, names, rules)
+
+
+def discover_files(
+    paths: List[str],
+    profiler: Optional[Profiler] = None,
+    discovery: str = "walk",
+    changed_since: Optional[str] = None,
+    staged: bool = False,
+) -> List[Path]:
+    """Return the sorted files inside *paths* that pass the ignore rules.
+
+    Directories are walked recursively, honouring ``.gitignore`` files, the
+    default ignored directories and the blacklist/whitelist configuration.
+    Paths that point to files are returned as-is.
 
     Args:
-        paths (List[str]): White-list of root folders or files to scan.
-        verbose (bool, optional): Enables per-file logging when *True*.
-        beta (bool, optional): Enables experimental beta features.
+        paths (List[str]): Root folders or files to scan.
+        profiler (Optional[Profiler], optional): Receives the time spent
+            walking the tree and evaluating the ignore rules.
+        discovery (str, optional): ``"walk"`` walks the file system.
+            ``"git"`` lists the files of the enclosing git work tree with
+            ``git ls-files`` (or from ``.git/index`` when git is not
+            installed), so ignored trees are never traversed; directories
+            outside a work tree are walked.
+        changed_since (Optional[str], optional): Only return files changed
+            since the merge base of this git revision and ``HEAD``, including
+            uncommitted and untracked files. *paths* must be inside a git
+            work tree.
+        staged (bool, optional): Only return files with staged changes.
+
+    Returns:
+        List[Path]: Unique, resolved file paths in sorted order.
+
+    Raises:
+        ValueError: If *discovery* is not one of :data:`DISCOVERY_MODES`, or
+            both *changed_since* and *staged* are given.
+        git.GitError: If changed files are requested and git cannot list them.
     """
+    if discovery not in DISCOVERY_MODES:
+        raise ValueError(f"Unknown discovery mode: {discovery!r}")
+    if changed_since is not None and staged:
+        raise ValueError("changed_since and staged are mutually exclusive")
+    start = time.perf_counter()
+    changes: Dict[Path, Set[str]] = {}
+    ignore_before = profiler.stages.get("ignore", 0.0) if profiler is not None else 0.0
     files_to_process = []
     
     for p_str in paths:
@@ -526,41 +1793,143 @@ def discover_and_process_files(paths: List[str], verbose: bool = False, beta: bo
             if not path.exists():
                 print(f"Warning: '{p_str}' is not a valid path. Skipping.")
                 continue
-                
-            if path.is_dir():
-                # Collect all gitignore patterns from the directory tree
-                ignore_patterns = set()
-                current_dir = path
-                while current_dir != current_dir.parent:
-                    gitignore_path = current_dir / '.gitignore'
-                    if gitignore_path.exists():
-                        ignore_patterns.update(parse_gitignore(gitignore_path))
-                    current_dir = current_dir.parent
-                
+
+            if changed_since is not None or staged:
+                # * Only the diff is listed, so cost scales with its size
+                files_to_process.extend(_changed_files(path, changed_since, staged, changes))
+            elif path.is_dir():
                 # Load blacklist and whitelist from the root directory
                 blacklist_patterns, whitelist_patterns = load_blacklist_whitelist(path)
 
-                for root, dirs, files in os.walk(path):
-                    root_path = Path(root)
-                    
-                    # Filter directories to avoid walking into ignored ones
-                    dirs[:] = [d for d in dirs if d not in DEFAULT_IGNORE_DIRS and not is_path_ignored(root_path / d, ignore_patterns, path)]
-                    
-                    for file in files:
-                        file_path = root_path / file
-                        
-                        # Check if file should be processed
-                        if not should_process_file(file_path, path, ignore_patterns, 
-                                                 blacklist_patterns, whitelist_patterns):
-                            continue
-                        
-                        files_to_process.append(file_path)
+                # * Compile the pattern sets once for the whole walk
+                rules = IgnoreRules((), blacklist_patterns, whitelist_patterns)
+                if discovery == "git":
+                    git_files = _list_git_files(path, rules)
+                    if git_files is not None:
+                        files_to_process.extend(git_files)
+                        continue
+
+                # * .gitignore files above the root; nested ones load during the walk
+                gitignores = load_ancestor_gitignores(path)
+                files_to_process.extend(_scan_directory(path, rules, gitignores, profiler))
             elif path.is_file():
                 files_to_process.append(path)
         except PermissionError:
             print(f"Warning: Could not read configuration (e.g., .gitignore) in '{p_str}' due to a permission error. Skipping path to ensure no unintended files are modified.")
             continue
 
+    if profiler is not None:
+        # * Walking time excludes the ignore checks, which are reported separately
+        ignore_seconds = profiler.stages.get("ignore", 0.0) - ignore_before
+        profiler.add("walk", time.perf_counter() - start - ignore_seconds)
+    return sorted(set(files_to_process))
+
+
+def discover_and_process_files(
+    paths: List[str],
+    verbose: bool = False,
+    beta: bool = False,
+    jobs: int = 1,
+    cache_file: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+    discovery: str = "walk",
+    changed_since: Optional[str] = None,
+    staged: bool = False,
+    check: bool = False,
+    diff: bool = False,
+    fingerprint: bool = False,
+    fsync: bool = False,
+    max_file_size: Optional[int] = None,
+    sniff: bool = True,
+) -> Dict[int, WorkerStats]:
+    """Recursively process all supported files inside *paths*.
+
+    Args:
+        paths (List[str]): White-list of root folders or files to scan.
+        verbose (bool, optional): Enables per-file logging when *True*.
+        beta (bool, optional): Enables experimental beta features.
+        jobs (int, optional): Number of worker processes. ``1`` processes
+            files serially in the current process, ``0`` uses one worker per
+            CPU.
+        cache_file (Optional[str], optional): Path of a persistent cache used
+            to skip files whose header is already current. Disabled when
+            *None*.
+        profiler (Optional[Profiler], optional): Collects per-stage timings,
+            per-language totals and the slowest files, including those of
+            worker processes.
+        discovery (str, optional): How files are found inside directories,
+            ``"walk"`` or ``"git"``; see :func:`discover_files`.
+        changed_since (Optional[str], optional): Only process files changed
+            since this git revision; see :func:`discover_files`.
+        staged (bool, optional): Only process files with staged changes.
+        check (bool, optional): Only report files with a stale header; no
+            file, including the cache, is written. The number of stale files
+            is returned in :attr:`WorkerStats.stale`, and that of files that
+            could not be processed in :attr:`WorkerStats.failed`.
+        diff (bool, optional): Like *check*, but print a unified diff of every
+            stale file.
+        fingerprint (bool, optional): Embed a fingerprint of the code in
+            every header and skip parsing files whose fingerprint matches.
+        fsync (bool, optional): Flush every written file to disk before it
+            replaces the original.
+        max_file_size (Optional[int], optional): Skip files larger than this
+            many bytes.
+        sniff (bool, optional): Skip files that look binary or minified; see
+            :func:`sniff_file`. Skipped files are listed after the run.
+
+    Returns:
+        Dict[int, WorkerStats]: Processing statistics keyed by worker PID.
+    """
+    # * Warnings about the paths are not part of the report either
+    with contextlib.redirect_stdout(_log_stream(check or diff)):
+        files = discover_files(paths, profiler, discovery, changed_since, staged)
+    cache = (
+        HeaderCache.load(
+            Path(cache_file), {"beta": beta, "fingerprint": fingerprint, "parsers": _parser_backends()}
+        )
+        if cache_file is not None
+        else None
+    )
+    files, skipped = _sniff_files(files, max_file_size, sniff, profiler, cache)
+
     # Process all collected files
-    for file_path in sorted(list(set(files_to_process))):
-        process_file(file_path, verbose, beta)
\ No newline at end of file
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    try:
+        if jobs > 1 and len(files) > 1:
+            worker_stats = _process_in_parallel(
+                files, verbose, beta, jobs, cache, profiler, check, diff, fingerprint, fsync
+            )
+        else:
+            start = time.perf_counter()
+            stale = failed = 0
+            writer = _file_writer(fsync, check or diff)
+            for batch_start in range(0, len(files), GO_BATCH_SIZE):
+                batch = files[batch_start:batch_start + GO_BATCH_SIZE]
+                _prefetch_go_files(batch, cache, profiler, fingerprint)
+                for file_path in batch:
+                    result = _process_file(
+                        file_path, verbose, beta, cache, profiler, check, diff, fingerprint, writer
+                    )
+                    if result is None:
+                        failed += 1
+                    else:
+                        stale += result
+            if writer is not None:
+                for failure in writer.close():
+                    print(_write_error(failure), end="")
+            worker_stats = {
+                os.getpid(): WorkerStats(
+                    pid=os.getpid(),
+                    files=len(files),
+                    chunks=1 if files else 0,
+                    seconds=time.perf_counter() - start,
+                    stale=stale,
+                    failed=failed,
+                )
+            }
+        _report_skipped(skipped, check or diff)
+        return worker_stats
+    finally:
+        if cache is not None and not (check or diff):
+            cache.save()
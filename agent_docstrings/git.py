@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - find_worktree(path: Path) -> Optional[Path] (line 35)
+        - resolve_git_dir(worktree: Path) -> Optional[Path] (line 44)
+        - _hash_size(git_dir: Path) -> int (line 65)
+        - _read_varint(data: bytes, pos: int) -> Tuple[int, int] (line 83)
+        - read_index(git_dir: Path) -> Optional[List[str]] (line 95)
+        - ls_files(worktree: Path, pathspec: str = '') -> Optional[List[str]] (line 161)
+        - list_files(worktree: Path, pathspec: str = '') -> Optional[List[str]] (line 193)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import os
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# * Timeout in seconds for git plumbing commands
+GIT_TIMEOUT = 60
+
+_INDEX_SIGNATURE = b"DIRC"
+_REGULAR_FILE = 0o100000
+_STAGE_MASK = 0x3000
+_EXTENDED_FLAG = 0x4000
+_SKIP_WORKTREE = 0x4000
+# * ctime, mtime, dev, ino, mode, uid, gid and size precede the object hash
+_STAT_SIZE = 40
+
+
+def find_worktree(path: Path) -> Optional[Path]:
+    """Return the root of the git work tree containing *path*, if any."""
+    directory = path if path.is_dir() else path.parent
+    for candidate in (directory, *directory.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return None
+
+
+def resolve_git_dir(worktree: Path) -> Optional[Path]:
+    """Return the git directory of *worktree*, following ``gitdir:`` files.
+
+    Linked work trees and submodules store a ``.git`` file pointing to the
+    actual git directory instead of a ``.git`` directory.
+    """
+    dot_git = worktree / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:"):].strip())
+    if not git_dir.is_absolute():
+        git_dir = worktree / git_dir
+    return git_dir if git_dir.is_dir() else None
+
+
+def _hash_size(git_dir: Path) -> int:
+    """Return the object hash size of the repository (20 for SHA-1, 32 for SHA-256)."""
+    common_dir = git_dir
+    try:
+        common_dir = git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        pass
+    try:
+        config = (common_dir / "config").read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return 20
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip().lower() == "objectformat" and value.strip().lower() == "sha256":
+            return 32
+    return 20
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode the offset varint used by index version 4 path compression."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def read_index(git_dir: Path) -> Optional[List[str]]:
+    """List the regular files recorded in the index of *git_dir*.
+
+    Supports index versions 2, 3 and 4. Symbolic links, submodules, sparse
+    directory entries and skip-worktree entries are left out, and conflicted
+    paths are listed once.
+
+    Args:
+        git_dir (Path): The repository's git directory.
+
+    Returns:
+        Optional[List[str]]: POSIX paths relative to the work tree root, or
+        *None* if the index is missing, split or cannot be parsed.
+    """
+    try:
+        data = (git_dir / "index").read_bytes()
+    except OSError:
+        return None
+    try:
+        signature, version, count = struct.unpack_from(">4sII", data, 0)
+        if signature != _INDEX_SIGNATURE or version not in (2, 3, 4):
+            return None
+        hash_size = _hash_size(git_dir)
+        names: List[str] = []
+        seen = set()
+        pos = 12
+        previous = b""
+        for _ in range(count):
+            start = pos
+            mode = struct.unpack_from(">I", data, start + 24)[0]
+            flags_at = start + _STAT_SIZE + hash_size
+            flags = struct.unpack_from(">H", data, flags_at)[0]
+            name_at = flags_at + 2
+            extended = 0
+            if version >= 3 and flags & _EXTENDED_FLAG:
+                extended = struct.unpack_from(">H", data, name_at)[0]
+                name_at += 2
+            if version == 4:
+                strip, name_at = _read_varint(data, name_at)
+                end = data.index(b"\0", name_at)
+                name = previous[:len(previous) - strip] + data[name_at:end]
+                pos = end + 1
+            else:
+                end = data.index(b"\0", name_at)
+                name = data[name_at:end]
+                # * Entries are NUL-padded to a multiple of eight bytes
+                pos = start + ((name_at - start + len(name) + 8) & ~7)
+            previous = name
+            if mode & 0o170000 != _REGULAR_FILE or extended & _SKIP_WORKTREE:
+                continue
+            if flags & _STAGE_MASK and name in seen:
+                continue
+            seen.add(name)
+            names.append(name.decode("utf-8", errors="surrogateescape"))
+        # * A split index keeps most entries in a shared index file
+        end_of_extensions = len(data) - hash_size
+        while pos + 8 <= end_of_extensions:
+            extension, size = struct.unpack_from(">4sI", data, pos)
+            if extension == b"link":
+                return None
+            pos += 8 + size
+    except (struct.error, ValueError, IndexError):
+        return None
+    return names
+
+
+def ls_files(worktree: Path, pathspec: str = "") -> Optional[List[str]]:
+    """List tracked and untracked, non-ignored files with ``git ls-files``.
+
+    Args:
+        worktree (Path): Root of the work tree.
+        pathspec (str): Directory or file relative to *worktree* to restrict
+            the listing to; the whole work tree when empty.
+
+    Returns:
+        Optional[List[str]]: POSIX paths relative to *worktree*, or *None* if
+        git is not installed or the command fails.
+    """
+    git = shutil.which("git")
+    if git is None:
+        return None
+    command = [
+        git, "-C", str(worktree), "ls-files", "-z",
+        "--cached", "--others", "--exclude-standard",
+    ]
+    if pathspec:
+        command += ["--", f":(literal){pathspec}"]
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    names = os.fsdecode(result.stdout).split("\0")
+    # * Unmerged paths are listed once per stage
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def list_files(worktree: Path, pathspec: str = "") -> Optional[List[str]]:
+    """List the files git knows about below *pathspec* in *worktree*.
+
+    Uses ``git ls-files`` when git is installed, which also reports untracked
+    files that are not ignored. Otherwise the index is read directly, which
+    only reports tracked files.
+
+    Returns:
+        Optional[List[str]]: POSIX paths relative to *worktree*, or *None* if
+        neither source is usable.
+    """
+    names = ls_files(worktree, pathspec)
+    if names is not None:
+        return names
+    git_dir = resolve_git_dir(worktree)
+    names = read_index(git_dir) if git_dir is not None else None
+    if names is None or not pathspec:
+        return names
+    prefix = pathspec.rstrip("/") + "/"
+    return [name for name in names if name == pathspec or name.startswith(prefix)]
+
+
+class GitError(RuntimeError):
+    """Raised when a required git command is unavailable or fails."""
+
+
+def _run(worktree: Path, *args: str) -> str:
+    """Run git with *args* in *worktree* and return its decoded output.
+
+    Raises:
+        GitError: If git is not installed or exits with an error.
+    """
+    git = shutil.which("git")
+    if git is None:
+        raise GitError("git is not installed")
+    try:
+        result = subprocess.run(
+            [git, "-C", str(worktree), *args], capture_output=True, timeout=GIT_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise GitError(str(e)) from e
+    if result.returncode != 0:
+        message = os.fsdecode(result.stderr).strip() or f"git {args[0]} failed"
+        raise GitError(message)
+    return os.fsdecode(result.stdout)
+
+
+def _split_names(output: str) -> List[str]:
+    return [name for name in output.split("\0") if name]
+
+
+def changed_files(worktree: Path, since: Optional[str] = None, staged: bool = False) -> List[str]:
+    """List the files of *worktree* that changed since *since* or are staged.
+
+    With *staged*, the files with staged changes are listed, as a pre-commit
+    hook sees them. With *since*, the work tree is compared against the merge
+    base of *since* and ``HEAD``, so committed, uncommitted and untracked
+    (but not ignored) changes on the current branch are all listed. Deleted
+    files are never listed.
+
+    Args:
+        worktree (Path): Root of the work tree.
+        since (Optional[str]): Any revision git understands, e.g.
+            ``origin/main``.
+        staged (bool): List staged changes instead.
+
+    Returns:
+        List[str]: POSIX paths relative to *worktree*.
+
+    Raises:
+        GitError: If git is not installed or a command fails, e.g. because
+            *since* is not a valid revision.
+    """
+    if staged:
+        return _split_names(
+            _run(worktree, "diff", "--cached", "--name-only", "-z", "--diff-filter=ACMRT")
+        )
+    if since is None:
+        raise ValueError("either since or staged is required")
+    base = _run(worktree, "merge-base", since, "HEAD").strip()
+    names = _split_names(
+        _run(worktree, "diff", "--name-only", "-z", "--diff-filter=ACMRT", base, "--")
+    )
+    names += _split_names(_run(worktree, "ls-files", "-z", "--others", "--exclude-standard"))
+    return list(dict.fromkeys(names))
@@ -19,13 +19,19 @@
 package main
 
 import (
+	"bufio"
 	"encoding/json"
+	"flag"
 	"fmt"
 	"go/ast"
 	"go/parser"
 	"go/token"
 	"io"
 	"os"
+	"runtime"
+	"strconv"
+	"strings"
+	"sync"
 )
 
 // SignatureInfo represents a function or method signature with line number
@@ -48,7 +54,48 @@ type ParseResult struct {
 	Functions []SignatureInfo `json:"functions"`
 }
 
+// ErrorResult reports a failed request in server mode
+type ErrorResult struct {
+	Error string `json:"error"`
+}
+
+// BatchRequest is one file to parse in batch mode. Source takes precedence
+// over Path; when Source is absent the file at Path is read.
+type BatchRequest struct {
+	ID     string  `json:"id"`
+	Path   string  `json:"path,omitempty"`
+	Source *string `json:"source,omitempty"`
+}
+
+// BatchResult is the outcome for one BatchRequest
+type BatchResult struct {
+	ID   string `json:"id"`
+	Path string `json:"path,omitempty"`
+	*ParseResult
+	Error string `json:"error,omitempty"`
+}
+
 func main() {
+	server := flag.Bool("server", false, "serve length-prefixed parse requests on stdin")
+	batch := flag.Bool("batch", false, "parse the files given as arguments, or NDJSON requests on stdin")
+	flag.Parse()
+
+	if *batch {
+		if err := runBatch(flag.Args(), os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Error running batch: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
+	if *server {
+		if err := serve(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Error serving requests: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
 	// Read Go source code from stdin
 	input, err := io.ReadAll(os.Stdin)
 	if err != nil {
@@ -69,6 +116,133 @@ func main() {
 	}
 }
 
+// serve answers parse requests until the input is closed. Each request is a
+// decimal byte count on its own line followed by that many bytes of Go source.
+// Each response is a single line of JSON: a ParseResult or an ErrorResult.
+func serve(r io.Reader, w io.Writer) error {
+	reader := bufio.NewReader(r)
+	writer := bufio.NewWriter(w)
+	encoder := json.NewEncoder(writer)
+
+	for {
+		header, err := reader.ReadString('\n')
+		if err == io.EOF && header == "" {
+			return nil
+		}
+		if err != nil {
+			return err
+		}
+
+		size, err := strconv.Atoi(strings.TrimSpace(header))
+		if err != nil || size < 0 {
+			return fmt.Errorf("invalid frame header %q", header)
+		}
+		source := make([]byte, size)
+		if _, err := io.ReadFull(reader, source); err != nil {
+			return err
+		}
+
+		result, err := parseGoCode(string(source))
+		if err != nil {
+			err = encoder.Encode(ErrorResult{Error: err.Error()})
+		} else {
+			err = encoder.Encode(result)
+		}
+		if err != nil {
+			return err
+		}
+		if err := writer.Flush(); err != nil {
+			return err
+		}
+	}
+}
+
+// runBatch parses many files in parallel and writes one NDJSON BatchResult per
+// file, in completion order. Requests come from paths when given, otherwise
+// from a stream of JSON BatchRequest objects read from r.
+func runBatch(paths []string, r io.Reader, w io.Writer) error {
+	requests := make(chan BatchRequest)
+	results := make(chan BatchResult)
+
+	var workers sync.WaitGroup
+	for i := 0; i < runtime.NumCPU(); i++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for request := range requests {
+				results <- parseBatchRequest(request)
+			}
+		}()
+	}
+
+	writeErr := make(chan error, 1)
+	go func() {
+		writer := bufio.NewWriter(w)
+		encoder := json.NewEncoder(writer)
+		var err error
+		for result := range results {
+			if err == nil {
+				err = encoder.Encode(result)
+			}
+		}
+		if err == nil {
+			err = writer.Flush()
+		}
+		writeErr <- err
+	}()
+
+	var readErr error
+	if len(paths) > 0 {
+		for _, path := range paths {
+			requests <- BatchRequest{ID: path, Path: path}
+		}
+	} else {
+		decoder := json.NewDecoder(bufio.NewReader(r))
+		for {
+			var request BatchRequest
+			if err := decoder.Decode(&request); err == io.EOF {
+				break
+			} else if err != nil {
+				readErr = err
+				break
+			}
+			requests <- request
+		}
+	}
+	close(requests)
+	workers.Wait()
+	close(results)
+
+	if err := <-writeErr; err != nil {
+		return err
+	}
+	return readErr
+}
+
+func parseBatchRequest(request BatchRequest) BatchResult {
+	result := BatchResult{ID: request.ID, Path: request.Path}
+
+	var source string
+	if request.Source != nil {
+		source = *request.Source
+	} else {
+		data, err := os.ReadFile(request.Path)
+		if err != nil {
+			result.Error = err.Error()
+			return result
+		}
+		source = string(data)
+	}
+
+	parsed, err := parseGoCode(source)
+	if err != nil {
+		result.Error = err.Error()
+		return result
+	}
+	result.ParseResult = parsed
+	return result
+}
+
 func parseGoCode(source string) (*ParseResult, error) {
 	fset := token.NewFileSet()
 	file, err := parser.ParseFile(fset, "", source, parser.ParseComments)
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _never(name: str) -> None (line 38)
+        - compile_globs(patterns: Iterable[str]) -> GlobMatcher (line 43)
+        - IgnoreRules (line 64):
+            - is_ignored(rel_path: str, is_dir: bool = False) -> bool (line 100)
+            - should_process(rel_path: str, is_dir: bool = False) -> bool (line 110)
+        - cached_rules(ignore_patterns: FrozenSet[str], blacklist: FrozenSet[str] = frozenset(), whitelist: FrozenSet[str] = frozenset()) -> IgnoreRules (line 121)
+        - GitignoreRule (line 130):
+        - _glob_to_regex(glob: str) -> str (line 137)
+        - parse_gitignore_rule(line: str) -> Optional[GitignoreRule] (line 203)
+        - _compile_rules(rules: List[GitignoreRule]) -> Tuple[Optional['re.Pattern[str]'], Tuple[bool, ...]] (line 228)
+        - Gitignore (line 242):
+            - __bool__() -> bool (line 269)
+            - from_file(cls, path: Path, prefix: str = '', strip: int = 0) -> 'Gitignore' (line 273)
+            - match(rel_path: str, is_dir: bool = False) -> Optional[bool] (line 287)
+        - GitignoreStack (line 300):
+            - push(gitignore: Gitignore) -> 'GitignoreStack' (line 312)
+            - is_ignored(rel_path: str, is_dir: bool = False) -> bool (line 318)
+        - load_ancestor_gitignores(root: Path) -> GitignoreStack (line 327)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import fnmatch
+import functools
+import os
+import re
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+# * Signature of a compiled pattern set: returns a match object or None
+GlobMatcher = Callable[[str], Optional["re.Match[str]"]]
+
+
+def _never(name: str) -> None:
+    """Matcher for an empty pattern set."""
+    return None
+
+
+def compile_globs(patterns: Iterable[str]) -> GlobMatcher:
+    """Compile fnmatch-style *patterns* into a single matcher.
+
+    The returned callable matches a name against all patterns in one regular
+    expression search, which is equivalent to
+    ``any(fnmatch.fnmatch(name, p) for p in patterns)`` for names passed
+    through :func:`os.path.normcase`.
+
+    Args:
+        patterns (Iterable[str]): Shell-style patterns.
+
+    Returns:
+        GlobMatcher: Callable returning a match object or *None*.
+    """
+    translated = [fnmatch.translate(os.path.normcase(p)) for p in sorted(set(patterns))]
+    if not translated:
+        return _never
+    # * Every translated pattern is a self-contained ``(?s:...)\Z`` group
+    return re.compile("|".join(translated)).match
+
+
+class IgnoreRules:
+    """Compiled gitignore, blacklist and whitelist patterns of a scan root.
+
+    Each pattern set is compiled once into a combined regular expression, so
+    checking a path costs one regex match per set instead of one
+    ``fnmatch`` call per pattern. Paths are given relative to the scan root
+    in POSIX form, and directory-ness is passed in by the caller (usually
+    from an ``os.scandir`` entry) instead of being looked up with a stat.
+
+    Gitignore patterns ending in ``/`` match a directory by its path with a
+    trailing slash and any other path by the pattern without the slash.
+    Blacklist and whitelist patterns are matched against the path as-is.
+
+    Args:
+        ignore_patterns (Iterable[str]): Gitignore patterns.
+        blacklist (Iterable[str]): Patterns of files never to process.
+        whitelist (Iterable[str]): If not empty, only matching files are
+            processed.
+    """
+
+    def __init__(
+        self,
+        ignore_patterns: Iterable[str],
+        blacklist: Iterable[str] = (),
+        whitelist: Iterable[str] = (),
+    ) -> None:
+        ignore_patterns = set(ignore_patterns)
+        whitelist = set(whitelist)
+        dir_patterns = {p for p in ignore_patterns if p.endswith("/")}
+        self.has_dir_patterns = bool(dir_patterns)
+        self._ignored = compile_globs(p.rstrip("/") for p in ignore_patterns)
+        self._ignored_plain = compile_globs(ignore_patterns - dir_patterns)
+        self._ignored_dir = compile_globs(dir_patterns)
+        self._blacklisted = compile_globs(blacklist)
+        self._whitelisted = compile_globs(whitelist) if whitelist else None
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Return True if *rel_path* matches a gitignore pattern."""
+        name = os.path.normcase(rel_path)
+        if is_dir:
+            return (
+                self._ignored_plain(name) is not None
+                or self._ignored_dir(os.path.normcase(rel_path + "/")) is not None
+            )
+        return self._ignored(name) is not None
+
+    def should_process(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Return True if the file *rel_path* passes all pattern sets."""
+        name = os.path.normcase(rel_path)
+        if self._whitelisted is not None and self._whitelisted(name) is None:
+            return False
+        if self._blacklisted(name) is not None:
+            return False
+        return not self.is_ignored(rel_path, is_dir)
+
+
+@functools.lru_cache(maxsize=64)
+def cached_rules(
+    ignore_patterns: FrozenSet[str],
+    blacklist: FrozenSet[str] = frozenset(),
+    whitelist: FrozenSet[str] = frozenset(),
+) -> IgnoreRules:
+    """Return the compiled :class:`IgnoreRules` for the given pattern sets."""
+    return IgnoreRules(ignore_patterns, blacklist, whitelist)
+
+
+class GitignoreRule(NamedTuple):
+    """Stores a single parsed ``.gitignore`` pattern."""
+    regex: str
+    negated: bool
+    dir_only: bool
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate a gitignore glob into a regular expression.
+
+    ``*`` and ``?`` do not match ``/``; ``**`` as a whole path segment
+    matches any number of directories.
+    """
+    out: List[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            j = i
+            while j < n and glob[j] == "*":
+                j += 1
+            whole_segment = (i == 0 or glob[i - 1] == "/") and (j == n or glob[j] == "/")
+            if j - i == 2 and whole_segment:
+                if j == n:
+                    # * Trailing "/**" matches everything inside
+                    out.append(".*")
+                    i = j
+                else:
+                    # * "**/" matches zero or more directories
+                    out.append("(?:.*/)?")
+                    i = j + 1
+                continue
+            out.append("[^/]*")
+            i = j
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = i + 1
+            if j < n and glob[j] in "!^":
+                j += 1
+            if j < n and glob[j] == "]":
+                j += 1
+            while j < n and glob[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = glob[i + 1:j]
+            negated = body[:1] in ("!", "^")
+            if negated:
+                body = body[1:]
+            chars = []
+            k = 0
+            while k < len(body):
+                if body[k] == "\\" and k + 1 < len(body):
+                    chars.append(re.escape(body[k + 1]))
+                    k += 2
+                    continue
+                chars.append("-" if body[k] == "-" else re.escape(body[k]))
+                k += 1
+            out.append(("[^/" if negated else "[") + "".join(chars) + "]")
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def parse_gitignore_rule(line: str) -> Optional[GitignoreRule]:
+    """Parse one ``.gitignore`` line, returning *None* for blanks and comments."""
+    line = line.rstrip("\r\n")
+    # * Trailing spaces are ignored unless escaped with a backslash
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    if dir_only:
+        line = line[:-1]
+    if not line:
+        return None
+    # * A slash at the beginning or in the middle anchors the pattern to the
+    # * directory of the .gitignore file; otherwise it matches at any depth
+    anchored = "/" in line
+    regex = _glob_to_regex(line.lstrip("/"))
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return GitignoreRule(regex, negated, dir_only)
+
+
+def _compile_rules(rules: List[GitignoreRule]) -> Tuple[Optional["re.Pattern[str]"], Tuple[bool, ...]]:
+    """Compile *rules* so that the last matching rule is found by one match.
+
+    The rules are joined in reverse order with one capturing group each, so
+    the first alternative that matches, reported by ``lastindex``, is the
+    last matching rule of the file.
+    """
+    if not rules:
+        return None, ()
+    ordered = rules[::-1]
+    pattern = "|".join(f"({rule.regex})" for rule in ordered)
+    return re.compile(pattern, re.DOTALL), tuple(rule.negated for rule in ordered)
+
+
+class Gitignore:
+    """Compiled rules of a single ``.gitignore`` file.
+
+    Paths are matched relative to the directory containing the file. Since
+    callers pass paths relative to their scan root, the matcher converts
+    them by prepending *prefix* (for files in ancestors of the scan root) or
+    by removing the first *strip* characters (for nested files).
+
+    Args:
+        lines (Iterable[str]): Lines of the ``.gitignore`` file.
+        prefix (str): Path of the scan root relative to the file's
+            directory, with a trailing slash, or an empty string.
+        strip (int): Length of the file's directory path relative to the scan
+            root, including the trailing slash.
+    """
+
+    __slots__ = ("rules", "prefix", "strip", "_dirs", "_dir_negated", "_files", "_file_negated")
+
+    def __init__(self, lines: Iterable[str], prefix: str = "", strip: int = 0) -> None:
+        self.rules = [rule for rule in map(parse_gitignore_rule, lines) if rule is not None]
+        self.prefix = prefix
+        self.strip = strip
+        self._dirs, self._dir_negated = _compile_rules(self.rules)
+        self._files, self._file_negated = _compile_rules(
+            [rule for rule in self.rules if not rule.dir_only]
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    @classmethod
+    def from_file(cls, path: Path, prefix: str = "", strip: int = 0) -> "Gitignore":
+        """Load *path*; a missing or unreadable file yields an empty matcher.
+
+        Raises:
+            PermissionError: If the file exists but cannot be read.
+        """
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return cls(f, prefix, strip)
+        except PermissionError:
+            raise
+        except OSError:
+            return cls((), prefix, strip)
+
+    def match(self, rel_path: str, is_dir: bool = False) -> Optional[bool]:
+        """Return True if ignored, False if re-included, None if no rule matches."""
+        regex, negated = (
+            (self._dirs, self._dir_negated) if is_dir else (self._files, self._file_negated)
+        )
+        if regex is None:
+            return None
+        match = regex.fullmatch(self.prefix + rel_path[self.strip:])
+        if match is None or match.lastindex is None:
+            return None
+        return not negated[match.lastindex - 1]
+
+
+class GitignoreStack:
+    """Immutable stack of the ``.gitignore`` files in scope for a directory.
+
+    Deeper files take precedence over the files of their ancestors, and the
+    last matching rule within a file wins, as in git.
+    """
+
+    __slots__ = ("matchers",)
+
+    def __init__(self, matchers: Tuple[Gitignore, ...] = ()) -> None:
+        self.matchers = matchers
+
+    def push(self, gitignore: Gitignore) -> "GitignoreStack":
+        """Return a new stack with *gitignore* as its innermost file."""
+        if not gitignore:
+            return self
+        return GitignoreStack(self.matchers + (gitignore,))
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Return True if *rel_path*, relative to the scan root, is ignored."""
+        for matcher in reversed(self.matchers):
+            result = matcher.match(rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
+def load_ancestor_gitignores(root: Path) -> GitignoreStack:
+    """Return the ``.gitignore`` files of the directories above *root*.
+
+    Directories are searched upward until the root of the enclosing git
+    repository; outside a repository every ancestor is searched. The file in
+    *root* itself is not included, as the walk loads it lazily.
+
+    Raises:
+        PermissionError: If a ``.gitignore`` file cannot be read.
+    """
+    ancestors = []
+    directory = root
+    while not (directory / ".git").exists() and directory != directory.parent:
+        directory = directory.parent
+        ancestors.append(directory)
+    stack = GitignoreStack()
+    for ancestor in reversed(ancestors):
+        gitignore_path = ancestor / ".gitignore"
+        if gitignore_path.is_file():
+            prefix = root.relative_to(ancestor).as_posix() + "/"
+            stack = stack.push(Gitignore.from_file(gitignore_path, prefix=prefix))
+    return stack
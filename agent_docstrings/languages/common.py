@@ -1,21 +1,25 @@
 """
     --- AUTO-GENERATED DOCSTRING ---
-    Table of content is automatically generated by Agent Docstrings v1.3.0
+    Table of content is automatically generated by Agent Docstrings v1.3.2
     
     Classes/Functions:
-        - SignatureInfo (line 20):
-        - ClassInfo (line 26):
-        - CommentStyle (line 34):
-        - remove_agent_docstring(text: str, language: str) -> str (line 57)
+        - SignatureInfo (line 24):
+        - ClassInfo (line 30):
+        - CommentStyle (line 38):
+        - _skip_whitespace(text: str, pos: int) -> int (line 73)
+        - agent_docstring_end(text: str, language: str, pos: int = 0) -> int (line 80)
+        - remove_agent_docstring(text: str, language: str) -> str (line 145)
     --- END AUTO-GENERATED DOCSTRING ---
 """
 from __future__ import annotations
 
 import re
-from typing import List, Tuple, Dict, NamedTuple
+from typing import List, Tuple, Dict, NamedTuple, Pattern
 
 DOCSTRING_START_MARKER = "--- AUTO-GENERATED DOCSTRING ---"
 DOCSTRING_END_MARKER = "--- END AUTO-GENERATED DOCSTRING ---"
+# * Most lines joined into one statement while its parentheses are open
+MAX_STATEMENT_LINES = 32
 
 class SignatureInfo(NamedTuple):
     """Stores information about a parsed function or method signature."""
@@ -54,66 +58,104 @@ COMMENT_STYLES: Dict[str, CommentStyle] = {
 }
 
 
-def remove_agent_docstring(text: str, language: str) -> str:
-    """Remove a previously generated docstring from *text*.
+# * Compiled once; each pattern is matched at a fixed position, never searched
+_PYTHON_HEADER_START_RE = re.compile(r'\s*"""\s*' + re.escape(DOCSTRING_START_MARKER))
+_PYTHON_HEADER_CLOSE_RE = re.compile(r'\s*"""')
+_LEGACY_PYTHON_HEADER_START_RE = re.compile(r'\s*"""\s*Classes/Functions:')
+_COMMENT_OPEN_RES: Dict[str, Pattern[str]] = {
+    language: re.compile(r"\s*" + re.escape(style.start.rstrip()))
+    for language, style in COMMENT_STYLES.items()
+    if language != "python"
+}
+_WHITESPACE_RE = re.compile(r"\s*")
+
 
-    The search uses language-specific comment patterns to find a block
-    containing DOCSTRING_START_MARKER and DOCSTRING_END_MARKER at the
-    beginning of the file, and removes it.
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE_RE.match(text, pos)
+    # * An empty match succeeds at any position
+    assert match is not None
+    return match.end()
+
+
+def agent_docstring_end(text: str, language: str, pos: int = 0) -> int:
+    """Return the offset at which the code after a generated docstring starts.
+
+    The docstring must open ``text[pos:]``: a comment in the language's
+    style (see :data:`COMMENT_STYLES`) whose first lines hold
+    DOCSTRING_START_MARKER, closed after DOCSTRING_END_MARKER. Only the
+    start of the text is inspected, and the markers are located with plain
+    substring searches, so the cost grows with the size of the docstring
+    rather than of the file.
 
     Args:
-        text (str): Full contents of the source file.
+        text (str): Contents of the source file.
         language (str): Canonical language name (e.g. ``"python"``) used
             to pick the correct comment delimiters from
             :data:`COMMENT_STYLES`.
+        pos (int, optional): Offset at which the docstring would start.
 
     Returns:
-        str: *text* without the agent docstring block. If no such
-        docstring is detected, *text* is returned unchanged.
+        int: The offset after the docstring and the whitespace following it,
+        or *pos* if no docstring is detected.
     """
     style = COMMENT_STYLES[language]
-    
-    # ! Create a more flexible pattern that can match various formats
-    start_marker_escaped = re.escape(DOCSTRING_START_MARKER)
-    end_marker_escaped = re.escape(DOCSTRING_END_MARKER)
-    
+
     if language == "python":
-        # * Python uses triple quotes - check for new format first
-        pattern = re.compile(
-            rf'^\s*"""\s*{start_marker_escaped}.*?{end_marker_escaped}\s*"""\s*\n?',
-            re.DOTALL
-        )
-        match = pattern.search(text)
+        match = _PYTHON_HEADER_START_RE.match(text, pos)
         if match:
-            return text[match.end():]
-        
+            # * The docstring closes at the first end marker followed by quotes
+            search = match.end()
+            while (end := text.find(DOCSTRING_END_MARKER, search)) >= 0:
+                closing = _PYTHON_HEADER_CLOSE_RE.match(text, end + len(DOCSTRING_END_MARKER))
+                if closing:
+                    return _skip_whitespace(text, closing.end())
+                search = end + 1
+
         # * Also check for old format (without proper markers)
-        old_format_pattern = re.compile(
-            rf'^\s*"""\s*Classes/Functions:.*?"""\s*\n?',
-            re.DOTALL
-        )
-        match = old_format_pattern.search(text)
+        match = _LEGACY_PYTHON_HEADER_START_RE.match(text, pos)
         if match:
-            return text[match.end():]
-    else:
-        # * For C-style comments, be more flexible with the format
-        # * Handle both compact (/**---...---*/) and expanded formats
-        start_escaped = re.escape(style.start.rstrip())  # Remove trailing spaces
-        
-        # * Handle different possible endings (with or without space before *)
-        end_patterns = [
-            re.escape(style.end),  # Original format with space
-            re.escape(style.end.strip()),  # Without space
-        ]
-        
-        # * Try each possible end pattern
-        for end_pattern in end_patterns:
-            pattern = re.compile(
-                rf'^\s*{start_escaped}.*?{start_marker_escaped}.*?{end_marker_escaped}.*?{end_pattern}\s*\n?',
-                re.DOTALL
-            )
-            match = pattern.search(text)
-            if match:
-                return text[match.end():]
-    
-    return text
\ No newline at end of file
+            end = text.find('"""', match.end())
+            if end >= 0:
+                return _skip_whitespace(text, end + 3)
+        return pos
+
+    opening = _COMMENT_OPEN_RES[language].match(text, pos)
+    if opening is None:
+        return pos
+    # ! The start marker must lie in the opening comment, which bounds the scan
+    # ! of files that start with an ordinary comment
+    comment_end = text.find(style.end.strip(), opening.end())
+    start = text.find(
+        DOCSTRING_START_MARKER, opening.end(), len(text) if comment_end < 0 else comment_end
+    )
+    if start < 0:
+        return pos
+    end = text.find(DOCSTRING_END_MARKER, start + len(DOCSTRING_START_MARKER))
+    if end < 0:
+        return pos
+    end += len(DOCSTRING_END_MARKER)
+    # * Handle both " */" and "*/" closings, preferring the former like earlier versions
+    for delimiter in (style.end, style.end.strip()):
+        index = text.find(delimiter, end)
+        if index >= 0:
+            return _skip_whitespace(text, index + len(delimiter))
+    return pos
+
+
+def remove_agent_docstring(text: str, language: str) -> str:
+    """Remove a previously generated docstring from *text*.
+
+    See :func:`agent_docstring_end` for the docstrings that are detected.
+
+    Args:
+        text (str): Full contents of the source file.
+        language (str): Canonical language name (e.g. ``"python"``) used
+            to pick the correct comment delimiters from
+            :data:`COMMENT_STYLES`.
+
+    Returns:
+        str: *text* without the agent docstring block. If no such
+        docstring is detected, *text* is returned unchanged.
+    """
+    end = agent_docstring_end(text, language)
+    return text[end:] if end else text
@@ -1,16 +1,18 @@
 """
     --- AUTO-GENERATED DOCSTRING ---
-    Table of content is automatically generated by Agent Docstrings v1.3.0
+    Table of content is automatically generated by Agent Docstrings v1.3.2
     
     Classes/Functions:
-        - parse_delphi_file(lines: List[str]) -> tuple[List[ClassInfo], List[SignatureInfo]] (line 28)
+        - _join(parts: Iterable[str]) -> str (line 32)
+        - _statements(lines: Iterable[str]) -> Iterator[Tuple[int, str]] (line 40)
+        - parse_delphi_file(lines: Iterable[str]) -> tuple[List[ClassInfo], List[SignatureInfo]] (line 73)
     --- END AUTO-GENERATED DOCSTRING ---
 """
 from __future__ import annotations
 import re
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
-from .common import ClassInfo, SignatureInfo
+from .common import MAX_STATEMENT_LINES, ClassInfo, SignatureInfo
 
 # Delphi (Object Pascal) regexes
 # Note: These are simplified and might not cover all syntax variations.
@@ -24,9 +26,52 @@ DELPHI_FUNCTION_RE = re.compile(
     r"^\s*(?:function)\s+([\w\.]+)\s*(\([^)]*\))?\s*:\s*[\w\.]+\s*;", re.IGNORECASE
 )
 
+_ROUTINE_STARTS = ("procedure", "function")
+
+
+def _join(parts: Iterable[str]) -> str:
+    """Join stripped lines with single blanks, but none inside parentheses."""
+    text = ""
+    for part in parts:
+        text += part if not text or text.endswith("(") or part.startswith(")") else " " + part
+    return text
+
+
+def _statements(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Yield the stripped lines of *lines* with their numbers, joining routine headers.
+
+    A ``procedure`` or ``function`` header whose parameter list spans several
+    lines is joined into one line, numbered like the first, up to the line
+    that closes the list. Each line is looked at once: a list still open
+    after :data:`MAX_STATEMENT_LINES` lines is passed on unjoined.
+    """
+    pending: List[Tuple[int, str]] = []
+    balance = 0
+    for line_num, line in enumerate(lines, 1):
+        stripped_line = line.strip()
+        if pending:
+            if not stripped_line:
+                continue
+            pending.append((line_num, stripped_line))
+            balance += stripped_line.count("(") - stripped_line.count(")")
+            if balance <= 0:
+                yield pending[0][0], _join(part for _, part in pending)
+                pending = []
+            elif len(pending) == MAX_STATEMENT_LINES:
+                yield from pending
+                pending = []
+        elif (
+            stripped_line.lower().startswith(_ROUTINE_STARTS)
+            and (balance := stripped_line.count("(") - stripped_line.count(")")) > 0
+        ):
+            pending = [(line_num, stripped_line)]
+        else:
+            yield line_num, stripped_line
+    yield from pending
+
 
 def parse_delphi_file(
-    lines: List[str],
+    lines: Iterable[str],
 ) -> tuple[List[ClassInfo], List[SignatureInfo]]:
     """Parse *lines* and extract structural information for a Delphi/Pascal file.
 
@@ -34,7 +79,7 @@ def parse_delphi_file(
     approximation.
 
     Args:
-        lines (List[str]): Source code split into individual lines.
+        lines (Iterable[str]): Source code lines, consumed in a single pass.
 
     Returns:
         A tuple containing lists of classes and top-level functions/procedures.
@@ -45,8 +90,7 @@ def parse_delphi_file(
     scope_balance: int = 0  # Using 'begin' and 'end'
     scope_stack: List[int] = []
 
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
+    for line_num, stripped_line in _statements(lines):
         if not stripped_line or stripped_line.startswith(("{", "}", "//")):
             continue
 
@@ -1,16 +1,17 @@
 """
     --- AUTO-GENERATED DOCSTRING ---
-    Table of content is automatically generated by Agent Docstrings v1.3.0
+    Table of content is automatically generated by Agent Docstrings v1.3.2
     
     Classes/Functions:
-        - parse_generic_file(lines: List[str], lang: str) -> tuple[List[ClassInfo], List[SignatureInfo]] (line 36)
+        - parse_generic_file(lines: Iterable[str], lang: str) -> tuple[List[ClassInfo], List[SignatureInfo]] (line 37)
     --- END AUTO-GENERATED DOCSTRING ---
 """
 from __future__ import annotations
 import re
-from typing import List
+from typing import Iterable, List
 
 from .common import ClassInfo, SignatureInfo
+from .scanner import ClassScopes, join_statements, scan_lines, signature_of
 
 # Regexes are intentionally kept simple to capture common cases.
 # They may not capture all edge cases of the language syntax.
@@ -34,13 +35,13 @@ CPP_FUNC_RE = re.compile(r"^\s*(?:virtual\s|inline\s|static\s)?[\w:<>~,*\s]+\s+(
 
 
 def parse_generic_file(
-    lines: List[str],
+    lines: Iterable[str],
     lang: str,
 ) -> tuple[List[ClassInfo], List[SignatureInfo]]:
     """Parse *lines* and extract structural information for a C-style language.
 
     Args:
-        lines (List[str]): Source code split into individual lines.
+        lines (Iterable[str]): Source code lines, consumed in a single pass.
         lang (str): Canonical language identifier. Supported values are
             ``"javascript"``, ``"typescript"``, ``"csharp"`` and ``"cpp"``.
 
@@ -58,46 +59,22 @@ def parse_generic_file(
     else:
         return [], []
 
-    classes: List[ClassInfo] = []
+    scopes = ClassScopes()
     top_level_funcs: List[SignatureInfo] = []
-    class_stack: List[ClassInfo] = []
-    brace_level = 0
-    
-    for line_num, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-
-        # Handle exiting scopes
-        if "}" in stripped_line:
-            brace_level -= stripped_line.count("}")
-            if class_stack and brace_level < len(class_stack):
-                class_stack.pop()
-
-        class_match = class_re.match(stripped_line)
-        func_match = func_re.match(stripped_line)
 
-        if class_match:
-            class_name = class_match.group(1)
-            new_class = ClassInfo(name=class_name, line=line_num, methods=[], inner_classes=[])
-            if class_stack:
-                class_stack[-1].inner_classes.append(new_class)
-            else:
-                classes.append(new_class)
-            
-            if "{" in stripped_line:
-                class_stack.append(new_class)
-                brace_level += stripped_line.count("{")
-            continue
-
-        if func_match:
-            signature = stripped_line.split("{")[0].strip()
-            info = SignatureInfo(signature=signature, line=line_num)
-            if class_stack:
-                class_stack[-1].methods.append(info)
+    for scanned in join_statements(scan_lines(lines, lang)):
+        code = scanned.code
+        # * Cheap substring checks skip the regexes on lines that cannot match
+        if "class" in code and (class_match := class_re.match(code.strip())):
+            scopes.declare(ClassInfo(name=class_match.group(1), line=scanned.number, methods=[], inner_classes=[]))
+        elif "(" in code and func_re.match(code.strip()):
+            info = SignatureInfo(signature=signature_of(scanned), line=scanned.number)
+            current = scopes.current
+            if current is not None:
+                current.methods.append(info)
             else:
                 top_level_funcs.append(info)
+        if scanned.braces or scopes.pending is not None:
+            scopes.advance(scanned)
 
-        # Handle entering new scopes
-        if "{" in stripped_line and not class_match:
-             brace_level += stripped_line.count("{")
-
-    return classes, top_level_funcs
\ No newline at end of file
+    return scopes.classes, top_level_funcs
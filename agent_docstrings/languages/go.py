@@ -11,16 +11,23 @@
 """
 from __future__ import annotations
 import json
+import hashlib
 import subprocess
 import os
 import sys
+import atexit
 import platform
+import queue
+import threading
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import re
 
 from .common import ClassInfo, SignatureInfo
 
+# * Seconds to wait for a freshly started parser server to answer a probe
+SERVER_STARTUP_TIMEOUT = 10
+
 
 def _get_go_parser_path() -> Path:
     """Get the path to the Go AST parser executable for the current OS."""
@@ -57,29 +64,214 @@ def _get_go_parser_path() -> Path:
     raise FileNotFoundError("Go AST parser executable not found for this platform.")
 
 
-def _parse_with_go_ast(source_code: str) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
-    """Parse Go code using the Go AST parser utility."""
-    # * Ensure the Go AST parser utility is available
-    parser_path = _get_go_parser_path()
-    if not parser_path.exists():
-        raise FileNotFoundError(f"Go AST parser not found at {parser_path}")
+class _GoParserServer:
+    """A resident ``go_ast_parser -server`` process answering framed requests.
 
-    # * Run the Go parser utility
-    result = subprocess.run(
-        [str(parser_path)],
-        input=source_code,
-        text=True,
-        capture_output=True,
-        timeout=30  # * Timeout after 30 seconds
-    )
+    Each request is the byte length of the source on its own line followed by
+    the UTF-8 encoded source; each response is one line of JSON.
+    """
 
-    # * Raise an exception if parsing failed
-    result.check_returncode()
+    def __init__(self, parser_path: Path) -> None:
+        self.process = subprocess.Popen(
+            [str(parser_path), "-server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
 
-    # * Parse JSON output
-    data = json.loads(result.stdout)
+    def alive(self) -> bool:
+        """Return *True* while the server process is running."""
+        return self.process.poll() is None
+
+    def send(self, source_code: str) -> None:
+        """Write a single parse request frame."""
+        data = source_code.encode("utf-8")
+        assert self.process.stdin is not None
+        self.process.stdin.write(b"%d\n" % len(data) + data)
+        self.process.stdin.flush()
+
+    def receive(self) -> Dict[str, Any]:
+        """Read the response to the last request.
+
+        Raises:
+            RuntimeError: If the server exited before answering.
+            SyntaxError: If the server could not parse the source.
+        """
+        assert self.process.stdout is not None
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("Go AST parser server exited unexpectedly")
+        data: Dict[str, Any] = json.loads(line)
+        if "error" in data:
+            raise SyntaxError(data["error"])
+        return data
+
+    def parse(self, source_code: str) -> Dict[str, Any]:
+        """Parse *source_code* and return the decoded JSON result."""
+        self.send(source_code)
+        return self.receive()
+
+    def probe(self, timeout: float) -> bool:
+        """Check that the process speaks the server protocol within *timeout*.
+
+        Parser binaries built before server mode existed ignore the flag and
+        wait for the end of stdin instead of answering.
+        """
+        answered = threading.Event()
+
+        def _probe() -> None:
+            try:
+                self.parse("package probe\n")
+                answered.set()
+            except Exception:
+                pass
 
-    # * Convert to our data structures
+        thread = threading.Thread(target=_probe, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        return answered.is_set()
+
+    def close(self) -> None:
+        """Stop the server process."""
+        try:
+            if self.process.stdin is not None:
+                self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+
+
+class GoParserPool:
+    """A thread-safe pool of resident Go parser servers.
+
+    Servers are started lazily, reused across files and replaced when they
+    die. If the parser binary does not support server mode, the pool reports
+    itself as unavailable so callers can fall back to one process per file.
+
+    Args:
+        size (int): Maximum number of concurrently running servers.
+    """
+
+    def __init__(self, size: int = 1) -> None:
+        self.size = size
+        self.available = True
+        self._idle: "queue.LifoQueue[_GoParserServer]" = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._all: List[_GoParserServer] = []
+
+    def _acquire(self) -> _GoParserServer:
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    start_new = self._started < self.size
+                    if start_new:
+                        self._started += 1
+                if not start_new:
+                    try:
+                        # * Re-check periodically in case a busy server died
+                        server = self._idle.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                else:
+                    try:
+                        server = self._start()
+                    except Exception:
+                        with self._lock:
+                            self._started -= 1
+                        raise
+            if server.alive():
+                return server
+            self._discard(server)
+
+    def _start(self) -> _GoParserServer:
+        try:
+            parser_path = _get_go_parser_path()
+        except FileNotFoundError:
+            self.available = False
+            raise
+        server = _GoParserServer(parser_path)
+        if not server.probe(SERVER_STARTUP_TIMEOUT):
+            server.process.kill()
+            self.available = False
+            raise RuntimeError("Go AST parser does not support server mode")
+        with self._lock:
+            self._all.append(server)
+        return server
+
+    def _discard(self, server: _GoParserServer) -> None:
+        server.close()
+        with self._lock:
+            self._started -= 1
+            if server in self._all:
+                self._all.remove(server)
+
+    def parse(self, source_code: str) -> Dict[str, Any]:
+        """Parse *source_code* on a pooled server, restarting dead servers once."""
+        for attempt in range(2):
+            server = self._acquire()
+            try:
+                result = server.parse(source_code)
+            except SyntaxError:
+                self._idle.put(server)
+                raise
+            except (OSError, RuntimeError, ValueError):
+                # * The server died or its output is corrupt; replace it
+                self._discard(server)
+                if attempt:
+                    raise
+                continue
+            self._idle.put(server)
+            return result
+        raise RuntimeError("unreachable")
+
+    def warm(self) -> bool:
+        """Start a server ahead of the first parse; returns False if unavailable."""
+        if not self.available:
+            return False
+        try:
+            self._idle.put(self._acquire())
+        except Exception:
+            return False
+        return True
+
+    def close(self) -> None:
+        """Stop all servers started by this pool."""
+        with self._lock:
+            servers, self._all = self._all, []
+            self._started = 0
+        for server in servers:
+            server.close()
+        self._idle = queue.LifoQueue()
+
+    def forget(self) -> None:
+        """Drop all servers without stopping them (used in forked children)."""
+        self._all = []
+        self._started = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+
+_GO_PARSER_POOL = GoParserPool()
+atexit.register(_GO_PARSER_POOL.close)
+if hasattr(os, "register_at_fork"):
+    # ! A forked worker must not share the parent's server pipes
+    os.register_at_fork(after_in_child=_GO_PARSER_POOL.forget)
+
+
+def warm_go_parser() -> bool:
+    """Start a resident Go parser so the next parse does not pay its startup.
+
+    Returns:
+        bool: True if a server is running, False if server mode is unavailable.
+    """
+    return _GO_PARSER_POOL.warm()
+
+
+def _result_from_json(data: Dict[str, Any]) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
+    """Convert the JSON output of the Go AST parser to our data structures."""
     classes: List[ClassInfo] = []
     for class_data in data.get("classes", []):
         methods = [
@@ -115,17 +307,138 @@ def _parse_with_go_ast(source_code: str) -> Tuple[List[ClassInfo], List[Signatur
     return classes, functions
 
 
+# * Results of the last batch primed by each thread, in ``primed``, keyed by
+# * source digest; ``None`` marks a failure. Server threads prime and parse
+# * the files of their own requests.
+_local = threading.local()
+
+
+def _source_digest(source_code: str) -> bytes:
+    return hashlib.blake2b(source_code.encode("utf-8"), digest_size=16).digest()
+
+
+def parse_go_sources(
+    sources: List[str],
+) -> List[Optional[Tuple[List[ClassInfo], List[SignatureInfo]]]]:
+    """Parse many Go sources with a single ``go_ast_parser -batch`` process.
+
+    The parser handles the sources in parallel goroutines and answers with one
+    NDJSON line per source.
+
+    Args:
+        sources (List[str]): Complete Go sources to parse.
+
+    Returns:
+        List[Optional[Tuple[List[ClassInfo], List[SignatureInfo]]]]: Parse
+        results in the order of *sources*; ``None`` for sources the Go parser
+        rejected.
+
+    Raises:
+        Exception: If the parser is unavailable or the batch as a whole failed.
+    """
+    parser_path = _get_go_parser_path()
+    requests = "".join(
+        json.dumps({"id": str(i), "source": source}) + "\n"
+        for i, source in enumerate(sources)
+    )
+    result = subprocess.run(
+        [str(parser_path), "-batch"],
+        input=requests,
+        encoding="utf-8",
+        capture_output=True,
+        timeout=30 + len(sources),
+    )
+    result.check_returncode()
+
+    parsed: List[Optional[Tuple[List[ClassInfo], List[SignatureInfo]]]] = [None] * len(sources)
+    seen = 0
+    for line in result.stdout.splitlines():
+        data = json.loads(line)
+        seen += 1
+        if not data.get("error"):
+            parsed[int(data["id"])] = _result_from_json(data)
+    if seen != len(sources):
+        raise RuntimeError("Go AST parser batch returned an incomplete result")
+    return parsed
+
+
+def prime_go_parser(sources: List[str]) -> None:
+    """Parse *sources* in one batch so later :func:`parse_go_file` calls are free.
+
+    Only the most recent batch of the calling thread is kept, which bounds
+    memory use, and only that thread's calls use it. Failures are silent:
+    affected sources are simply parsed one at a time later.
+    """
+    _local.primed = {}
+    if len(sources) < 2:
+        return
+    try:
+        results = parse_go_sources(sources)
+    except Exception:
+        return
+    _local.primed = {_source_digest(source): parsed for source, parsed in zip(sources, results)}
+
+
+def _parse_with_go_ast(source_code: str) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
+    """Parse Go code using the Go AST parser utility.
+
+    Results primed by :func:`prime_go_parser` are used first. Otherwise a
+    resident parser server is used when available, or the parser is started
+    once for this file.
+    """
+    primed_results: Optional[Dict[bytes, Optional[Tuple[List[ClassInfo], List[SignatureInfo]]]]] = getattr(
+        _local, "primed", None
+    )
+    if primed_results:
+        digest = _source_digest(source_code)
+        if digest in primed_results:
+            primed = primed_results.pop(digest)
+            if primed is None:
+                raise SyntaxError("Go AST parser rejected the source")
+            return primed
+
+    if _GO_PARSER_POOL.available:
+        try:
+            return _result_from_json(_GO_PARSER_POOL.parse(source_code))
+        except SyntaxError:
+            raise
+        except Exception:
+            if _GO_PARSER_POOL.available:
+                raise
+            # * Old parser binary without server mode: use one-shot mode below
+
+    # * Ensure the Go AST parser utility is available
+    parser_path = _get_go_parser_path()
+    if not parser_path.exists():
+        raise FileNotFoundError(f"Go AST parser not found at {parser_path}")
+
+    # * Run the Go parser utility
+    result = subprocess.run(
+        [str(parser_path)],
+        input=source_code,
+        text=True,
+        capture_output=True,
+        timeout=30  # * Timeout after 30 seconds
+    )
+
+    # * Raise an exception if parsing failed
+    result.check_returncode()
+
+    # * Parse JSON output
+    return _result_from_json(json.loads(result.stdout))
+
+
 def parse_go_file(
-    lines: List[str],
+    lines: Iterable[str],
 ) -> tuple[List[ClassInfo], List[SignatureInfo]]:
     """Parse Go source and extract structural information.
 
-    This parser uses Go's built-in AST parser via a subprocess call to a
-    compiled Go utility. If the Go parser is not available or fails,
+    This parser uses Go's built-in AST parser via a compiled Go utility that
+    stays resident between files. If the Go parser is not available or fails,
     it falls back to a simplified regex-based parser.
 
     Args:
-        lines (List[str]): Source code split into individual lines.
+        lines (Iterable[str]): Source code lines, consumed in a single pass.
 
     Returns:
         Tuple[List[ClassInfo], List[SignatureInfo]]: Interfaces (treated as
@@ -136,8 +449,8 @@ def parse_go_file(
     try:
         return _parse_with_go_ast(source_code)
     except Exception:
-        # Fallback to regex parser on any error
-        return _parse_with_regex(lines)
+        # Fallback to regex parser on any error; *lines* may already be consumed
+        return _parse_with_regex(source_code.split("\n"))
 
 
 def _parse_with_regex(lines: List[str]) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
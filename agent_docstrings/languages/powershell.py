@@ -8,7 +8,7 @@
 """
 from __future__ import annotations
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
 from .common import ClassInfo, SignatureInfo
 
@@ -21,14 +21,14 @@ POWERSHELL_FUNC_RE = re.compile(
 
 
 def parse_powershell_file(
-    lines: List[str],
+    lines: Iterable[str],
 ) -> tuple[List[ClassInfo], List[SignatureInfo]]:
     """Parse *lines* and extract functions from a PowerShell script.
 
     This is a simplified parser focusing on top-level functions.
 
     Args:
-        lines (List[str]): Source code split into individual lines.
+        lines (Iterable[str]): Source code lines, consumed in a single pass.
 
     Returns:
         Tuple[List[ClassInfo], List[SignatureInfo]]: Top-level functions.
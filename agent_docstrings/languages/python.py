@@ -12,7 +12,7 @@
 from __future__ import annotations
 
 import ast
-from typing import List, Tuple, Union
+from typing import Iterable, List, Tuple, Union
 
 from .common import ClassInfo, SignatureInfo
 
@@ -25,13 +25,19 @@ def _format_arg(arg: ast.arg) -> str:
     return arg_str
 
 
-def _format_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
-    """Formats a function signature from an AST node."""
+def _format_signature(
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef], is_method: bool = False
+) -> str:
+    """Formats a function signature from an AST node.
+
+    Args:
+        node: Function definition to format.
+        is_method: Whether *node* is defined directly in a class body, in
+            which case a leading ``self`` parameter is omitted.
+    """
     name = node.name
     args = node.args
 
-    is_method = isinstance(getattr(node, "parent", None), ast.ClassDef)
-
     arg_parts = []
 
     # Positional-only arguments
@@ -93,7 +99,7 @@ def _format_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str
 
 
 def parse_python_file(
-    lines: List[str],
+    lines: Iterable[str],
 ) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
     """
     Parses Python source code to extract class and function information using AST.
@@ -110,24 +116,17 @@ def parse_python_file(
         except SyntaxError:
             raise  # * Re-raise the original SyntaxError
 
-    # Add parent pointers to all nodes in the tree first
-    for node in ast.walk(tree):
-        for child in ast.iter_child_nodes(node):
-            setattr(child, "parent", node)
-
+    # * Only module-level and class-level statements can hold definitions that
+    # * appear in the header, so function bodies and expressions are never visited.
     classes = []
     functions = []
 
-    for node in ast.walk(tree):
-        # Check if the node is a direct child of the Module
-        parent = getattr(node, "parent", None)
-        is_top_level = isinstance(parent, ast.Module)
-
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and is_top_level:
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
             functions.append(
                 SignatureInfo(signature=_format_signature(node), line=node.lineno)
             )
-        elif isinstance(node, ast.ClassDef) and is_top_level:
+        elif isinstance(node, ast.ClassDef):
             classes.append(_parse_class_node(node))
 
     return classes, functions
@@ -142,7 +141,8 @@ def _parse_class_node(node: ast.ClassDef) -> ClassInfo:
                 continue
             methods.append(
                 SignatureInfo(
-                    signature=_format_signature(body_item), line=body_item.lineno
+                    signature=_format_signature(body_item, is_method=True),
+                    line=body_item.lineno,
                 )
             )
         elif isinstance(body_item, ast.ClassDef):
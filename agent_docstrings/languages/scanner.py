@@ -0,0 +1,504 @@
+from __future__ import annotations
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _Span (line 47):
+        - _Lexer (line 55):
+        - _lexer(tokens: List[_Token], spans: Dict[str, _Span], nested: bool = False) -> _Lexer (line 98)
+        - _starts_regex(text: str, pos: int) -> bool (line 177)
+        - _raw_string(opening: str) -> _Span (line 190)
+        - _blank(text: str) -> str (line 197)
+        - ScannedLine (line 204):
+        - BraceScanner (line 221):
+            - scan(text: str) -> str (line 241)
+            - _code(text: str) -> str (line 253)
+            - _replace(match: Match[str]) -> str (line 259)
+            - _close(text: str, pos: int, parts: List[str]) -> int (line 287)
+        - scan_lines(lines: Iterable[str], language: str) -> Iterator[ScannedLine] (line 318)
+        - _join(parts: List[ScannedLine]) -> ScannedLine (line 359)
+        - _opens_block(braces: str) -> bool (line 378)
+        - join_statements(scanned_lines: Iterable[ScannedLine]) -> Iterator[ScannedLine] (line 382)
+        - _uncommented(line: str, code: str) -> str (line 425)
+        - signature_of(scanned: ScannedLine) -> str (line 450)
+        - ClassScopes (line 459):
+            - current() -> Optional[ClassInfo] (line 479)
+            - declare(info: ClassInfo) -> None (line 483)
+            - advance(scanned: ScannedLine) -> None (line 489)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import itertools
+import re
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Match, NamedTuple, Optional, Pattern, Tuple
+
+from .common import MAX_STATEMENT_LINES, ClassInfo
+
+# * Number of lines scanned together
+SCAN_BATCH_LINES = 512
+# * Characters that may start a comment or a literal; text without them is code as-is
+_SPECIAL_RE = re.compile(r"[/\"'`]")
+_BRACES_RE = re.compile(r"[{}]")
+_BLANKS_RE = re.compile(r"\s+")
+# * Delimiters that the code keeps around the blanked content of a literal
+_DELIMITERS = "\"'`/"
+
+
+class _Span(NamedTuple):
+    """A comment or literal that continues past the scanned text."""
+    # * Matches the text up to the closing delimiter, or to the end of the text
+    interior: Pattern[str]
+    closing: str
+    comment: bool
+
+
+class _Lexer(NamedTuple):
+    """Lexical rules of a language family."""
+    # * Matches comments and literals as a whole, and the opening delimiter
+    # * of those that do not end in the scanned text, with the rest of it
+    pattern: Pattern[str]
+    # * Kind of the token matched by each group of *pattern*
+    kinds: Dict[int, str]
+    # * Spans opened by each "open" delimiter; C++ raw strings are built on demand
+    spans: Dict[str, _Span]
+    nested_comments: bool
+
+
+_BLOCK_COMMENT = _Span(re.compile(r"[^*]*(?:\*(?!/)[^*]*)*"), "*/", True)
+# * Kotlin block comments nest, so the scan also stops at an inner "/*"
+_NESTED_COMMENT = _Span(re.compile(r"[^*/]*(?:(?:\*(?!/)|/(?!\*))[^*/]*)*"), "*/", True)
+_TEMPLATE = _Span(re.compile(r"[^`\\]*(?:\\.[^`\\]*)*", re.S), "`", False)
+_TEXT_BLOCK = _Span(re.compile(r'[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*', re.S), '"""', False)
+_RAW_TRIPLE = _Span(re.compile(r'[^"]*(?:"(?!"")[^"]*)*'), '"""', False)
+_VERBATIM = _Span(re.compile(r'[^"]*(?:""[^"]*)*'), '"', False)
+
+# * Tokens are (first character, kind, pattern for the rest). Starting every
+# * alternative with a plain character lets the regular expression engine
+# * skip quickly to the next candidate instead of trying each position.
+_Token = Tuple[str, str, str]
+_COMMENTS: List[_Token] = [
+    ("/", "comment", r"/.*"),
+    ("/", "comment", r"\*[^*]*(?:\*(?!/)[^*]*)*\*/"),
+    ("/", "open", r"\*"),
+]
+# ! Strings and characters end at the end of the line even when unterminated
+_DOUBLE: _Token = ('"', "literal", r'[^"\\\n]*(?:\\.[^"\\\n]*)*"?')
+_SINGLE: _Token = ("'", "literal", r"[^'\\\n]*(?:\\.[^'\\\n]*)*'?")
+# * A "/" inside a character class does not end a regular expression literal
+_REGEX_BODY = r"(?![/*])[^/\\\[\n]*(?:(?:\\.|\[[^\]\\\n]*(?:\\.[^\]\\\n]*)*\]?)[^/\\\[\n]*)*/"
+_REGEX_KEYWORDS = ("return", "typeof", "case", "delete", "void", "yield", "await", "in", "of")
+# * A "/" right after an operand, or one blank after it, is a division; the
+# * remaining candidates are checked by _starts_regex
+_REGEXES: List[_Token] = [("/", "regex", r"(?<![\w$)\]}]/)(?<![\w$)\]}][ \t]/)" + _REGEX_BODY)] + [
+    ("/", "regex", rf"(?<={word} /)(?<![\w$]{word} /)" + _REGEX_BODY) for word in _REGEX_KEYWORDS
+]
+_RAW_PREFIXES = ("R", "u8R", "uR", "UR", "LR")
+
+
+def _lexer(tokens: List[_Token], spans: Dict[str, _Span], nested: bool = False) -> _Lexer:
+    alternatives = []
+    for i, (first, kind, rest) in enumerate(tokens):
+        group = f"(?P<t{i}>{rest})"
+        alternatives.append(re.escape(first) + (group + "(?s:.*)" if kind == "open" else group))
+    pattern = re.compile("|".join(alternatives))
+    kinds = {pattern.groupindex[f"t{i}"]: kind for i, (_, kind, _) in enumerate(tokens)}
+    return _Lexer(pattern, kinds, spans, nested)
+
+
+_LEXERS: Dict[str, _Lexer] = {
+    "javascript": _lexer(
+        _COMMENTS + _REGEXES + [
+            _DOUBLE,
+            _SINGLE,
+            ("`", "literal", r"[^`\\]*(?:\\(?s:.)[^`\\]*)*`"),
+            ("`", "open", ""),
+        ],
+        {"/*": _BLOCK_COMMENT, "`": _TEMPLATE},
+    ),
+    "csharp": _lexer(
+        _COMMENTS + [
+            ('"', "literal", r'""(?s:.*?)"""'),
+            ('"', "open", '""'),
+            ("@", "literal", r'\$?"[^"]*(?:""[^"]*)*"'),
+            ("$", "literal", r'@"[^"]*(?:""[^"]*)*"'),
+            ("@", "open", r'\$?"'),
+            ("$", "open", '@"'),
+            _DOUBLE,
+            _SINGLE,
+        ],
+        {"/*": _BLOCK_COMMENT, '"""': _RAW_TRIPLE, '@"': _VERBATIM, '$@"': _VERBATIM, '@$"': _VERBATIM},
+    ),
+    # * Raw strings are matched from their quote, with the prefix looked up behind
+    # * it, as starting at the letters of R"( would stop the engine at every R.
+    # ! A quote after a digit is a digit separator (1'000'000), not a character literal
+    "cpp": _lexer(
+        _COMMENTS + [
+            ('"', "literal", rf'(?<=(?<!\w){prefix}")(?P<d{i}>[^()\\\s"]{{0,16}})\((?s:.*?)\)(?P=d{i})"')
+            for i, prefix in enumerate(_RAW_PREFIXES)
+        ] + [
+            ('"', "open", rf'(?<=(?<!\w){prefix}")[^()\\\s"]{{0,16}}\(')
+            for prefix in _RAW_PREFIXES
+        ] + [
+            _DOUBLE,
+            ("'", "literal", r"(?<![0-9A-Fa-f]')" + _SINGLE[2]),
+        ],
+        {"/*": _BLOCK_COMMENT},
+    ),
+    "java": _lexer(
+        _COMMENTS + [
+            ('"', "literal", r'""[^"\\]*(?:(?:\\(?s:.)|"(?!""))[^"\\]*)*"""'),
+            ('"', "open", '""'),
+            _DOUBLE,
+            _SINGLE,
+        ],
+        {"/*": _BLOCK_COMMENT, '"""': _TEXT_BLOCK},
+    ),
+    # * Nested block comments are matched as "open" and scanned step by step
+    "kotlin": _lexer(
+        [
+            ("/", "comment", r"/.*"),
+            ("/", "comment", r"\*[^*/]*(?:(?:\*(?!/)|/(?!\*))[^*/]*)*\*/"),
+            ("/", "open", r"\*"),
+            ('"', "literal", r'""(?s:.*?)"""'),
+            ('"', "open", '""'),
+            _DOUBLE,
+            _SINGLE,
+        ],
+        {"/*": _NESTED_COMMENT, '"""': _RAW_TRIPLE},
+        nested=True,
+    ),
+}
+_LEXERS["typescript"] = _LEXERS["javascript"]
+_LEXERS["c"] = _LEXERS["cpp"]
+
+SCANNED_LANGUAGES: FrozenSet[str] = frozenset(_LEXERS)
+
+
+def _starts_regex(text: str, pos: int) -> bool:
+    """Whether the "/" at *pos* in JavaScript *text* opens a regular expression.
+
+    It does at the start of a line and after an operator, an opening
+    bracket or a keyword like ``return``, and is a division elsewhere.
+    """
+    before = text[text.rfind("\n", 0, pos) + 1:pos].rstrip()
+    if not before or before[-1] in "(,=:[!&|?{};+-*%<>~^":
+        return True
+    word = before.rsplit(None, 1)[-1]
+    return word.endswith(_REGEX_KEYWORDS) and word.lstrip("(,=:[!&|?{};+-*%<>~^") in _REGEX_KEYWORDS
+
+
+def _raw_string(opening: str) -> _Span:
+    """Return the span of a C++ raw string opened by *opening*, e.g. ``"x(`` of ``R"x(``."""
+    closing = ")" + opening[opening.index('"') + 1:-1] + '"'
+    interior = re.compile(r"[^)]*(?:\)(?!" + re.escape(closing[1:]) + r")[^)]*)*")
+    return _Span(interior, closing, False)
+
+
+def _blank(text: str) -> str:
+    """Return spaces in place of *text*, keeping its line breaks."""
+    if "\n" not in text:
+        return " " * len(text)
+    return "\n".join(" " * len(part) for part in text.split("\n"))
+
+
+class ScannedLine(NamedTuple):
+    """A source line as seen by the lexical scanner.
+
+    *code* has the length of *line*, so offsets in one apply to the other:
+    comments are replaced by spaces, and so is the content of string,
+    character, template and regular expression literals, whose delimiters
+    are kept.
+    """
+    number: int
+    line: str
+    code: str
+    # * The braces in *code*, in order
+    braces: str
+    # * Brace depth at the start of the line
+    depth: int
+
+
+class BraceScanner:
+    """Strips comments and literals from C-style source text.
+
+    Comments and literals are replaced in a single regular expression
+    substitution over the text. A comment or literal that continues past
+    the end of the text, such as a block comment split between two calls,
+    is resumed at the start of the next call.
+
+    Args:
+        language (str): Canonical language name; see :data:`SCANNED_LANGUAGES`.
+
+    Raises:
+        KeyError: If *language* is not a C-style language.
+    """
+
+    def __init__(self, language: str) -> None:
+        self._lexer = _LEXERS[language]
+        self._span: Optional[_Span] = None
+        self._comment_depth = 0
+
+    def scan(self, text: str) -> str:
+        """Return the code of *text*, which continues the previously scanned text.
+
+        The result has the length and the line breaks of *text*; see
+        :class:`ScannedLine`.
+        """
+        if self._span is None:
+            return self._code(text)
+        parts: List[str] = []
+        pos = self._close(text, 0, parts)
+        return "".join(parts) + self._code(text[pos:])
+
+    def _code(self, text: str) -> str:
+        """Blank the comments and literals in *text*, which starts outside them."""
+        if not _SPECIAL_RE.search(text):
+            return text
+        return self._lexer.pattern.sub(self._replace, text)
+
+    def _replace(self, match: Match[str]) -> str:
+        group = match.lastindex
+        assert group is not None
+        kind = self._lexer.kinds[group]
+        text = match.group()
+        if kind == "comment":
+            return _blank(text)
+        if kind == "regex":
+            if _starts_regex(match.string, match.start()):
+                return "/" + _blank(text[1:-1]) + "/"
+            # * A division: only the text up to the next "/" was consumed
+            return "/" + self._code(text[1:-1]) + "/"
+        if kind == "literal":
+            # * The delimiters are kept, so the code still shows a literal
+            if len(text) > 1 and text[-1] in "\"'`":
+                return text[0] + _blank(text[1:-1]) + text[-1]
+            return text[0] + _blank(text[1:])
+        line = match.string
+        opening = line[match.start():match.end(group)]
+        self._span = self._lexer.spans.get(opening) or _raw_string(opening)
+        if self._span.comment:
+            self._comment_depth = 1
+            parts = [" " * len(opening)]
+        else:
+            parts = [opening]
+        pos = self._close(line, match.end(group), parts)
+        return "".join(parts) + self._code(line[pos:])
+
+    def _close(self, text: str, pos: int, parts: List[str]) -> int:
+        """Scan the open comment or literal from *pos* and return where it ends."""
+        span = self._span
+        assert span is not None
+        while True:
+            interior = span.interior.match(text, pos)
+            assert interior is not None
+            end = interior.end()
+            if self._lexer.nested_comments and span.comment and text.startswith("/*", end):
+                self._comment_depth += 1
+                parts.append(_blank(text[pos:end + 2]))
+                pos = end + 2
+                continue
+            if not text.startswith(span.closing, end):
+                # * It continues in the next text
+                parts.append(_blank(text[pos:]))
+                return len(text)
+            closed = end + len(span.closing)
+            if span.comment:
+                self._comment_depth -= 1
+                parts.append(_blank(text[pos:closed]))
+                if self._comment_depth:
+                    pos = closed
+                    continue
+            else:
+                parts.append(_blank(text[pos:end]))
+                parts.append(span.closing)
+            self._span = None
+            return closed
+
+
+def scan_lines(lines: Iterable[str], language: str) -> Iterator[ScannedLine]:
+    """Scan *lines* of a C-style language, tracking the brace depth.
+
+    Lines are scanned in batches of :data:`SCAN_BATCH_LINES`, joined into one
+    text, so comments and literals are blanked by one substitution per batch
+    rather than per line.
+    Lines without code, i.e. blank or holding only comments, are skipped.
+
+    Args:
+        lines (Iterable[str]): Source code lines without line breaks,
+            consumed in a single pass.
+        language (str): Canonical language name; see :data:`SCANNED_LANGUAGES`.
+
+    Yields:
+        ScannedLine: Each line with code, numbered from 1, and its braces.
+    """
+    # * Building the tuples directly skips the argument handling of ScannedLine(),
+    # * which took half of the time spent per line
+    new = tuple.__new__
+    scanner = BraceScanner(language)
+    iterator = iter(lines)
+    number = 0
+    depth = 0
+    while True:
+        batch = list(itertools.islice(iterator, SCAN_BATCH_LINES))
+        if not batch:
+            return
+        codes = scanner.scan("\n".join(batch)).split("\n")
+        for number, line, code in zip(itertools.count(number + 1), batch, codes):
+            # * Most lines have no braces, and "in" is cheaper than counting them
+            if "{" in code or "}" in code:
+                opens = code.count("{")
+                closes = code.count("}")
+                # * The order of the braces only needs finding when both kinds are present
+                braces = "".join(_BRACES_RE.findall(code)) if opens and closes else "{" * opens + "}" * closes
+                yield new(ScannedLine, (number, line, code, braces, depth))
+                depth += opens - closes
+            elif code and not code.isspace():
+                yield new(ScannedLine, (number, line, code, "", depth))
+
+
+def _join(parts: List[ScannedLine]) -> ScannedLine:
+    """Return the lines of a statement as one line, numbered like the first."""
+    first = parts[0]
+    end = len(first.code.rstrip())
+    lines, codes = [first.line[:end]], [first.code[:end]]
+    for part in parts[1:]:
+        code = part.code
+        start = len(code) - len(code.lstrip())
+        end = len(code.rstrip())
+        # * No blank is inserted inside brackets, e.g. "f(a, b)" rather than "f( a, b )"
+        if not codes[-1].endswith(("(", "[")) and not code.startswith((")", "]"), start):
+            lines.append(" ")
+            codes.append(" ")
+        lines.append(part.line[start:end])
+        codes.append(code[start:end])
+    braces = "".join(part.braces for part in parts)
+    return ScannedLine(first.number, "".join(lines), "".join(codes), braces, first.depth)
+
+
+def _opens_block(braces: str) -> bool:
+    return bool(braces) and 2 * braces.count("{") != len(braces)
+
+
+def join_statements(scanned_lines: Iterable[ScannedLine]) -> Iterator[ScannedLine]:
+    """Join the lines of statements whose parentheses span several lines.
+
+    A line whose code leaves a parenthesis open is joined with the following
+    lines up to the one that closes it, so a signature with one parameter
+    per line reaches the parsers' regular expressions as a single line.
+    The joined line keeps the number and depth of the first line, and its
+    braces are those of all the lines.
+
+    Joining stops early at a line that opens or closes a block, so a call
+    taking a callback, like ``describe("x", () => {``, does not swallow the
+    callback's body. Each line is looked at once: if the parentheses are
+    still open after :data:`MAX_STATEMENT_LINES` lines, those lines are
+    passed on unjoined.
+
+    Args:
+        scanned_lines (Iterable[ScannedLine]): Lines from :func:`scan_lines`.
+
+    Yields:
+        ScannedLine: Each statement, joined or as scanned.
+    """
+    pending: List[ScannedLine] = []
+    balance = 0
+    for scanned in scanned_lines:
+        code = scanned.code
+        if pending:
+            pending.append(scanned)
+            if "(" in code or ")" in code:
+                balance += code.count("(") - code.count(")")
+            if balance <= 0 or _opens_block(scanned.braces):
+                yield _join(pending)
+                pending = []
+            elif len(pending) == MAX_STATEMENT_LINES:
+                yield from pending
+                pending = []
+        elif "(" in code and (balance := code.count("(") - code.count(")")) > 0 and not _opens_block(scanned.braces):
+            pending = [scanned]
+        else:
+            yield scanned
+    # ! Parentheses left open at the end of the file
+    yield from pending
+
+
+def _uncommented(line: str, code: str) -> str:
+    """Return *line* without the comments that its *code* blanks.
+
+    The content of literals is blank in *code* as well, but lies between
+    two delimiters. A comment is replaced by a blank, or by nothing next to
+    a bracket or a comma, as in ``f(int a, int b)``.
+    """
+    if "//" not in line and "/*" not in line:
+        return line
+    parts = []
+    last = 0
+    for match in _BLANKS_RE.finditer(code):
+        start, end = match.span()
+        if not line[start:end].lstrip().startswith(("//", "/*")):
+            continue
+        if 0 < start and end < len(code) and code[start - 1] == code[end] and code[end] in _DELIMITERS:
+            continue
+        parts.append(line[last:start])
+        if line[start - 1:start] not in ("", "(", "[") and code[end:end + 1] not in ("", ")", "]", ","):
+            parts.append(" ")
+        last = end
+    parts.append(line[last:])
+    return "".join(parts)
+
+
+def signature_of(scanned: ScannedLine) -> str:
+    """Return the declaration on *scanned*: its code up to the first brace, without comments."""
+    code = scanned.code.rstrip()
+    brace = code.find("{")
+    start = len(code) - len(code.lstrip())
+    end = len(code) if brace < 0 else brace
+    return _uncommented(scanned.line[start:end], scanned.code[start:end]).strip()
+
+
+class ClassScopes:
+    """Classes found in a file, nested by the braces that delimit their bodies.
+
+    The body of a class opens at the first ``{`` after its declaration, on the
+    declaration line or at the start of a following line, and closes at the
+    matching ``}``. Declarations without a body, like ``class Foo;`` in C++ or
+    ``data class P(val x: Int)`` in Kotlin, do not enclose what follows them.
+
+    Parsers call :meth:`advance` for every line with braces, and for every
+    line while :attr:`pending` is set.
+    """
+
+    def __init__(self) -> None:
+        self.classes: List[ClassInfo] = []
+        # * Declared class whose body has not been opened yet
+        self.pending: Optional[ClassInfo] = None
+        # * Open class bodies and the depth just inside their opening brace
+        self._stack: List[Tuple[ClassInfo, int]] = []
+
+    @property
+    def current(self) -> Optional[ClassInfo]:
+        """The class whose body encloses the current line, if any."""
+        return self._stack[-1][0] if self._stack else None
+
+    def declare(self, info: ClassInfo) -> None:
+        """Add the class declared on the current line to the enclosing class."""
+        current = self.current
+        (current.inner_classes if current is not None else self.classes).append(info)
+        self.pending = info
+
+    def advance(self, scanned: ScannedLine) -> None:
+        """Apply the braces of *scanned*, after the declarations on it."""
+        pending = self.pending
+        if pending is not None and pending.line != scanned.number and not scanned.code.lstrip().startswith("{"):
+            pending = self.pending = None
+        depth = scanned.depth
+        for brace in scanned.braces:
+            if brace == "{":
+                depth += 1
+                if pending is not None:
+                    self._stack.append((pending, depth))
+                    pending = self.pending = None
+            else:
+                if self._stack and self._stack[-1][1] == depth:
+                    self._stack.pop()
+                depth -= 1
@@ -0,0 +1,419 @@
+from __future__ import annotations
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - Grammar (line 55):
+        - _Document (line 127):
+        - load_language(language: str) -> Optional[Any] (line 134)
+        - _parser(language: str) -> Optional[Any] (line 153)
+        - incremental(key: str) -> Iterator[None] (line 170)
+        - _common_prefix(old: bytes, new: bytes, limit: int) -> int (line 189)
+        - edit_range(old: bytes, new: bytes) -> Optional[Tuple[int, int, int]] (line 202)
+        - _point(source: bytes, offset: int) -> Tuple[int, int] (line 218)
+        - _parse(parser: Any, language: str, source: bytes) -> Any (line 223)
+        - _Extractor (line 255):
+            - visit(node: Any, owner: Optional[ClassInfo], start: Optional[int] = None) -> None (line 265)
+            - _body(node: Any) -> Optional[Any] (line 283)
+            - _class(node: Any, owner: Optional[ClassInfo]) -> None (line 292)
+            - _function(node: Any, body_owner: Any, owner: Optional[ClassInfo], start: Optional[int]) -> None (line 309)
+            - _declaration(node: Any, owner: Optional[ClassInfo], start: Optional[int]) -> None (line 326)
+            - _start(node: Any) -> Tuple[int, int] (line 346)
+            - _text(start: int, end: int) -> str (line 359)
+            - _signature(node: Any, start: int, end: int) -> str (line 362)
+        - TreeSitterParser (line 385):
+            - available() -> bool (line 407)
+            - __call__(lines: Iterable[str]) -> ParseResult (line 411)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import importlib
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .common import ClassInfo, SignatureInfo
+
+ParseResult = Tuple[List[ClassInfo], List[SignatureInfo]]
+
+# * Most files whose last tree is kept for incremental reparsing, per thread
+MAX_DOCUMENTS = 256
+
+_BRACKET_SPACE_RE = re.compile(r"(?<=[(\[]) | (?=[)\],])")
+_COMMENTS = frozenset({"comment", "line_comment", "block_comment"})
+# * Children that precede a declaration without being part of its signature
+_ANNOTATIONS = frozenset({"annotation", "marker_annotation", "attribute_list", "decorator"}) | _COMMENTS
+# * Children holding the body of a function; the signature ends where they start
+_BODIES = frozenset(
+    {"block", "statement_block", "compound_statement", "function_body", "arrow_expression_clause", "constructor_body"}
+)
+_FUNCTION_VALUES = frozenset({"arrow_function", "function_expression", "function", "generator_function"})
+
+
+class Grammar(NamedTuple):
+    """Node types of a tree-sitter grammar that make up the table of contents."""
+    # * Python module of the grammar and its function returning the language
+    module: str
+    entry: str
+    # * Nodes whose children are searched for classes and functions
+    containers: FrozenSet[str]
+    classes: FrozenSet[str]
+    functions: FrozenSet[str]
+    # * Nodes that declare functions through their declarators, like C
+    # * prototypes and JavaScript variables bound to arrow functions
+    declarations: FrozenSet[str] = frozenset()
+    # * Whether functions outside classes are listed
+    top_level_functions: bool = True
+
+
+# * Call expressions are searched for the body of an immediately invoked
+# * function, like "(function () { ... })()"; their arguments are not
+_ECMASCRIPT_CONTAINERS = frozenset(
+    {"program", "export_statement", "class_body", "internal_module", "module", "statement_block",
+     "expression_statement", "ambient_declaration", "call_expression", "parenthesized_expression",
+     "function_expression", "function", "arrow_function", "ERROR"}
+)
+_ECMASCRIPT_FUNCTIONS = frozenset(
+    {"function_declaration", "generator_function_declaration", "method_definition", "function_signature",
+     "method_signature", "abstract_method_signature"}
+)
+_C_CONTAINERS = frozenset(
+    {"translation_unit", "declaration_list", "field_declaration_list", "namespace_definition",
+     "linkage_specification", "template_declaration", "preproc_if", "preproc_ifdef", "preproc_else",
+     "preproc_elif", "preproc_elifdef", "ERROR"}
+)
+
+GRAMMARS: Dict[str, Grammar] = {
+    "javascript": Grammar(
+        "tree_sitter_javascript", "language", _ECMASCRIPT_CONTAINERS, frozenset({"class_declaration"}),
+        _ECMASCRIPT_FUNCTIONS, frozenset({"lexical_declaration", "variable_declaration"}),
+    ),
+    "typescript": Grammar(
+        "tree_sitter_typescript", "language_typescript", _ECMASCRIPT_CONTAINERS,
+        frozenset({"class_declaration", "abstract_class_declaration"}),
+        _ECMASCRIPT_FUNCTIONS, frozenset({"lexical_declaration", "variable_declaration"}),
+    ),
+    "csharp": Grammar(
+        "tree_sitter_c_sharp", "language",
+        frozenset({"compilation_unit", "namespace_declaration", "declaration_list", "ERROR"}),
+        frozenset({"class_declaration"}), frozenset({"method_declaration"}),
+    ),
+    "cpp": Grammar(
+        "tree_sitter_cpp", "language", _C_CONTAINERS, frozenset({"class_specifier"}),
+        frozenset({"function_definition"}), frozenset({"declaration", "field_declaration"}),
+    ),
+    "c": Grammar(
+        "tree_sitter_c", "language", _C_CONTAINERS, frozenset(),
+        frozenset({"function_definition"}), frozenset({"declaration"}),
+    ),
+    "java": Grammar(
+        "tree_sitter_java", "language", frozenset({"program", "class_body", "ERROR"}),
+        frozenset({"class_declaration"}), frozenset({"method_declaration"}), top_level_functions=False,
+    ),
+    "kotlin": Grammar(
+        "tree_sitter_kotlin", "language",
+        frozenset({"source_file", "class_body", "enum_class_body", "object_declaration", "companion_object", "ERROR"}),
+        frozenset({"class_declaration"}), frozenset({"function_declaration"}),
+    ),
+}
+
+# * Loaded grammars, None for those that are not installed
+_languages: Dict[str, Optional[Any]] = {}
+_local = threading.local()
+
+
+class _Document(NamedTuple):
+    """The last parse of a file, kept for incremental reparsing."""
+    language: str
+    source: bytes
+    tree: Any
+
+
+def load_language(language: str) -> Optional[Any]:
+    """Return the tree-sitter language of *language*, or None if it is not installed.
+
+    Both the ``tree_sitter`` package and the grammar package listed in
+    :data:`GRAMMARS` are needed; a grammar built for an incompatible
+    ``tree_sitter`` version counts as not installed. The result is cached.
+    """
+    if language not in _languages:
+        grammar = GRAMMARS[language]
+        try:
+            import tree_sitter
+
+            module = importlib.import_module(grammar.module)
+            _languages[language] = tree_sitter.Language(getattr(module, grammar.entry)())
+        except (ImportError, AttributeError, TypeError, ValueError):
+            _languages[language] = None
+    return _languages[language]
+
+
+def _parser(language: str) -> Optional[Any]:
+    """Return this thread's parser for *language*, created on first use."""
+    parsers: Optional[Dict[str, Any]] = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    if language not in parsers:
+        tree_language = load_language(language)
+        if tree_language is None:
+            parsers[language] = None
+        else:
+            import tree_sitter
+
+            parsers[language] = tree_sitter.Parser(tree_language)
+    return parsers[language]
+
+
+@contextmanager
+def incremental(key: str) -> Iterator[None]:
+    """Reparse the file *key* incrementally while the block runs.
+
+    The tree of the file's previous parse in this thread is edited where
+    the new source differs from the old one and handed to tree-sitter,
+    which then only reparses the changed region. The trees of the last
+    :data:`MAX_DOCUMENTS` files are kept.
+
+    Args:
+        key (str): Identifies the file across parses, e.g. its path.
+    """
+    previous = getattr(_local, "key", None)
+    _local.key = key
+    try:
+        yield
+    finally:
+        _local.key = previous
+
+
+def _common_prefix(old: bytes, new: bytes, limit: int) -> int:
+    """Return the length of the common prefix of *old* and *new*, at most *limit*."""
+    low, high = 0, limit
+    # * Compares halves of the remaining range, so the bytes compared sum to O(limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[low:middle] == new[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def edit_range(old: bytes, new: bytes) -> Optional[Tuple[int, int, int]]:
+    """Return the range where *new* differs from *old*, or None if they are equal.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: The start offset of the change, its
+        end offset in *old* and its end offset in *new*.
+    """
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = _common_prefix(old, new, limit)
+    # * The common suffix is found as the common prefix of the reversed rests
+    suffix = _common_prefix(old[start:][::-1], new[start:][::-1], limit - start)
+    return start, len(old) - suffix, len(new) - suffix
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """Return the row and byte column of *offset* in *source*."""
+    return source.count(b"\n", 0, offset), offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def _parse(parser: Any, language: str, source: bytes) -> Any:
+    """Parse *source*, reusing the previous tree of the current document if any."""
+    key = getattr(_local, "key", None)
+    if key is None:
+        return parser.parse(source)
+    documents: Optional["OrderedDict[str, _Document]"] = getattr(_local, "documents", None)
+    if documents is None:
+        documents = _local.documents = OrderedDict()
+    document = documents.pop(key, None)
+    if document is not None and document.language == language:
+        change = edit_range(document.source, source)
+        if change is None:
+            tree = document.tree
+        else:
+            start, old_end, new_end = change
+            document.tree.edit(
+                start_byte=start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=_point(source, start),
+                old_end_point=_point(document.source, old_end),
+                new_end_point=_point(source, new_end),
+            )
+            tree = parser.parse(source, document.tree)
+    else:
+        tree = parser.parse(source)
+    documents[key] = _Document(language, source, tree)
+    if len(documents) > MAX_DOCUMENTS:
+        documents.popitem(last=False)
+    return tree
+
+
+class _Extractor:
+    """Collects the classes and functions of a syntax tree."""
+
+    def __init__(self, grammar: Grammar, language: str, source: bytes) -> None:
+        self.grammar = grammar
+        self.language = language
+        self.source = source
+        self.classes: List[ClassInfo] = []
+        self.functions: List[SignatureInfo] = []
+
+    def visit(self, node: Any, owner: Optional[ClassInfo], start: Optional[int] = None) -> None:
+        """Collect the declarations among the children of *node*.
+
+        *start* overrides where the signatures of the children start, so an
+        ``export`` keyword is kept in front of the declaration it exports.
+        """
+        grammar = self.grammar
+        for child in node.named_children:
+            kind = child.type
+            if kind in grammar.classes:
+                self._class(child, owner)
+            elif kind in grammar.functions:
+                self._function(child, child, owner, start)
+            elif kind in grammar.declarations:
+                self._declaration(child, owner, start)
+            elif kind in grammar.containers:
+                self.visit(child, owner, child.start_byte if kind == "export_statement" else None)
+
+    def _body(self, node: Any) -> Optional[Any]:
+        body = node.child_by_field_name("body")
+        if body is not None:
+            return body
+        for child in node.named_children:
+            if child.type in self.grammar.containers:
+                return child
+        return None
+
+    def _class(self, node: Any, owner: Optional[ClassInfo]) -> None:
+        body = self._body(node)
+        # ! Forward declarations like "class Foo;" and Kotlin interfaces are not classes
+        if self.language in ("cpp", "c") and body is None:
+            return
+        if self.language == "kotlin" and not any(child.type == "class" for child in node.children):
+            return
+        name = node.child_by_field_name("name")
+        if name is None:
+            return
+        info = ClassInfo(
+            name=self._text(name.start_byte, name.end_byte), line=name.start_point[0] + 1, methods=[], inner_classes=[]
+        )
+        (owner.inner_classes if owner is not None else self.classes).append(info)
+        if body is not None:
+            self.visit(body, info)
+
+    def _function(self, node: Any, body_owner: Any, owner: Optional[ClassInfo], start: Optional[int]) -> None:
+        """Record the function declared by *node*, whose body is a child of *body_owner*."""
+        if owner is None and not self.grammar.top_level_functions:
+            return
+        line, first = self._start(node)
+        if start is None:
+            start = first
+        body = body_owner.child_by_field_name("body")
+        if body is None:
+            body = next((child for child in body_owner.children if child.type in _BODIES), None)
+        # * The body of an arrow function may be a bare expression, so its signature ends at the "=>"
+        if body_owner.type == "arrow_function":
+            body = next((child for child in body_owner.children if child.type == "=>"), body)
+        end = node.end_byte if body is None else body.start_byte
+        info = SignatureInfo(signature=self._signature(node, start, end), line=line)
+        (owner.methods if owner is not None else self.functions).append(info)
+
+    def _declaration(self, node: Any, owner: Optional[ClassInfo], start: Optional[int]) -> None:
+        if self.language in ("javascript", "typescript"):
+            for declarator in node.named_children:
+                value = declarator.child_by_field_name("value") if declarator.type == "variable_declarator" else None
+                if value is not None and value.type in _FUNCTION_VALUES:
+                    self._function(node, value, owner, start)
+            return
+        declarator = node.child_by_field_name("declarator")
+        while declarator is not None and declarator.type in ("pointer_declarator", "reference_declarator"):
+            declarator = declarator.child_by_field_name("declarator")
+        if declarator is not None and declarator.type == "function_declarator":
+            inner = declarator.child_by_field_name("declarator")
+            # ! "int (*handler)(int);" declares a function pointer, not a function
+            if inner is not None and inner.type != "parenthesized_declarator":
+                self._function(node, node, owner, start)
+            return
+        declared_type = node.child_by_field_name("type")
+        if declared_type is not None and declared_type.type in self.grammar.classes:
+            self._class(declared_type, owner)
+
+    def _start(self, node: Any) -> Tuple[int, int]:
+        """Return the line and byte offset at which the signature of *node* starts."""
+        for child in node.children:
+            if child.type in _ANNOTATIONS:
+                continue
+            if child.type == "modifiers":
+                for modifier in child.children:
+                    if modifier.type not in _ANNOTATIONS:
+                        return modifier.start_point[0] + 1, modifier.start_byte
+                continue
+            return child.start_point[0] + 1, child.start_byte
+        return node.start_point[0] + 1, node.start_byte
+
+    def _text(self, start: int, end: int) -> str:
+        return self.source[start:end].decode("utf-8", errors="replace")
+
+    def _signature(self, node: Any, start: int, end: int) -> str:
+        """Return the text of *node* between *start* and *end* on one line, without comments."""
+        text = self._text(start, end)
+        if "/" in text:
+            parts = []
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current.end_byte <= start or current.start_byte >= end:
+                    continue
+                if current.type in _COMMENTS:
+                    parts.append(self._text(start, current.start_byte))
+                    start = current.end_byte
+                    continue
+                stack.extend(reversed(current.children))
+            text = " ".join(parts + [self._text(start, end)])
+        text = " ".join(text.split())
+        # * Blanks left by line breaks and comments inside brackets, as in "f( a , b )"
+        if "( " in text or "[ " in text or " )" in text or " ]" in text or " ," in text:
+            text = _BRACKET_SPACE_RE.sub("", text)
+        return text
+
+
+class TreeSitterParser:
+    """Parser of a language that uses its tree-sitter grammar when installed.
+
+    Instances are registered in :data:`agent_docstrings.core.LANG_PARSERS`.
+    Each thread creates one tree-sitter parser per language and reuses it
+    for every file. Without the ``tree_sitter`` package or the grammar, the
+    files are handed to *fallback*, the language's regex-based parser. Files
+    of at least :data:`agent_docstrings.core.LARGE_FILE_SIZE` bytes are
+    always parsed by *fallback*, which core calls directly.
+
+    Args:
+        language (str): Canonical language name; see :data:`GRAMMARS`.
+        fallback (Callable[[Iterable[str]], ParseResult]): Parser used when
+            the grammar is not installed.
+    """
+
+    def __init__(self, language: str, fallback: Callable[[Iterable[str]], ParseResult]) -> None:
+        self.language = language
+        self.grammar = GRAMMARS[language]
+        self.fallback = fallback
+
+    @property
+    def available(self) -> bool:
+        """Whether the tree-sitter grammar of the language is installed."""
+        return load_language(self.language) is not None
+
+    def __call__(self, lines: Iterable[str]) -> ParseResult:
+        parser = _parser(self.language)
+        if parser is None:
+            return self.fallback(lines)
+        source = "\n".join(lines).encode("utf-8")
+        tree = _parse(parser, self.language, source)
+        extractor = _Extractor(self.grammar, self.language, source)
+        extractor.visit(tree.root_node, None)
+        return extractor.classes, extractor.functions
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _StageTimer (line 32):
+            - __enter__() -> '_StageTimer' (line 42)
+            - __exit__(*exc_info: Any) -> None (line 46)
+        - _NullTimer (line 50):
+            - __enter__() -> '_NullTimer' (line 55)
+            - __exit__(*exc_info: Any) -> None (line 58)
+        - Profiler (line 65):
+            - stage(name: str) -> _StageTimer (line 82)
+            - add(name: str, seconds: float, calls: int = 1) -> None (line 86)
+            - record_file(path: str, language: str, seconds: float) -> None (line 91)
+            - merge(other: 'Profiler') -> None (line 102)
+            - stop() -> None (line 116)
+            - to_dict() -> Dict[str, Any] (line 120)
+            - format_table() -> str (line 140)
+        - stage(profiler: Optional[Profiler], name: str) -> Any (line 165)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import heapq
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# * Pipeline stages in the order they are reported
+STAGES = ("walk", "ignore", "sniff", "cache", "read", "remove", "parse", "format", "write")
+
+
+class _StageTimer:
+    """Context manager adding the elapsed wall time to a profiler stage."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    """Context manager that does nothing, used when profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """Collects per-stage wall time, per-language totals and the slowest files.
+
+    Args:
+        top (int): Number of slowest files to keep.
+    """
+
+    def __init__(self, top: int = 10) -> None:
+        self.top = top
+        self.stages: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.languages: Dict[str, List[float]] = {}
+        # * Min-heap of (seconds, path, language) holding the slowest files
+        self.slowest: List[Tuple[float, str, str]] = []
+        self.started = time.perf_counter()
+        self.wall_time: Optional[float] = None
+
+    def stage(self, name: str) -> _StageTimer:
+        """Return a context manager timing the enclosed block as stage *name*."""
+        return _StageTimer(self, name)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add *seconds* to stage *name*."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def record_file(self, path: str, language: str, seconds: float) -> None:
+        """Record the total processing time of a single file."""
+        totals = self.languages.setdefault(language, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        entry = (seconds, path, language)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def merge(self, other: "Profiler") -> None:
+        """Merge the measurements of *other*, e.g. from a worker process."""
+        for name, seconds in other.stages.items():
+            self.add(name, seconds, other.calls.get(name, 0))
+        for language, (files, seconds) in other.languages.items():
+            totals = self.languages.setdefault(language, [0, 0.0])
+            totals[0] += files
+            totals[1] += seconds
+        for entry in other.slowest:
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def stop(self) -> None:
+        """Freeze the total wall time of the run."""
+        self.wall_time = time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the measurements as a JSON-serializable dictionary."""
+        names = [name for name in STAGES if name in self.stages]
+        names += sorted(set(self.stages) - set(STAGES))
+        return {
+            "wall_time": self.wall_time,
+            "stages": {
+                name: {"seconds": self.stages[name], "calls": self.calls.get(name, 0)}
+                for name in names
+            },
+            "languages": {
+                language: {"files": int(files), "seconds": seconds}
+                for language, (files, seconds) in sorted(self.languages.items())
+            },
+            "slowest_files": [
+                {"path": path, "language": language, "seconds": seconds}
+                for seconds, path, language in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def format_table(self) -> str:
+        """Return a human-readable report of the measurements."""
+        data = self.to_dict()
+        total = sum(stage["seconds"] for stage in data["stages"].values()) or 1.0
+        lines = [f"{'Stage':<10} {'Seconds':>10} {'Calls':>9} {'Share':>7}"]
+        for name, stage in data["stages"].items():
+            lines.append(
+                f"{name:<10} {stage['seconds']:>10.4f} {stage['calls']:>9} "
+                f"{stage['seconds'] / total:>7.1%}"
+            )
+        if data["wall_time"] is not None:
+            lines.append(f"{'wall time':<10} {data['wall_time']:>10.4f}")
+        if data["languages"]:
+            lines.append("")
+            lines.append(f"{'Language':<12} {'Files':>7} {'Seconds':>10}")
+            for language, totals in data["languages"].items():
+                lines.append(f"{language:<12} {totals['files']:>7} {totals['seconds']:>10.4f}")
+        if data["slowest_files"]:
+            lines.append("")
+            lines.append(f"Slowest {len(data['slowest_files'])} files:")
+            for entry in data["slowest_files"]:
+                lines.append(f"  {entry['seconds']:>8.4f}s  {entry['language']:<11} {entry['path']}")
+        return "\n".join(lines)
+
+
+def stage(profiler: Optional[Profiler], name: str) -> Any:
+    """Return a timer for stage *name*, or a no-op one when *profiler* is None."""
+    if profiler is None:
+        return _NULL_TIMER
+    return profiler.stage(name)
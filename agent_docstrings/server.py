@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - RequestError (line 36):
+        - _paths(request: Dict[str, Any]) -> List[str] (line 45)
+        - _language(request: Dict[str, Any]) -> str (line 52)
+        - handle_request(request: Dict[str, Any]) -> Dict[str, Any] (line 66)
+        - _RequestHandler (line 114):
+            - handle() -> None (line 117)
+        - _remove_stale_socket(socket_path: Path) -> None (line 174)
+        - serve(socket_path: Optional[Path] = None, ready: Optional[threading.Event] = None) -> None (line 198)
+        - main(argv: Optional[List[str]] = None) -> None (line 215)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import __version__, core
+from .client import default_socket_path
+from .git import GitError
+
+
+class RequestError(ValueError):
+    """Raised for malformed requests; reported to the client as an error."""
+
+
+# * Discovery and processing print their progress, so runs are serialized
+# * while stdout is redirected into the response
+_PROCESS_LOCK = threading.Lock()
+
+
+def _paths(request: Dict[str, Any]) -> List[str]:
+    paths = request.get("paths")
+    if not isinstance(paths, list) or not paths or not all(isinstance(p, str) for p in paths):
+        raise RequestError("'paths' must be a non-empty list of strings")
+    return paths
+
+
+def _language(request: Dict[str, Any]) -> str:
+    language = request.get("language")
+    if language is None:
+        name = request.get("name")
+        if not isinstance(name, str):
+            raise RequestError("'name' or 'language' is required")
+        language = core.language_for(name)
+        if language is None:
+            raise RequestError(f"Unsupported file type: {name}")
+    return language
+
+
+def _max_file_size(request: Dict[str, Any]) -> Optional[int]:
+    size = request.get("max_file_size")
+    if size is not None and (not isinstance(size, int) or isinstance(size, bool) or size < 0):
+        raise RequestError("'max_file_size' must be a non-negative integer")
+    return size
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute a single request and return its response.
+
+    Supported operations:
+
+    - ``ping``: returns the server version.
+    - ``process``: runs :func:`agent_docstrings.core.discover_and_process_files`
+      on ``paths`` (absolute) with the optional ``verbose``, ``beta``,
+      ``jobs``, ``discovery``, ``changed_since``, ``staged``, ``check``,
+      ``diff``, ``fingerprint``, ``fsync``, ``max_file_size`` and ``sniff``
+      fields, and returns the printed ``output`` and the number of ``stale``
+      and ``failed`` files.
+    - ``toc``: regenerates the header of the buffer ``text`` for ``language``
+      or the language of the file ``name``, honouring the optional
+      ``fingerprint`` field, and returns the new ``text`` and its ``toc``.
+      Nothing is read from or written to disk.
+
+    Responses carry ``"ok": true``, or ``"ok": false`` and an ``error``.
+    """
+    op = request.get("op")
+    try:
+        if op == "ping":
+            return {"ok": True, "version": __version__, "pid": os.getpid()}
+        if op == "process":
+            paths = _paths(request)
+            output = io.StringIO()
+            with _PROCESS_LOCK, contextlib.redirect_stdout(output):
+                worker_stats = core.discover_and_process_files(
+                    paths,
+                    bool(request.get("verbose", False)),
+                    bool(request.get("beta", False)),
+                    jobs=int(request.get("jobs", 1)),
+                    discovery=request.get("discovery", "walk"),
+                    changed_since=request.get("changed_since"),
+                    staged=bool(request.get("staged", False)),
+                    check=bool(request.get("check", False)),
+                    diff=bool(request.get("diff", False)),
+                    fingerprint=bool(request.get("fingerprint", False)),
+                    fsync=bool(request.get("fsync", False)),
+                    max_file_size=_max_file_size(request),
+                    sniff=bool(request.get("sniff", True)),
+                )
+            stale = sum(stats.stale for stats in worker_stats.values())
+            failed = sum(stats.failed for stats in worker_stats.values())
+            return {"ok": True, "output": output.getvalue(), "stale": stale, "failed": failed}
+        if op == "toc":
+            text = request.get("text")
+            if not isinstance(text, str):
+                raise RequestError("'text' must be a string")
+            new_text, toc = core.render(
+                text, _language(request), bool(request.get("fingerprint", False))
+            )
+            return {"ok": True, "text": new_text, "toc": toc}
+        raise RequestError(f"Unknown operation: {op!r}")
+    except (RequestError, GitError, OSError, ValueError, TypeError) as e:
+        return {"ok": False, "error": str(e)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers newline-delimited JSON requests until the client disconnects."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"ok": False, "error": f"Invalid JSON: {e}"}
+            else:
+                if not isinstance(request, dict):
+                    response = {"ok": False, "error": "A request must be a JSON object"}
+                elif request.get("op") == "shutdown":
+                    response = {"ok": True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = handle_request(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        """Resident server answering requests on a Unix domain socket.
+
+        Parsers, compiled ignore rules and the Go parser stay loaded for the
+        lifetime of the process. Each connection is served by its own thread;
+        ``toc`` requests run concurrently, ``process`` requests one at a time.
+
+        Args:
+            socket_path (Optional[Path]): Socket to listen on; see
+                :func:`agent_docstrings.client.default_socket_path`.
+
+        Raises:
+            OSError: If another server is already listening on the socket.
+        """
+
+        daemon_threads = True
+
+        def __init__(self, socket_path: Optional[Path] = None) -> None:
+            self.socket_path = socket_path or default_socket_path()
+            _remove_stale_socket(self.socket_path)
+            old_umask = os.umask(0o177)
+            try:
+                super().__init__(str(self.socket_path), _RequestHandler)
+            finally:
+                os.umask(old_umask)
+
+        def server_close(self) -> None:
+            super().server_close()
+            with contextlib.suppress(OSError):
+                self.socket_path.unlink()
+
+else:  # pragma: no cover - platforms without AF_UNIX
+    Server = None  # type: ignore[assignment,misc]
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Delete *socket_path* if no server is listening on it.
+
+    Raises:
+        OSError: If a server is listening on *socket_path*, or if it exists
+            and is not a socket.
+    """
+    try:
+        mode = socket_path.stat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{socket_path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink()
+    else:
+        raise OSError(f"A server is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def serve(socket_path: Optional[Path] = None, ready: Optional[threading.Event] = None) -> None:
+    """Run a server on *socket_path* until it receives a ``shutdown`` request.
+
+    Args:
+        socket_path (Optional[Path]): Socket to listen on.
+        ready (Optional[threading.Event]): Set once the socket accepts
+            connections.
+    """
+    if Server is None:
+        raise OSError("Unix domain sockets are not supported on this platform")
+    core.go.warm_go_parser()
+    with Server(socket_path) as server:
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of ``agent-docstrings serve``."""
+    parser = argparse.ArgumentParser(
+        prog="agent-docstrings serve",
+        description="Keep the parsers loaded and answer requests on a Unix domain socket.",
+    )
+    parser.add_argument("--socket", type=Path, help="Socket to listen on (default: %s)." % default_socket_path())
+    args = parser.parse_args(argv)
+    socket_path = args.socket or default_socket_path()
+    print(f"Listening on {socket_path}")
+    sys.stdout.flush()
+    try:
+        serve(socket_path)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("Stopped.")
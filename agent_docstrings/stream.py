@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _decode(data: bytes) -> str (line 32)
+        - read_chunks(path: Path, offset: int = 0) -> Iterator[str] (line 37)
+        - read_lines(path: Path, offset: int = 0) -> Iterator[str] (line 53)
+        - MappedSource (line 70):
+            - __enter__() -> 'MappedSource' (line 91)
+            - __exit__(*exc_info: object) -> None (line 94)
+            - close() -> None (line 97)
+            - head(limit: int) -> Tuple[str, int] (line 100)
+            - find(text: str, start: int = 0) -> int (line 115)
+            - chunks(offset: int = 0) -> Iterator[str] (line 119)
+            - lines(offset: int = 0) -> Iterator[str] (line 123)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator, Tuple
+
+# * Number of characters decoded at a time when streaming a file
+CHUNK_SIZE = 1024 * 1024
+# * Characters at which str.splitlines() breaks lines
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _decode(data: bytes) -> str:
+    """Decode *data* exactly like ``Path.read_text(encoding="utf-8", errors="ignore")``."""
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_chunks(path: Path, offset: int = 0) -> Iterator[str]:
+    """Yield the text of *path* from byte *offset* in chunks.
+
+    The chunks are decoded with universal newlines, so joined together they
+    equal the corresponding part of ``Path.read_text``.
+    """
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        reader = io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+        while True:
+            chunk = reader.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def read_lines(path: Path, offset: int = 0) -> Iterator[str]:
+    """Yield the lines of *path* from byte *offset*, one at a time.
+
+    The lines equal those of ``str.splitlines`` applied to the text, which
+    also breaks lines at form feeds and other Unicode line boundaries.
+    """
+    pending = ""
+    for chunk in read_chunks(path, offset):
+        text = pending + chunk
+        lines = text.splitlines()
+        # * The last line continues in the next chunk unless a break ends the text
+        pending = lines.pop() if lines and text[-1] not in _LINE_BREAKS else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+class MappedSource:
+    """Read-only, memory-mapped view of a source file.
+
+    Large files are processed through this view instead of being read whole:
+    only the start of the file, which holds the preserved prefix and the
+    generated header, is decoded into a string, and the rest is scanned in
+    place or streamed.
+
+    Args:
+        path (Path): File to map. It must not be empty.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "MappedSource":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def head(self, limit: int) -> Tuple[str, int]:
+        """Return the complete lines within the first *limit* bytes.
+
+        Returns:
+            Tuple[str, int]: The decoded lines, ending with a newline unless
+            they reach the end of the file, and the byte offset where they
+            end.
+        """
+        if limit >= self.size:
+            end = self.size
+        else:
+            # * Cut after a newline so no character or CRLF pair is split
+            end = self._map.rfind(b"\n", 0, limit) + 1
+        return _decode(self._map[:end]), end
+
+    def find(self, text: str, start: int = 0) -> int:
+        """Return the byte offset of *text* at or after *start*, or -1."""
+        return self._map.find(text.encode("utf-8"), start)
+
+    def chunks(self, offset: int = 0) -> Iterator[str]:
+        """Yield the text from byte *offset*; see :func:`read_chunks`."""
+        return read_chunks(self.path, offset)
+
+    def lines(self, offset: int = 0) -> Iterator[str]:
+        """Yield the lines from byte *offset*; see :func:`read_lines`."""
+        return read_lines(self.path, offset)
+
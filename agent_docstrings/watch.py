@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - PathFilter (line 60):
+            - reload() -> None (line 79)
+            - _scope(rel_dir: str) -> GitignoreStack (line 86)
+            - accepts(path: Path, is_dir: bool = False) -> bool (line 101)
+        - PollingWatcher (line 123):
+            - _scan() -> Dict[Path, Tuple[int, int]] (line 139)
+            - read(timeout: float) -> Optional[Set[Path]] (line 150)
+            - close() -> None (line 164)
+        - InotifyWatcher (line 168):
+            - _add_watch(directory: Path, path_filter: PathFilter) -> None (line 196)
+            - _watch_tree(root: Path, path_filter: PathFilter) -> List[Path] (line 201)
+            - read(timeout: float) -> Optional[Set[Path]] (line 228)
+            - close() -> None (line 264)
+        - collect_changes(watcher: 'PollingWatcher | InotifyWatcher', first: Set[Path], debounce: float, max_wait: Optional[float] = None) -> Optional[Set[Path]] (line 270)
+        - create_watcher(filters: List[PathFilter], polling: bool = False, interval: float = DEFAULT_POLL_INTERVAL) -> 'PollingWatcher | InotifyWatcher' (line 301)
+        - watch(paths: Iterable[str], verbose: bool = False, beta: bool = False, debounce: float = DEFAULT_DEBOUNCE, polling: bool = False, interval: float = DEFAULT_POLL_INTERVAL, initial: bool = True, stop_event: Optional[threading.Event] = None) -> None (line 313)
+        - main(argv: Optional[List[str]] = None) -> None (line 387)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import core
+from .cli import parse_size
+from .ignore import Gitignore, GitignoreStack, IgnoreRules, load_ancestor_gitignores
+from .languages import go, treesitter
+
+# * Files whose change invalidates the compiled ignore rules of a root
+CONFIG_FILES = {".gitignore", ".agent-docstrings-ignore", ".agent-docstrings-include"}
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 0.5
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PathFilter:
+    """Decides which paths below a watched root are processed.
+
+    Applies the same rules as :func:`agent_docstrings.core.discover_files`:
+    the default ignored directories, the blacklist and whitelist of the root
+    and every ``.gitignore`` in scope. The compiled rules are kept for the
+    lifetime of the watcher and reloaded when a configuration file changes.
+
+    Args:
+        root (Path): Watched directory, or a watched file.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.only: Optional[Path] = None
+        if root.is_file():
+            self.only, root = root, root.parent
+        self.root = root
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the ignore configuration of the root."""
+        blacklist, whitelist = core.load_blacklist_whitelist(self.root)
+        self.rules = IgnoreRules((), blacklist, whitelist)
+        self.ancestors = load_ancestor_gitignores(self.root)
+        self._scopes: Dict[str, GitignoreStack] = {}
+
+    def _scope(self, rel_dir: str) -> GitignoreStack:
+        """Return the gitignore stack for entries of *rel_dir* (``""`` or ``"a/b/"``)."""
+        scope = self._scopes.get(rel_dir)
+        if scope is None:
+            if rel_dir:
+                parent = rel_dir[:rel_dir.rstrip("/").rfind("/") + 1]
+                scope = self._scope(parent)
+            else:
+                scope = self.ancestors
+            gitignore_path = self.root / rel_dir / ".gitignore"
+            if gitignore_path.is_file():
+                scope = scope.push(Gitignore.from_file(gitignore_path, strip=len(rel_dir)))
+            self._scopes[rel_dir] = scope
+        return scope
+
+    def accepts(self, path: Path, is_dir: bool = False) -> bool:
+        """Return True if *path* would be discovered (files) or walked (directories)."""
+        if self.only is not None:
+            return is_dir and path == self.root or path == self.only
+        try:
+            rel_path = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return False
+        if rel_path == ".":
+            return is_dir
+        parts = rel_path.split("/")
+        rel_dir = ""
+        for part in parts[:-1]:
+            if part in core.DEFAULT_IGNORE_DIRS or self._scope(rel_dir).is_ignored(rel_dir + part, True):
+                return False
+            rel_dir += part + "/"
+        scope = self._scope(rel_dir)
+        if is_dir:
+            return parts[-1] not in core.DEFAULT_IGNORE_DIRS and not scope.is_ignored(rel_path, True)
+        return self.rules.should_process(rel_path) and not scope.is_ignored(rel_path)
+
+
+class PollingWatcher:
+    """Detects changed files by comparing size and mtime between scans.
+
+    Args:
+        filters (List[PathFilter]): Watched roots.
+        interval (float): Seconds between scans.
+    """
+
+    backend = "polling"
+
+    def __init__(self, filters: List[PathFilter], interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.filters = filters
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        roots = [str(f.only or f.root) for f in self.filters]
+        for path in core.discover_files(roots):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout: float) -> Optional[Set[Path]]:
+        """Wait up to *timeout* seconds and return the files changed since the last scan."""
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+        if delay > 0:
+            time.sleep(delay)
+        snapshot = self._scan()
+        self._next_scan = time.monotonic() + self.interval
+        changed = {path for path, stamp in snapshot.items() if self._snapshot.get(path) != stamp}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux ``inotify`` watcher over every walked directory of the roots.
+
+    Reports files that were closed after writing or moved into a watched
+    directory. New directories are watched as they appear, and the files they
+    already contain are reported.
+
+    Args:
+        filters (List[PathFilter]): Watched roots.
+
+    Raises:
+        OSError: If inotify is not available.
+    """
+
+    backend = "inotify"
+
+    def __init__(self, filters: List[PathFilter]) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.filters = filters
+        self._watches: Dict[int, Tuple[Path, PathFilter]] = {}
+        for path_filter in filters:
+            self._watch_tree(path_filter.root, path_filter)
+
+    def _add_watch(self, directory: Path, path_filter: PathFilter) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = (directory, path_filter)
+
+    def _watch_tree(self, root: Path, path_filter: PathFilter) -> List[Path]:
+        """Watch *root* and its walked subdirectories; return the files found."""
+        files = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            self._add_watch(directory, path_filter)
+            if path_filter.only is not None:
+                continue
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                path = Path(entry.path)
+                try:
+                    is_dir = entry.is_dir() and not entry.is_symlink()
+                except OSError:
+                    continue
+                if is_dir:
+                    if path_filter.accepts(path, True):
+                        stack.append(path)
+                else:
+                    files.append(path)
+        return files
+
+    def read(self, timeout: float) -> Optional[Set[Path]]:
+        """Wait up to *timeout* seconds for events and return the changed files.
+
+        Returns *None* if the kernel queue overflowed and events were lost.
+        """
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            if mask & (_IN_IGNORED | _IN_DELETE_SELF):
+                self._watches.pop(wd, None)
+                continue
+            directory, path_filter = watch
+            path = directory / os.fsdecode(name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and path_filter.accepts(path, True):
+                    changed.update(self._watch_tree(path, path_filter))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def collect_changes(
+    watcher: "PollingWatcher | InotifyWatcher",
+    first: Set[Path],
+    debounce: float,
+    max_wait: Optional[float] = None,
+) -> Optional[Set[Path]]:
+    """Merge the events following *first* until *debounce* seconds pass quietly.
+
+    Bursts such as an editor's write-rename-chmod sequence or an agent
+    rewriting many files are coalesced into a single batch. *max_wait* bounds
+    the total delay under a continuous stream of events.
+
+    Returns:
+        Optional[Set[Path]]: The changed files, or *None* if events were lost.
+    """
+    changed = set(first)
+    start = time.monotonic()
+    deadline = start + debounce
+    limit = start + (max_wait if max_wait is not None else debounce * 20)
+    while True:
+        remaining = min(deadline, limit) - time.monotonic()
+        if remaining <= 0:
+            return changed
+        more = watcher.read(remaining)
+        if more is None:
+            return None
+        if more:
+            changed |= more
+            deadline = time.monotonic() + debounce
+
+
+def create_watcher(
+    filters: List[PathFilter], polling: bool = False, interval: float = DEFAULT_POLL_INTERVAL
+) -> "PollingWatcher | InotifyWatcher":
+    """Return an inotify watcher when available, otherwise a polling one."""
+    if not polling:
+        try:
+            return InotifyWatcher(filters)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(filters, interval)
+
+
+def watch(
+    paths: Iterable[str],
+    verbose: bool = False,
+    beta: bool = False,
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    initial: bool = True,
+    stop_event: Optional[threading.Event] = None,
+    max_file_size: Optional[int] = None,
+    sniff: bool = True,
+) -> None:
+    """Regenerate headers of files in *paths* whenever they are saved.
+
+    Runs in the current process, so parsers, compiled ignore rules and the
+    resident Go parser stay warm between changes, and files parsed with
+    tree-sitter are reparsed incrementally.
+
+    Args:
+        paths (Iterable[str]): Directories or files to watch.
+        verbose (bool, optional): Enables per-file logging when *True*.
+        beta (bool, optional): Enables experimental beta features.
+        debounce (float, optional): Seconds without events before a batch of
+            changes is processed.
+        polling (bool, optional): Use the polling watcher even if inotify is
+            available.
+        interval (float, optional): Seconds between scans of the polling
+            watcher.
+        initial (bool, optional): Process all files once before watching.
+        stop_event (Optional[threading.Event], optional): Stops the watcher
+            when set; runs until interrupted otherwise.
+        max_file_size (Optional[int], optional): Skip files larger than this
+            many bytes.
+        sniff (bool, optional): Skip files that look binary or minified; see
+            :func:`agent_docstrings.core.sniff_file`.
+    """
+    stop_event = stop_event or threading.Event()
+    roots = [Path(p).resolve() for p in paths]
+    filters = [PathFilter(root) for root in roots]
+    if initial:
+        core.discover_and_process_files(
+            [str(root) for root in roots], verbose, beta, max_file_size=max_file_size, sniff=sniff
+        )
+    if any(root.suffix == ".go" or root.is_dir() for root in roots):
+        go.warm_go_parser()
+    # * Stamps of files written by this watcher, to ignore their own events
+    written: Dict[Path, Tuple[int, int]] = {}
+    watcher = create_watcher(filters, polling, interval)
+    if verbose:
+        print(f"Watching {len(roots)} path(s) using {watcher.backend}.")
+    try:
+        while not stop_event.is_set():
+            first = watcher.read(0.2)
+            if first is not None and not first:
+                continue
+            changed = collect_changes(watcher, first or set(), debounce) if first is not None else None
+            if changed is None:
+                # * Events were lost; fall back to a full, idempotent pass
+                core.discover_and_process_files(
+                    [str(root) for root in roots], verbose, beta, max_file_size=max_file_size, sniff=sniff
+                )
+                continue
+            if any(path.name in CONFIG_FILES for path in changed):
+                for path_filter in filters:
+                    path_filter.reload()
+            for path in sorted(changed):
+                if not any(f.accepts(path) for f in filters):
+                    continue
+                try:
+                    before = path.stat()
+                except OSError:
+                    continue
+                stamp = (before.st_mtime_ns, before.st_size)
+                if written.get(path) == stamp:
+                    continue
+                reason = core.sniff_file(path, max_file_size, sniff)
+                if reason is not None:
+                    if verbose:
+                        print(f"Skipped {path}: {reason}")
+                    continue
+                # * Tree-sitter reparses only the regions changed since the last save
+                with treesitter.incremental(str(path)):
+                    core.process_file(path, verbose, beta)
+                try:
+                    after = path.stat()
+                except OSError:
+                    continue
+                written[path] = (after.st_mtime_ns, after.st_size)
+    finally:
+        watcher.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of ``agent-docstrings watch``."""
+    parser = argparse.ArgumentParser(
+        prog="agent-docstrings watch",
+        description="Regenerate file-level docstrings whenever source files are saved.",
+    )
+    parser.add_argument("paths", metavar="PATH", nargs="+", help="Files or directories to watch.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+    parser.add_argument("--beta", action="store_true", help="Enable experimental beta features.")
+    parser.add_argument(
+        "--debounce",
+        type=int,
+        default=int(DEFAULT_DEBOUNCE * 1000),
+        metavar="MS",
+        help="Quiet period before a burst of changes is processed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll the file system instead of using inotify.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=int(DEFAULT_POLL_INTERVAL * 1000),
+        metavar="MS",
+        help="Polling interval in milliseconds (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-initial",
+        action="store_true",
+        help="Do not process all files before starting to watch.",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        metavar="SIZE",
+        type=parse_size,
+        default=None,
+        help="Skip files larger than SIZE bytes; K, M and G suffixes are accepted.",
+    )
+    parser.add_argument(
+        "--no-sniff",
+        dest="sniff",
+        action="store_false",
+        help="Do not skip files whose first bytes look binary or minified.",
+    )
+    args = parser.parse_args(argv)
+
+    for p_str in args.paths:
+        if not Path(p_str).exists():
+            print(f"Error: Path not found at '{p_str}'", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        watch(
+            args.paths,
+            verbose=args.verbose,
+            beta=args.beta,
+            debounce=args.debounce / 1000,
+            polling=args.poll,
+            interval=args.interval / 1000,
+            initial=not args.no_initial,
+            max_file_size=args.max_file_size,
+            sniff=args.sniff,
+        )
+    except KeyboardInterrupt:
+        print("Stopped.")
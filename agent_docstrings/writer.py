@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - WriteFailure (line 43):
+        - detect_newline(path: Path) -> str (line 49)
+        - _discard(path: Path) -> None (line 68)
+        - _stage(path: Path, content: Content) -> Tuple[Path, Path] (line 73)
+        - _fsync_file(path: Path) -> None (line 102)
+        - _fsync_directory(path: Path) -> None (line 110)
+        - write_atomic(path: Path, content: Content, fsync: bool = False) -> None (line 123)
+        - FileWriter (line 154):
+            - __enter__() -> 'FileWriter' (line 189)
+            - __exit__(*exc_info: object) -> None (line 192)
+            - submit(path: Path, content: Content, on_written: Optional[Callable[[], None]] = None) -> None (line 195)
+            - close() -> List[WriteFailure] (line 207)
+            - _run() -> None (line 219)
+            - _write_batch(batch: List[Tuple[Path, Content, Optional[Callable[[], None]]]]) -> None (line 241)
+            - _notify(path: Path, on_written: Optional[Callable[[], None]]) -> None (line 276)
+    --- END AUTO-GENERATED DOCSTRING ---
+"""
+import contextlib
+import os
+import queue
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# * Maximum number of files waiting to be written; producers block beyond it
+DEFAULT_QUEUE_SIZE = 32
+# * Maximum number of files whose fsync calls are issued together
+FSYNC_BATCH_SIZE = 64
+# * Bytes read from a file to detect its line endings
+_NEWLINE_PROBE_SIZE = 64 * 1024
+
+Content = Union[str, Iterable[str]]
+
+
+class WriteFailure(NamedTuple):
+    """A file the writer could not replace, and the reason."""
+    path: Path
+    error: Exception
+
+
+def detect_newline(path: Path) -> str:
+    """Return the line ending used by *path*: ``"\\r\\n"``, ``"\\r"`` or ``"\\n"``.
+
+    The first line break decides. Files without one, or that cannot be read,
+    are treated as using ``"\\n"``.
+    """
+    try:
+        with open(path, "rb") as f:
+            probe = f.read(_NEWLINE_PROBE_SIZE)
+    except OSError:
+        return "\n"
+    index = probe.find(b"\n")
+    if index > 0 and probe[index - 1] == ord("\r"):
+        return "\r\n"
+    if b"\r" in (probe if index < 0 else probe[:index]):
+        return "\r"
+    return "\n"
+
+
+def _discard(path: Path) -> None:
+    with contextlib.suppress(OSError):
+        os.unlink(path)
+
+
+def _stage(path: Path, content: Content) -> Tuple[Path, Path]:
+    """Write *content* to a temporary file next to *path*.
+
+    The temporary file gets the permission bits and line endings of the file
+    it is going to replace. Symbolic links are followed, so the link itself
+    is kept.
+
+    Returns:
+        Tuple[Path, Path]: The file to replace and the temporary file.
+    """
+    target = Path(os.path.realpath(path))
+    mode = stat.S_IMODE(os.stat(target).st_mode)
+    newline = detect_newline(target)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        if isinstance(content, str):
+            tmp.write_text(content, encoding="utf-8", newline=newline)
+        else:
+            with tmp.open("w", encoding="utf-8", newline=newline) as f:
+                f.writelines(content)
+        os.chmod(tmp, mode)
+    except BaseException:
+        _discard(tmp)
+        raise
+    return target, tmp
+
+
+def _fsync_file(path: Path) -> None:
+    # ! The file already has the target's mode, which may be read-only; only
+    # ! Windows needs a writable descriptor to flush a file
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist the renames in directory *path*; a no-op where unsupported."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        with contextlib.suppress(OSError):
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, content: Content, fsync: bool = False) -> None:
+    """Replace the content of *path* atomically.
+
+    *content* is written to a temporary file in the same directory, which
+    then replaces *path* with :func:`os.replace`, so an interrupted run
+    leaves either the old or the new file, never a truncated one. The file
+    keeps its permission bits and line endings.
+
+    Args:
+        path (Path): File to replace.
+        content (Union[str, Iterable[str]]): New text with ``"\\n"`` line
+            endings, whole or in chunks. Chunks may still be reading from
+            *path*.
+        fsync (bool, optional): Flush the new file and the directory entry
+            to disk, so the new content also survives a power loss.
+
+    Raises:
+        OSError: If the file cannot be written or replaced.
+    """
+    target, tmp = _stage(path, content)
+    try:
+        if fsync:
+            _fsync_file(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        _discard(tmp)
+        raise
+    if fsync:
+        _fsync_directory(target.parent)
+
+
+class FileWriter:
+    """Writer stage that replaces files on a background thread.
+
+    Parsing and formatting continue while earlier files are written. The
+    queue is bounded, so a slow disk throttles the producer instead of
+    letting pending contents pile up in memory. With *fsync*, all files
+    already queued are written first and then flushed together, followed by
+    one flush per directory, instead of two flushes per file.
+
+    Failed writes do not stop the writer; they are collected in
+    :attr:`failures`, which the owner reports after :meth:`close`.
+
+    Args:
+        fsync (bool, optional): Flush written files to disk; see
+            :func:`write_atomic`.
+        queue_size (int, optional): Maximum number of pending files.
+        batch_size (int, optional): Maximum number of files flushed together.
+    """
+
+    def __init__(
+        self,
+        fsync: bool = False,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = FSYNC_BATCH_SIZE,
+    ) -> None:
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.failures: List[WriteFailure] = []
+        self._queue: "queue.Queue[Optional[Tuple[Path, Content, Optional[Callable[[], None]]]]]" = (
+            queue.Queue(maxsize=queue_size)
+        )
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="agent-docstrings-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FileWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(
+        self, path: Path, content: Content, on_written: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Queue *content* to replace *path*, blocking while the queue is full.
+
+        *on_written* is called on the writer thread once the file has been
+        replaced, and not at all if writing fails.
+        """
+        if self._closed:
+            raise RuntimeError("FileWriter is closed")
+        self._queue.put((path, content, on_written))
+
+    def close(self) -> List[WriteFailure]:
+        """Wait until every queued file is written and stop the thread.
+
+        Returns:
+            List[WriteFailure]: The files that could not be written.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        return self.failures
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            if self.fsync:
+                # * Flush whatever is already waiting together with this file
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(
+        self, batch: List[Tuple[Path, Content, Optional[Callable[[], None]]]]
+    ) -> None:
+        if not self.fsync:
+            for path, content, on_written in batch:
+                try:
+                    write_atomic(path, content)
+                except Exception as e:
+                    self.failures.append(WriteFailure(path, e))
+                else:
+                    self._notify(path, on_written)
+            return
+        staged = []
+        for path, content, on_written in batch:
+            try:
+                staged.append((path, *_stage(path, content), on_written))
+            except Exception as e:
+                self.failures.append(WriteFailure(path, e))
+        written = []
+        directories = set()
+        for path, target, tmp, on_written in staged:
+            try:
+                _fsync_file(tmp)
+                os.replace(tmp, target)
+            except Exception as e:
+                _discard(tmp)
+                self.failures.append(WriteFailure(path, e))
+            else:
+                written.append((path, on_written))
+                directories.add(target.parent)
+        for directory in directories:
+            _fsync_directory(directory)
+        for path, on_written in written:
+            self._notify(path, on_written)
+
+    def _notify(self, path: Path, on_written: Optional[Callable[[], None]]) -> None:
+        if on_written is None:
+            return
+        try:
+            on_written()
+        except Exception as e:
+            self.failures.append(WriteFailure(path, e))
@@ -0,0 +1,95 @@
+"""Benchmark for header rendering in ``core.py``.
+
+Compares the previous approach, which rendered the header once with offset 0
+only to count its lines and then again with the real offset (and a third time
+for Python files whose manual docstring the header is merged into), with the
+current single pass that derives the line count from the symbol tree.
+
+Usage:
+    python benchmarks/bench_header_format.py [--symbols 5000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings.core import (  # noqa: E402
+    _format_header,
+    _get_header_content_lines,
+    _render_toc,
+)
+from agent_docstrings.languages.common import ClassInfo, SignatureInfo  # noqa: E402
+
+Symbols = Tuple[List[ClassInfo], List[SignatureInfo]]
+
+
+def generate_symbols(count: int) -> Symbols:
+    """Return about *count* classes, methods, nested classes and functions."""
+    classes: List[ClassInfo] = []
+    functions: List[SignatureInfo] = []
+    line = 1
+    while len(classes) * 8 + len(functions) < count:
+        methods = [
+            SignatureInfo(f"method_{i}(self, value: int, *, strict: bool = False) -> int", line + i + 1)
+            for i in range(5)
+        ]
+        inner = ClassInfo(f"Inner{line}", line + 6, [SignatureInfo("run(self) -> None", line + 7)], [])
+        classes.append(ClassInfo(f"Class{line}", line, methods, [inner]))
+        functions.append(SignatureInfo(f"helper_{line}(data: bytes) -> str", line + 8))
+        line += 10
+    return classes, functions
+
+
+def legacy_render(symbols: Symbols, language: str, merge: bool) -> List[str]:
+    """The previous approach: render to count, render again, and once more to merge."""
+    classes, functions = symbols
+    count = len(_format_header(classes, functions, language, 0).splitlines())
+    header = _format_header(classes, functions, language, count)
+    if merge:
+        return _get_header_content_lines(classes, functions, language, count - 2)
+    # * Both benchmarked languages have start and end delimiters
+    return header.split("\n")[1:-1]
+
+
+def single_pass_render(symbols: Symbols, language: str, merge: bool) -> List[str]:
+    """The current approach: count analytically, render once."""
+    classes, functions = symbols
+    return _render_toc(classes, functions, language, (lambda n: n - 2) if merge else (lambda n: n))
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of *func* over *repeat* runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    symbols = generate_symbols(args.symbols)
+    print(f"~{args.symbols} symbols, best of {args.repeat}")
+    for language, merge in (("python", False), ("python", True), ("java", False)):
+        assert legacy_render(symbols, language, merge) == single_pass_render(symbols, language, merge)
+        label = f"{language}{' (merged docstring)' if merge else ''}"
+        legacy_time = measure(lambda: legacy_render(symbols, language, merge), args.repeat)
+        current_time = measure(lambda: single_pass_render(symbols, language, merge), args.repeat)
+        print(
+            f"  {label:<28} legacy {legacy_time * 1000:7.2f} ms  "
+            f"single-pass {current_time * 1000:7.2f} ms  ({legacy_time / current_time:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark for processing very large source files in ``core.py``.
+
+Compares the in-memory path of ``process_file``, which reads the whole file,
+splits and joins it several times and writes it back, with the streaming path
+for files of at least ``LARGE_FILE_SIZE`` bytes, which decodes only the start
+of a memory-mapped view, parses the rest line by line and streams the new
+content to a temporary file. The input is an amalgamation-style C file with
+an existing header, processed after one function was added.
+
+Files this large are parsed by the regex parsers even when a tree-sitter
+grammar is installed. When the C grammar is, the file is also processed in
+memory with a syntax tree, to show what that would cost.
+
+The reported peak is the Python heap (``tracemalloc``), which includes the
+syntax trees; pages of the mapped file belong to the page cache and are not
+included.
+
+Usage:
+    python benchmarks/bench_large_file.py [--megabytes 32] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings import core  # noqa: E402
+from agent_docstrings.languages import treesitter  # noqa: E402
+
+# * "@" is replaced by the number of the function
+BLOCK = """\
+/*
+** Copy at most n bytes of the record @ into the buffer, growing the
+** buffer first if the record is larger than the space left in it.
+*/
+static int record_copy_@(Record *p, char *buf, int n){
+  int rc = SQLITE_OK;
+  int nCopy;
+  char *zOut = buf;
+""" + "".join(
+    f"""\
+  if( p->aField[{k}].nData>0 ){{
+    nCopy = p->aField[{k}].nData<n ? p->aField[{k}].nData : n;
+    memcpy(zOut, p->aField[{k}].z, nCopy);
+    zOut += nCopy;
+    n -= nCopy;
+  }}
+"""
+    for k in range(8)
+) + """\
+  return rc;
+}
+
+"""
+
+
+def generate_amalgamation(path: Path, megabytes: int) -> None:
+    """Write about *megabytes* MiB of C code to *path* and give it a header."""
+    target = megabytes * 1024 * 1024
+    with path.open("w", encoding="utf-8") as f:
+        f.write("#include <string.h>\n\n")
+        i = 0
+        while f.tell() < target:
+            f.write("".join(BLOCK.replace("@", str(i + j)) for j in range(100)))
+            i += 100
+    core.process_file(path)
+
+
+def measure(path: Path, original: bytes, mode: str, repeat: int) -> Tuple[float, int]:
+    """Return the best wall time and the heap peak of processing *path*.
+
+    *mode* is "streaming", "in-memory", or "tree-sitter" for the in-memory
+    path with a syntax tree, as taken by files below ``LARGE_FILE_SIZE``.
+    """
+    if mode == "streaming":
+        patcher = patch.object(core, "LARGE_FILE_SIZE", core.LARGE_FILE_SIZE)
+    elif mode == "in-memory":
+        # * As for files whose header is not near their start
+        patcher = patch.object(core, "_process_large_file", return_value=None)
+    else:
+        patcher = patch.object(core, "LARGE_FILE_SIZE", float("inf"))
+    best = float("inf")
+    peak = 0
+    with patcher:
+        for run in range(repeat + 1):
+            path.write_bytes(original)
+            if run == repeat:
+                tracemalloc.start()
+            start = time.perf_counter()
+            core.process_file(path)
+            elapsed = time.perf_counter() - start
+            if run == repeat:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            else:
+                best = min(best, elapsed)
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "amalgamation.c"
+        generate_amalgamation(path, args.megabytes)
+        original = path.read_bytes() + b"int added(void){\n  return 0;\n}\n"
+        modes = ["in-memory", "streaming"]
+        if treesitter.load_language("c") is not None:
+            modes.append("tree-sitter")
+        results = {}
+        outputs = {}
+        for mode in modes:
+            results[mode] = measure(path, original, mode, args.repeat)
+            outputs[mode] = path.read_bytes()
+        assert outputs["in-memory"] == outputs["streaming"]
+
+    print(f"{len(original) / 2**20:.1f} MiB C file, best of {args.repeat}")
+    for mode in modes:
+        elapsed, peak = results[mode]
+        print(f"  {mode:<11} {elapsed * 1000:8.1f} ms  heap peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark for the Python AST extraction in ``languages/python.py``.
+
+Compares the current single-pass extraction with the previous approach, which
+decorated every node with a parent pointer and then walked the whole tree a
+second time. The input is a generated module shaped like protobuf ``_pb2``
+stubs: many classes with nested classes, methods and large literal tables.
+
+Usage:
+    python benchmarks/bench_python_parser.py [--lines 10000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings.languages.common import ClassInfo, SignatureInfo  # noqa: E402
+from agent_docstrings.languages.python import (  # noqa: E402
+    _format_signature,
+    parse_python_file,
+)
+
+
+def generate_stub_module(target_lines: int) -> List[str]:
+    """Return at least *target_lines* lines of protobuf-stub-like Python code."""
+    lines = [
+        "from google.protobuf import descriptor as _descriptor",
+        "from typing import ClassVar, Iterable, Mapping, Optional, Union",
+        "",
+    ]
+    index = 0
+    while len(lines) < target_lines:
+        lines.extend(
+            [
+                f"class Message{index}(_message.Message):",
+                '    __slots__ = ["field_a", "field_b", "items"]',
+                "    class Entry(_message.Message):",
+                '        __slots__ = ["key", "value"]',
+                "        KEY_FIELD_NUMBER: ClassVar[int]",
+                "        def __init__(self, key: Optional[str] = ..., value: Optional[int] = ...) -> None: ...",
+                "    FIELD_A_FIELD_NUMBER: ClassVar[int]",
+                "    FIELD_B_FIELD_NUMBER: ClassVar[int]",
+                "    field_a: str",
+                "    field_b: int",
+                f"    _TABLE = {{{', '.join(f'{i}: ({i}, {i * 2}, {i * 3})' for i in range(12))}}}",
+                "    def __init__(self, field_a: Optional[str] = ..., field_b: Optional[int] = ...,",
+                "                 items: Optional[Iterable[Union[Message0.Entry, Mapping]]] = ...) -> None: ...",
+                "    def Validate(self, strict: bool = False, *, depth: int = 3) -> bool:",
+                "        for key, value in self._TABLE.items():",
+                "            if value[0] > depth and strict:",
+                "                return [x for x in value if x % 2 == 0] == []",
+                "        return True",
+                "    @classmethod",
+                f"    def FromBytes(cls, data: bytes) -> 'Message{index}': ...",
+                "",
+            ]
+        )
+        index += 1
+    return lines
+
+
+def legacy_parse_python_file(
+    lines: List[str],
+) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
+    """The previous two-pass implementation, kept for comparison."""
+    tree = ast.parse("\n".join(lines))
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            setattr(child, "parent", node)
+
+    def parse_class(node: ast.ClassDef) -> ClassInfo:
+        methods, inner = [], []
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if item.name != "__init__":
+                    methods.append(
+                        SignatureInfo(_format_signature(item, is_method=True), item.lineno)
+                    )
+            elif isinstance(item, ast.ClassDef):
+                inner.append(parse_class(item))
+        return ClassInfo(node.name, node.lineno, methods, inner)
+
+    classes, functions = [], []
+    for node in ast.walk(tree):
+        is_top_level = isinstance(getattr(node, "parent", None), ast.Module)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and is_top_level:
+            functions.append(SignatureInfo(_format_signature(node), node.lineno))
+        elif isinstance(node, ast.ClassDef) and is_top_level:
+            classes.append(parse_class(node))
+    return classes, functions
+
+
+def measure(
+    func: Callable[[List[str]], object], lines: List[str], repeat: int
+) -> Tuple[float, int]:
+    """Return the best wall time and the peak traced allocation of *func*."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(lines)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(lines)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = generate_stub_module(args.lines)
+    assert legacy_parse_python_file(lines) == parse_python_file(lines)
+
+    results = {
+        "two-pass (legacy)": measure(legacy_parse_python_file, lines, args.repeat),
+        "single-pass": measure(parse_python_file, lines, args.repeat),
+    }
+    print(f"{len(lines)} lines, best of {args.repeat}")
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
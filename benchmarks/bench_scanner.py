@@ -0,0 +1,181 @@
+"""Benchmark for the brace tracking of the C-style parsers.
+
+Compares ``parse_generic_file``, which follows braces with the lexical
+scanner in ``languages/scanner.py``, with the previous implementation, which
+counted every ``{`` and ``}`` on each stripped line, including those inside
+strings, comments and regular expressions. The inputs are generated
+JavaScript and C++ sources shaped like ordinary application code: classes
+with methods, doc comments, string and template literals.
+
+The scanner does more work per line than plain counting, so this benchmark
+tracks the price of the correct nesting rather than a speed-up. On the
+JavaScript input about a third of the scanner's time goes to blanking
+comments and literals, one substitution callback per token, a quarter to
+building a ``ScannedLine`` per line, and most of the rest to matching the
+signatures, which the per-line counting does as well.
+
+Usage:
+    python benchmarks/bench_scanner.py [--lines 20000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings.languages.common import ClassInfo, SignatureInfo  # noqa: E402
+from agent_docstrings.languages.generic import (  # noqa: E402
+    CPP_CLASS_RE,
+    CPP_FUNC_RE,
+    JS_CLASS_RE,
+    JS_FUNC_RE,
+    parse_generic_file,
+)
+
+_PATTERNS: Dict[str, Tuple[re.Pattern, re.Pattern]] = {
+    "javascript": (JS_CLASS_RE, JS_FUNC_RE),
+    "cpp": (CPP_CLASS_RE, CPP_FUNC_RE),
+}
+
+
+def _javascript_block(i: int) -> List[str]:
+    return [
+        "/**",
+        f" * Handles requests for resource {i}.",
+        " */",
+        f"export class Handler{i} extends Base {{",
+        "  constructor(options) {",
+        "    super(options);",
+        "    this.routes = { get: '/items', post: '/items/new' };",
+        "  }",
+        "",
+        f"  async handle{i}(request, retries = 3) {{",
+        "    // Retry until the upstream answers",
+        "    const url = `${this.base}/items/${request.id}?q=${encodeURIComponent(request.q)}`;",
+        "    if (!/^[a-z]+$/i.test(request.kind)) {",
+        "      throw new Error(\"invalid kind: {\" + request.kind + \"}\");",
+        "    }",
+        "    return fetch(url).then((response) => response.json());",
+        "  }",
+        "}",
+        "",
+        f"export function helper{i}(value, factor) {{",
+        "  return value * factor / 2;",
+        "}",
+        "",
+    ]
+
+
+def _cpp_block(i: int) -> List[str]:
+    return [
+        f"// Storage for shard {i}",
+        f"class Shard{i} {{",
+        "public:",
+        f"    int lookup{i}(const std::string& key) const {{",
+        "        auto it = index_.find(key);",
+        '        if (it == index_.end()) { log("missing {key}"); return -1; }',
+        "        return it->second;",
+        "    }",
+        "    /* The cache is rebuilt lazily",
+        "       { see rebuild() } */",
+        "    void rebuild();",
+        "private:",
+        "    std::map<std::string, int> index_;",
+        "};",
+        "",
+        f"int checksum{i}(const char* data, int size) {{",
+        "    int sum = 0;",
+        "    for (int j = 0; j < size; ++j) { sum += data[j]; }",
+        "    return sum;",
+        "}",
+        "",
+    ]
+
+
+_GENERATORS: Dict[str, Callable[[int], List[str]]] = {
+    "javascript": _javascript_block,
+    "cpp": _cpp_block,
+}
+
+
+def generate_source(language: str, target_lines: int) -> List[str]:
+    """Return at least *target_lines* lines of *language* code."""
+    lines: List[str] = []
+    index = 0
+    while len(lines) < target_lines:
+        lines.extend(_GENERATORS[language](index))
+        index += 1
+    return lines
+
+
+def legacy_parse_generic_file(lines: List[str], lang: str) -> Tuple[List[ClassInfo], List[SignatureInfo]]:
+    """The previous per-line brace counting, kept for comparison."""
+    class_re, func_re = _PATTERNS[lang]
+    classes: List[ClassInfo] = []
+    top_level_funcs: List[SignatureInfo] = []
+    class_stack: List[ClassInfo] = []
+    brace_level = 0
+    for line_num, line in enumerate(lines, 1):
+        stripped_line = line.strip()
+        if "}" in stripped_line:
+            brace_level -= stripped_line.count("}")
+            if class_stack and brace_level < len(class_stack):
+                class_stack.pop()
+        class_match = class_re.match(stripped_line)
+        func_match = func_re.match(stripped_line)
+        if class_match:
+            new_class = ClassInfo(class_match.group(1), line_num, [], [])
+            (class_stack[-1].inner_classes if class_stack else classes).append(new_class)
+            if "{" in stripped_line:
+                class_stack.append(new_class)
+                brace_level += stripped_line.count("{")
+            continue
+        if func_match:
+            info = SignatureInfo(stripped_line.split("{")[0].strip(), line_num)
+            (class_stack[-1].methods if class_stack else top_level_funcs).append(info)
+        if "{" in stripped_line:
+            brace_level += stripped_line.count("{")
+    return classes, top_level_funcs
+
+
+def measure(
+    funcs: List[Callable[[List[str], str], object]], lines: List[str], lang: str, repeat: int
+) -> List[float]:
+    """Return the best wall time of each of *funcs* over *repeat* runs.
+
+    The functions take turns within each run, so a slowdown of the machine
+    during the benchmark affects them alike.
+    """
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func(lines, lang)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}")
+    for language in _GENERATORS:
+        lines = generate_source(language, args.lines)
+        legacy, scanner = measure([legacy_parse_generic_file, parse_generic_file], lines, language, args.repeat)
+        classes, _ = parse_generic_file(lines, language)
+        methods = sum(len(info.methods) for info in classes)
+        print(f"{language} ({len(lines)} lines, {len(classes)} classes, {methods} methods)")
+        print(f"  {'per-line counting':<18} {legacy * 1000:8.1f} ms")
+        print(f"  {'lexical scanner':<18} {scanner * 1000:8.1f} ms ({scanner / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
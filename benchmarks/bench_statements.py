@@ -0,0 +1,135 @@
+"""Benchmark for the statement assembler of the regex-based parsers.
+
+Times ``parse_generic_file`` (C++), ``parse_kotlin_file`` and
+``parse_delphi_file`` with the statement assembler, which joins the lines of
+a signature until its parentheses balance, and with the previous per-line
+matching, where every line reaches the regular expressions on its own.
+Half of the generated signatures put one parameter per line, so the
+per-line matcher misses them.
+
+Each language is timed at two sizes to show that the cost grows linearly,
+and C++ once more on a file that opens a parenthesis it never closes, which
+the assembler gives up on after ``MAX_STATEMENT_LINES`` lines.
+
+Usage:
+    python benchmarks/bench_statements.py [--lines 20000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings.languages import delphi, generic, kotlin  # noqa: E402
+
+
+def _cpp_block(i: int) -> List[str]:
+    return [
+        f"class Codec{i} {{",
+        "public:",
+        f"    int encode{i}(const char* data, int size) {{ return size; }}",
+        f"    int decode{i}(const char* data,",
+        "                 int size,",
+        "                 int flags) {",
+        "        return flags;",
+        "    }",
+        "};",
+        "",
+    ]
+
+
+def _kotlin_block(i: int) -> List[str]:
+    return [
+        f"class Service{i} {{",
+        f"    fun handle{i}(request: Map<String, Int>): Int {{",
+        "        return request.size",
+        "    }",
+        f"    fun retry{i}(",
+        "        request: Map<String, Int>,",
+        "        attempts: Int,",
+        "    ): Int {",
+        "        return attempts",
+        "    }",
+        "}",
+        "",
+    ]
+
+
+def _delphi_block(i: int) -> List[str]:
+    return [
+        f"procedure Load{i}(const AName: string);",
+        f"function Store{i}(const AName: string;",
+        "  AValue: Integer): Boolean;",
+        "",
+    ]
+
+
+_PARSERS: Dict[str, Tuple[Callable[[int], List[str]], Callable[[List[str]], tuple]]] = {
+    "cpp": (_cpp_block, lambda lines: generic.parse_generic_file(lines, "cpp")),
+    "kotlin": (_kotlin_block, kotlin.parse_kotlin_file),
+    "delphi": (_delphi_block, delphi.parse_delphi_file),
+}
+
+
+def generate_source(block: Callable[[int], List[str]], target_lines: int) -> List[str]:
+    """Return at least *target_lines* lines made of repeated *block*."""
+    lines: List[str] = []
+    index = 0
+    while len(lines) < target_lines:
+        lines.extend(block(index))
+        index += 1
+    return lines
+
+
+@contextmanager
+def per_line() -> Iterator[None]:
+    """Bypass the statement assembler, as before it was added."""
+    saved = generic.join_statements, kotlin.join_statements, delphi._statements
+    generic.join_statements = kotlin.join_statements = lambda scanned: scanned
+    delphi._statements = lambda lines: ((n, line.strip()) for n, line in enumerate(lines, 1))
+    try:
+        yield
+    finally:
+        generic.join_statements, kotlin.join_statements, delphi._statements = saved
+
+
+def measure(parse: Callable[[List[str]], tuple], lines: List[str], repeat: int) -> Tuple[float, int]:
+    """Return the best wall time of *parse* and the number of signatures found."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        classes, funcs = parse(lines)
+        best = min(best, time.perf_counter() - start)
+    return best, len(funcs) + sum(len(info.methods) for info in classes)
+
+
+def report(name: str, parse: Callable[[List[str]], tuple], lines: List[str], repeat: int) -> None:
+    with per_line():
+        legacy, legacy_found = measure(parse, lines, repeat)
+    joined, joined_found = measure(parse, lines, repeat)
+    print(f"{name} ({len(lines)} lines)")
+    print(f"  {'per-line':<10} {legacy * 1000:8.1f} ms  {legacy / len(lines) * 1e6:6.2f} us/line  {legacy_found:6d} found")
+    print(f"  {'assembled':<10} {joined * 1000:8.1f} ms  {joined / len(lines) * 1e6:6.2f} us/line  {joined_found:6d} found")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}")
+    for language, (block, parse) in _PARSERS.items():
+        for size in (args.lines, 4 * args.lines):
+            report(language, parse, generate_source(block, size), args.repeat)
+    unbalanced = ["#define OPEN ("] + generate_source(_cpp_block, args.lines)
+    report("cpp, unclosed parenthesis", _PARSERS["cpp"][1], unbalanced, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Throughput benchmark for the tree-sitter parser backend.
+
+For every language with a tree-sitter grammar, times the regex-based parser
+that the backend falls back to, a full tree-sitter parse with the reused
+parser object, and an incremental reparse after a one-line edit in the
+middle of the file, as in watch mode. Languages whose grammar is not
+installed are reported as such.
+
+Usage:
+    python benchmarks/bench_treesitter.py [--lines 20000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings import core  # noqa: E402
+from agent_docstrings.languages import treesitter  # noqa: E402
+from corpus import generate_source  # noqa: E402
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of *func* over *repeat* runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def incremental(parser: treesitter.TreeSitterParser, lines: List[str], edited: List[str]) -> Callable[[], object]:
+    """Return a function reparsing *edited* against the tree of *lines*."""
+
+    def run() -> object:
+        with treesitter.incremental("bench"):
+            parser(lines)
+            start = time.perf_counter()
+            parser(edited)
+            return time.perf_counter() - start
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}, in thousands of lines per second")
+    for language in treesitter.GRAMMARS:
+        backend = core.LANG_PARSERS[language]
+        assert isinstance(backend, treesitter.TreeSitterParser)
+        lines = generate_source(language, args.lines).splitlines()
+        regex = measure(lambda: backend.fallback(lines), args.repeat)
+        row = f"  {language:<11} regex {len(lines) / regex / 1000:8.0f}"
+        if not backend.available:
+            print(f"{row}   tree-sitter grammar not installed")
+            continue
+        full = measure(lambda: backend(lines), args.repeat)
+        edited = list(lines)
+        middle = len(edited) // 2
+        edited[middle] = edited[middle] + "  // edited"
+        run = incremental(backend, lines, edited)
+        reparse = min(run() for _ in range(args.repeat))
+        print(
+            f"{row}   tree-sitter {len(lines) / full / 1000:8.0f}"
+            f"   incremental {len(lines) / reparse / 1000:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
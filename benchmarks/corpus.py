@@ -0,0 +1,223 @@
+"""Synthetic source corpora for the benchmark suite.
+
+Every extension in :data:`agent_docstrings.core.EXT_TO_LANG` gets its own
+template, so a corpus exercises every parser. Files are spread round-robin
+over the extensions and into nested directories of at most 100 files each.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings.core import EXT_TO_LANG  # noqa: E402
+
+FILES_PER_DIRECTORY = 100
+
+
+def _python_block(i: int) -> List[str]:
+    return [
+        f"class Service{i}:",
+        f"    def handle_{i}(self, request: dict, retries: int = 3) -> dict:",
+        "        result = {}",
+        "        for key, value in request.items():",
+        "            result[key] = value",
+        "        return result",
+        "",
+        f"def helper_{i}(value: int) -> int:",
+        "    return value * 2",
+        "",
+    ]
+
+
+def _kotlin_block(i: int) -> List[str]:
+    return [
+        f"class Service{i} {{",
+        f"    fun handle{i}(request: Map<String, Int>): Int {{",
+        "        return request.size",
+        "    }",
+        "}",
+        "",
+        f"fun helper{i}(value: Int): Int {{",
+        "    return value * 2",
+        "}",
+        "",
+    ]
+
+
+def _javascript_block(i: int) -> List[str]:
+    return [
+        f"class Service{i} {{",
+        f"  handle{i}(request, retries) {{",
+        "    return request;",
+        "  }",
+        "}",
+        "",
+        f"function helper{i}(value) {{",
+        "  return value * 2;",
+        "}",
+        "",
+    ]
+
+
+def _typescript_block(i: int) -> List[str]:
+    return [
+        f"export class Service{i} {{",
+        f"  handle{i}(request: Request, retries: number) {{",
+        "    return request;",
+        "  }",
+        "}",
+        "",
+        f"export function helper{i}(value: number): number {{",
+        "  return value * 2;",
+        "}",
+        "",
+    ]
+
+
+def _csharp_block(i: int) -> List[str]:
+    return [
+        f"public class Service{i} {{",
+        f"    public int Handle{i}(int request, int retries) {{",
+        "        return request + retries;",
+        "    }",
+        "}",
+        "",
+    ]
+
+
+def _cpp_block(i: int) -> List[str]:
+    return [
+        f"class Service{i} {{",
+        "public:",
+        f"  int handle{i}(int request) const {{",
+        "    return request;",
+        "  }",
+        "};",
+        "",
+        f"int helper{i}(int value) {{",
+        "  return value * 2;",
+        "}",
+        "",
+    ]
+
+
+def _c_block(i: int) -> List[str]:
+    return [
+        f"static int helper{i}(int value) {{",
+        "  return value * 2;",
+        "}",
+        "",
+    ]
+
+
+def _java_block(i: int) -> List[str]:
+    return [
+        f"public class Service{i} {{",
+        f"    public int handle{i}(int request, int retries) {{",
+        "        return request + retries;",
+        "    }",
+        "}",
+        "",
+    ]
+
+
+def _go_block(i: int) -> List[str]:
+    return [
+        f"type Handler{i} interface {{",
+        f"\tHandle{i}(request string) error",
+        "}",
+        "",
+        f"func Helper{i}(value int) int {{",
+        "\treturn value * 2",
+        "}",
+        "",
+    ]
+
+
+def _powershell_block(i: int) -> List[str]:
+    return [
+        f"function Invoke-Service{i}([string]$Request) {{",
+        "    return $Request",
+        "}",
+        "",
+    ]
+
+
+def _delphi_block(i: int) -> List[str]:
+    return [
+        "type",
+        f"  TService{i} = class",
+        f"    procedure Handle{i}(Request: Integer);",
+        "  end;",
+        "",
+        f"function Helper{i}(Value: Integer): Integer;",
+        "begin",
+        "  Result := Value * 2;",
+        "end;",
+        "",
+    ]
+
+
+BLOCKS: Dict[str, Callable[[int], List[str]]] = {
+    "python": _python_block,
+    "kotlin": _kotlin_block,
+    "javascript": _javascript_block,
+    "typescript": _typescript_block,
+    "csharp": _csharp_block,
+    "cpp": _cpp_block,
+    "c": _c_block,
+    "java": _java_block,
+    "go": _go_block,
+    "powershell": _powershell_block,
+    "delphi": _delphi_block,
+}
+
+PREAMBLES: Dict[str, List[str]] = {
+    "go": ["package bench", ""],
+}
+
+
+def generate_source(language: str, lines_per_file: int) -> str:
+    """Return a synthetic *language* source with at least *lines_per_file* lines."""
+    lines = list(PREAMBLES.get(language, []))
+    block = BLOCKS[language]
+    index = 0
+    while len(lines) < lines_per_file:
+        lines.extend(block(index))
+        index += 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(
+    root: Path,
+    files: int,
+    lines_per_file: int,
+    extensions: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """Write a synthetic corpus of *files* source files below *root*.
+
+    Args:
+        root (Path): Directory to create the corpus in.
+        files (int): Total number of files to write.
+        lines_per_file (int): Minimum number of lines per file.
+        extensions (Optional[Iterable[str]]): Extensions to use; defaults to
+            every extension in ``EXT_TO_LANG``.
+
+    Returns:
+        Dict[str, int]: Number of files written per language.
+    """
+    selected = sorted(extensions or EXT_TO_LANG)
+    sources = {ext: generate_source(EXT_TO_LANG[ext], lines_per_file) for ext in selected}
+    counts: Dict[str, int] = {}
+    for i in range(files):
+        ext = selected[i % len(selected)]
+        directory = root / f"pkg{i // FILES_PER_DIRECTORY:05d}"
+        if i % FILES_PER_DIRECTORY == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{i:06d}{ext}").write_text(sources[ext], encoding="utf-8")
+        language = EXT_TO_LANG[ext]
+        counts[language] = counts.get(language, 0) + 1
+    return counts
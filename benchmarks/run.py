@@ -0,0 +1,207 @@
+"""Standalone benchmark runner for the agent-docstrings hot path.
+
+Generates a synthetic corpus for every supported extension and times the
+pipeline stages separately:
+
+* ``discovery``: walking the tree and applying the ignore rules
+* ``parse``: reading files, stripping old headers and running the parsers
+* ``format``: rendering the headers
+* ``write``: writing the processed content back to disk
+* ``process`` / ``rerun``: a full run on a fresh corpus and an idempotent rerun
+
+Results are written as JSON so runs on different commits can be compared.
+
+Usage:
+    python benchmarks/run.py --files 1000 10000 --lines 200 --output new.json
+    python benchmarks/run.py --files 1000 --compare baseline.json --threshold 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_docstrings import __version__, core  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+
+STAGES = ["discovery", "parse", "format", "write", "process", "rerun"]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_once(root: Path, files: int, lines: int, extensions: Optional[List[str]]) -> Dict[str, Any]:
+    """Generate a corpus in *root* and time every stage once."""
+    counts = generate_corpus(root, files, lines, extensions)
+    stages: Dict[str, float] = {}
+    languages: Dict[str, Dict[str, float]] = {
+        language: {"files": count, "parse": 0.0, "format": 0.0}
+        for language, count in counts.items()
+    }
+
+    start = time.perf_counter()
+    paths = core.discover_files([str(root)])
+    stages["discovery"] = time.perf_counter() - start
+
+    parsed = []
+    for path in paths:
+        language = core.EXT_TO_LANG[path.suffix.lower()]
+        start = time.perf_counter()
+        content = path.read_text(encoding="utf-8", errors="ignore")
+        header_end_line, _, _, cleaned_body = core._split_content(content, language)
+        classes, functions = core.LANG_PARSERS[language](cleaned_body.splitlines())
+        languages[language]["parse"] += time.perf_counter() - start
+        parsed.append((language, header_end_line, classes, functions))
+    stages["parse"] = sum(stats["parse"] for stats in languages.values())
+
+    for language, header_end_line, classes, functions in parsed:
+        start = time.perf_counter()
+        core._format_header(classes, functions, language, header_end_line)
+        languages[language]["format"] += time.perf_counter() - start
+    stages["format"] = sum(stats["format"] for stats in languages.values())
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        core.discover_and_process_files([str(root)])
+        stages["process"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        core.discover_and_process_files([str(root)])
+        stages["rerun"] = time.perf_counter() - start
+
+    contents = [(path, path.read_text(encoding="utf-8")) for path in paths]
+    start = time.perf_counter()
+    for path, content in contents:
+        path.write_text(content, encoding="utf-8")
+    stages["write"] = time.perf_counter() - start
+
+    return {"stages": stages, "languages": languages}
+
+
+def run(files: int, lines: int, repeat: int, extensions: Optional[List[str]]) -> Dict[str, Any]:
+    """Run the benchmark *repeat* times on fresh corpora and keep the best times."""
+    best: Optional[Dict[str, Any]] = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="agent-docstrings-bench-") as tmp:
+            result = run_once(Path(tmp), files, lines, extensions)
+        if best is None:
+            best = result
+            continue
+        for stage, seconds in result["stages"].items():
+            best["stages"][stage] = min(best["stages"][stage], seconds)
+        for language, stats in result["languages"].items():
+            for key in ("parse", "format"):
+                best["languages"][language][key] = min(
+                    best["languages"][language][key], stats[key]
+                )
+    assert best is not None
+    return {"files": files, "lines": lines, **best}
+
+
+def print_run(result: Dict[str, Any]) -> None:
+    print(f"\n{result['files']} files x {result['lines']} lines")
+    for stage in STAGES:
+        seconds = result["stages"][stage]
+        rate = result["files"] / seconds if seconds else float("inf")
+        print(f"  {stage:<10} {seconds:9.3f} s  {rate:12.0f} files/s")
+    print(f"  {'language':<12} {'files':>6} {'parse (s)':>10} {'format (s)':>11}")
+    for language, stats in sorted(result["languages"].items()):
+        print(
+            f"  {language:<12} {stats['files']:>6} {stats['parse']:>10.3f} {stats['format']:>11.3f}"
+        )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print stage ratios against *baseline* and return the number of regressions."""
+    previous = {(run["files"], run["lines"]): run for run in baseline.get("runs", [])}
+    regressions = 0
+    print(f"\nComparison with {baseline.get('commit') or 'baseline'} (threshold {threshold:.0%})")
+    for run in current["runs"]:
+        old = previous.get((run["files"], run["lines"]))
+        if old is None:
+            print(f"  {run['files']} x {run['lines']}: no baseline")
+            continue
+        for stage in STAGES:
+            new_seconds, old_seconds = run["stages"][stage], old["stages"].get(stage)
+            if not old_seconds:
+                continue
+            ratio = new_seconds / old_seconds
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(
+                f"  {run['files']} x {run['lines']} {stage:<10} "
+                f"{old_seconds:9.3f} -> {new_seconds:9.3f} s  ({ratio:5.2f}x){flag}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark agent-docstrings on synthetic corpora."
+    )
+    parser.add_argument(
+        "--files", type=int, nargs="+", default=[1000],
+        help="Corpus sizes in files (default: 1000).",
+    )
+    parser.add_argument(
+        "--lines", type=int, nargs="+", default=[200],
+        help="Lines per file (default: 200).",
+    )
+    parser.add_argument(
+        "--ext", nargs="+", default=None,
+        help="Restrict the corpus to these extensions (e.g. .py .go).",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per size; best time wins.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file to compare with.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Relative slowdown reported as a regression (default: 0.10).",
+    )
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "version": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": [],
+    }
+    for files in args.files:
+        for lines in args.lines:
+            result = run(files, lines, args.repeat, args.ext)
+            results["runs"].append(result)
+            print_run(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
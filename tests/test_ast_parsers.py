@@ -20,11 +20,20 @@ from __future__ import annotations
             - test_go_empty_functions() -> None (line 281)
     --- END AUTO-GENERATED DOCSTRING ---
 """
+import threading
+
 import pytest
 from textwrap import dedent
+from typing import Iterator
 
 from agent_docstrings.languages.python import parse_python_file
-from agent_docstrings.languages.go import parse_go_file
+from agent_docstrings.languages import go
+from agent_docstrings.languages.go import (
+    GoParserPool,
+    parse_go_file,
+    parse_go_sources,
+    prime_go_parser,
+)
 from agent_docstrings.languages.common import ClassInfo, SignatureInfo
 
 
@@ -156,6 +165,28 @@ class TestPythonASTParser:
         assert len(init_class.methods) == 1
         assert init_class.methods[0].signature == "get_value() -> int"
 
+    def test_only_module_and_class_level_definitions(self) -> None:
+        """Test that definitions inside functions or blocks are not listed."""
+        source = dedent("""
+            if True:
+                def conditional(): pass
+
+            def outer(self, x):
+                def inner(): pass
+                class Local: pass
+
+            class Outer:
+                def method(self, y):
+                    def helper(self): pass
+        """).strip()
+
+        classes, funcs = parse_python_file(source.splitlines())
+
+        assert funcs == [SignatureInfo(signature="outer(self, x)", line=4)]
+        assert [c.name for c in classes] == ["Outer"]
+        assert classes[0].methods == [SignatureInfo(signature="method(y)", line=9)]
+        assert classes[0].inner_classes == []
+
     def test_function_with_all_argument_types(self) -> None:
         """Test function with all types of arguments."""
         source = dedent("""
@@ -302,4 +333,100 @@ class TestGoASTParser:
         signatures = [f.signature for f in funcs]
         assert "func empty()" in signatures
         assert "func noParams() string" in signatures
-        assert "func noReturn(param int)" in signatures
\ No newline at end of file
+        assert "func noReturn(param int)" in signatures
+
+
+class TestGoParserPool:
+    @pytest.fixture
+    def pool(self) -> Iterator[GoParserPool]:
+        """Yields a fresh parser pool and stops its servers afterwards."""
+        pool = GoParserPool(size=2)
+        try:
+            yield pool
+        finally:
+            pool.close()
+
+    def test_server_is_reused_across_files(self, pool: GoParserPool) -> None:
+        """Test that consecutive requests are answered by the same process."""
+        first = pool.parse("package a\n\nfunc one() {}\n")
+        server = pool._all[0]
+        second = pool.parse("package b\n\nfunc two(x int) string {\n\treturn \"\"\n}\n")
+
+        assert [f["signature"] for f in first["functions"]] == ["func one()"]
+        assert [f["signature"] for f in second["functions"]] == ["func two(x int) string"]
+        assert pool._all == [server]
+
+    def test_syntax_error_keeps_server(self, pool: GoParserPool) -> None:
+        """Test that a parse error is reported without restarting the server."""
+        pool.parse("package a\n")
+        server = pool._all[0]
+
+        with pytest.raises(SyntaxError):
+            pool.parse("package a\nfunc broken(\n")
+
+        assert pool._all == [server]
+        assert server.alive()
+
+    def test_dead_server_is_restarted(self, pool: GoParserPool) -> None:
+        """Test that a killed server is replaced transparently."""
+        pool.parse("package a\n")
+        server = pool._all[0]
+        server.process.kill()
+        server.process.wait()
+
+        result = pool.parse("package a\n\nfunc again() {}\n")
+
+        assert [f["signature"] for f in result["functions"]] == ["func again()"]
+        assert pool._all and pool._all[0] is not server
+
+
+class TestGoBatchParsing:
+    def test_parse_go_sources_keeps_order(self) -> None:
+        """Test that batch results line up with the input sources."""
+        sources = [
+            f"package p\n\nfunc f{i}(x int) {{}}\n" for i in range(20)
+        ] + ["package p\nfunc broken(\n"]
+
+        results = parse_go_sources(sources)
+
+        for i in range(20):
+            classes, funcs = results[i]
+            assert funcs == [SignatureInfo(signature=f"func f{i}(x int)", line=3)]
+        assert results[20] is None
+
+    def test_primed_results_skip_the_parser(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that primed sources are answered without starting a parser."""
+        lines_a = ["package a", "", "func a() {}"]
+        lines_b = ["package b", "", "type I interface {", "\tM() error", "}"]
+        prime_go_parser(["\n".join(lines_a), "\n".join(lines_b)])
+
+        def _fail(source_code: str) -> None:
+            raise AssertionError("parser should not be called")
+
+        monkeypatch.setattr(go._GO_PARSER_POOL, "parse", _fail)
+        monkeypatch.setattr(go.subprocess, "run", _fail)
+
+        assert parse_go_file(lines_a) == ([], [SignatureInfo(signature="func a()", line=3)])
+        classes, funcs = parse_go_file(lines_b)
+        assert classes[0].name == "I"
+        assert classes[0].methods == [SignatureInfo(signature="M() error", line=4)]
+
+    def test_primed_results_belong_to_their_thread(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a batch primed by another thread neither replaces nor answers this thread's."""
+        lines_a = ["package a", "", "func a() {}"]
+        lines_b = ["package b", "", "func b() {}"]
+        prime_go_parser(["\n".join(lines_a), "package a2\n"])
+        other = threading.Thread(target=prime_go_parser, args=(["\n".join(lines_b), "package b2\n"],))
+        other.start()
+        other.join()
+
+        def _fail(source_code: str) -> None:
+            raise AssertionError("parser should not be called")
+
+        monkeypatch.setattr(go._GO_PARSER_POOL, "parse", _fail)
+        monkeypatch.setattr(go.subprocess, "run", _fail)
+
+        assert parse_go_file(lines_a) == ([], [SignatureInfo(signature="func a()", line=3)])
+        with pytest.raises(AssertionError, match="parser should not be called"):
+            go._parse_with_go_ast("\n".join(lines_b))
+
@@ -0,0 +1,161 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _age(path: Path, seconds: int = 60) -> None (line 32)
+        - TestHeaderCache (line 38):
+            - test_record_and_is_fresh(tmp_path: Path) -> None (line 41)
+            - test_racy_entry_is_not_fresh(tmp_path: Path) -> None (line 57)
+            - test_load_discards_other_versions_and_options(tmp_path: Path) -> None (line 68)
+            - test_load_corrupt_file(tmp_path: Path) -> None (line 91)
+            - test_subset_and_merge(tmp_path: Path) -> None (line 97)
+        - TestProcessFileWithCache (line 113):
+            - test_cached_file_is_not_parsed(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None (line 116)
+            - test_modified_file_is_processed_again(tmp_path: Path) -> None (line 130)
+            - test_discover_writes_and_reuses_cache(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None (line 142)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the persistent header cache.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agent_docstrings import core
+from agent_docstrings.cache import HeaderCache, PARSER_VERSION, content_digest
+from agent_docstrings.core import discover_and_process_files, process_file
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Moves the mtime of *path* into the past so it predates the cache file."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+class TestHeaderCache:
+    """Tests for the HeaderCache class."""
+
+    def test_record_and_is_fresh(self, tmp_path: Path) -> None:
+        """A recorded file is fresh until it is modified."""
+        source = tmp_path / "a.py"
+        source.write_text("def a(): pass")
+        _age(source)
+        cache = HeaderCache(tmp_path / "cache")
+        cache.record(source, source.read_text())
+        cache.save()
+
+        loaded = HeaderCache.load(tmp_path / "cache")
+        assert loaded.is_fresh(source)
+
+        source.write_text("def a(): return 1")
+        assert not loaded.is_fresh(source)
+        assert not loaded.matches(source, source.read_text())
+
+    def test_racy_entry_is_not_fresh(self, tmp_path: Path) -> None:
+        """A file modified after the cache was written is not trusted by stat."""
+        source = tmp_path / "a.py"
+        source.write_text("def a(): pass")
+        cache = HeaderCache(tmp_path / "cache")
+        cache.record(source, source.read_text())
+        cache.saved_ns = os.stat(source).st_mtime_ns
+
+        assert not cache.is_fresh(source)
+        assert cache.matches(source, "def a(): pass")
+
+    def test_load_discards_other_versions_and_options(self, tmp_path: Path) -> None:
+        """A cache from another version, parser version or option set is ignored."""
+        cache_file = tmp_path / "cache"
+        entry = [1, 2, content_digest("x")]
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "version": "0.0.0",
+                    "parser_version": PARSER_VERSION,
+                    "options": {},
+                    "entries": {"/a.py": entry},
+                }
+            )
+        )
+        assert HeaderCache.load(cache_file).entries == {}
+
+        cache = HeaderCache(cache_file, {"beta": False})
+        cache.entries["/a.py"] = entry  # type: ignore[assignment]
+        cache.dirty = True
+        cache.save()
+        assert HeaderCache.load(cache_file, {"beta": False}).entries
+        assert HeaderCache.load(cache_file, {"beta": True}).entries == {}
+
+    def test_load_corrupt_file(self, tmp_path: Path) -> None:
+        """A corrupt cache file yields an empty cache instead of an error."""
+        cache_file = tmp_path / "cache"
+        cache_file.write_text("{not json")
+        assert HeaderCache.load(cache_file).entries == {}
+
+    def test_subset_and_merge(self, tmp_path: Path) -> None:
+        """Worker subsets only carry their own entries and merge back."""
+        first, second = tmp_path / "a.py", tmp_path / "b.py"
+        first.write_text("a")
+        second.write_text("b")
+        cache = HeaderCache(tmp_path / "cache")
+        cache.record(first, "a")
+
+        part = cache.subset([second])
+        assert part.entries == {}
+        part.record(second, "b")
+        cache.merge(part)
+
+        assert set(cache.entries) == {str(first), str(second)}
+
+
+class TestProcessFileWithCache:
+    """Tests for cache usage in process_file and discovery."""
+
+    def test_cached_file_is_not_parsed(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """A file recorded in the cache skips the parser on the next run."""
+        source = tmp_path / "a.py"
+        source.write_text("def a(): pass")
+        cache = HeaderCache(tmp_path / "cache")
+        process_file(source, cache=cache)
+        processed = source.read_text()
+
+        with patch.dict(core.LANG_PARSERS, {"python": lambda lines: 1 / 0}):
+            process_file(source, cache=cache)
+
+        assert "Error" not in capsys.readouterr().out
+        assert source.read_text() == processed
+
+    def test_modified_file_is_processed_again(self, tmp_path: Path) -> None:
+        """Editing a cached file invalidates its entry."""
+        source = tmp_path / "a.py"
+        source.write_text("def a(): pass")
+        cache = HeaderCache(tmp_path / "cache")
+        process_file(source, cache=cache)
+
+        source.write_text("def b(): pass")
+        process_file(source, cache=cache)
+
+        assert "b()" in source.read_text()
+
+    def test_discover_writes_and_reuses_cache(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """discover_and_process_files persists the cache between runs."""
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "a.py").write_text("def a(): pass")
+        (src / "b.py").write_text("def b(): pass")
+        cache_file = tmp_path / "cache.json"
+
+        discover_and_process_files([str(src)], cache_file=str(cache_file))
+        assert cache_file.exists()
+        assert len(json.loads(cache_file.read_text())["entries"]) == 2
+
+        with patch.dict(core.LANG_PARSERS, {"python": lambda lines: 1 / 0}):
+            discover_and_process_files([str(src)], cache_file=str(cache_file), jobs=2)
+
+        assert "Error" not in capsys.readouterr().out
+        assert "a()" in (src / "a.py").read_text()
+        assert "b()" in (src / "b.py").read_text()
\ No newline at end of file
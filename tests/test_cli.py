@@ -36,6 +36,9 @@ from __future__ import annotations
             - test_cli_with_current_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None (line 477)
     --- END AUTO-GENERATED DOCSTRING ---
 """
+import json
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -43,6 +46,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 import agent_docstrings.cli as cli
+from agent_docstrings.core import LANG_PARSERS, process_file
 
 
 class TestCLIBasicFunctionality:
@@ -270,7 +274,7 @@ class TestCLIIntegration:
         cli.main()
         
         # * Verify that the core function was called with correct arguments
-        mock_discover.assert_called_once_with([str(test_dir)], False, False)
+        mock_discover.assert_called_once_with([str(test_dir)], False, False, jobs=1, cache_file=None, profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
 
     @patch('agent_docstrings.core.discover_and_process_files')
     def test_cli_calls_core_function_verbose(self, mock_discover: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -283,7 +287,7 @@ class TestCLIIntegration:
         cli.main()
         
         # * Verify that verbose=True was passed
-        mock_discover.assert_called_once_with([str(test_dir)], True, False)
+        mock_discover.assert_called_once_with([str(test_dir)], True, False, jobs=1, cache_file=None, profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
 
     @patch('agent_docstrings.core.discover_and_process_files')
     def test_cli_calls_core_with_multiple_dirs(self, mock_discover: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -298,7 +302,75 @@ class TestCLIIntegration:
         cli.main()
         
         # * Verify that both directories were passed
-        mock_discover.assert_called_once_with([str(dir1), str(dir2)], False, False)
+        mock_discover.assert_called_once_with([str(dir1), str(dir2)], False, False, jobs=1, cache_file=None, profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
+
+    @patch('agent_docstrings.core.discover_and_process_files')
+    def test_cli_passes_jobs(self, mock_discover: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the --jobs option is forwarded to the core function."""
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "--jobs", "4", str(tmp_path)])
+
+        cli.main()
+
+        mock_discover.assert_called_once_with([str(tmp_path)], False, False, jobs=4, cache_file=None, profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
+
+    @patch('agent_docstrings.core.discover_and_process_files')
+    def test_cli_passes_cache_file(self, mock_discover: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that --cache uses the default cache file name unless one is given."""
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(tmp_path), "--cache"])
+        cli.main()
+        mock_discover.assert_called_with([str(tmp_path)], False, False, jobs=1, cache_file=".agent-docstrings-cache", profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
+
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "--cache", "custom.json", str(tmp_path)])
+        cli.main()
+        mock_discover.assert_called_with([str(tmp_path)], False, False, jobs=1, cache_file="custom.json", profiler=None, discovery="walk", changed_since=None, staged=False, check=False, diff=False, fingerprint=False, fsync=False, max_file_size=None, sniff=True)
+
+    def test_cli_profile_prints_report(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --profile prints the stage table and --profile-json writes JSON."""
+        (tmp_path / "a.py").write_text("def a(): pass")
+        report = tmp_path / "profile.json"
+        monkeypatch.setattr(
+            sys, "argv",
+            ["agent-docstrings", "--profile", "--profile-json", str(report), str(tmp_path / "a.py")],
+        )
+
+        cli.main()
+
+        out = capsys.readouterr().out
+        assert "Stage" in out and "parse" in out
+        data = json.loads(report.read_text())
+        assert data["languages"]["python"]["files"] == 1
+        assert data["slowest_files"][0]["path"].endswith("a.py")
+
+    @patch('agent_docstrings.core.discover_and_process_files')
+    def test_cli_passes_changed_files_options(self, mock_discover: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that --changed-since and --staged are forwarded to the core function."""
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "--changed-since", "origin/main", str(tmp_path)])
+        cli.main()
+        assert mock_discover.call_args.kwargs["changed_since"] == "origin/main"
+
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "--staged", str(tmp_path)])
+        cli.main()
+        assert mock_discover.call_args.kwargs["staged"] is True
+
+    def test_cli_reports_git_errors(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --staged outside a git work tree exits with an error."""
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "--staged", str(tmp_path)])
+
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+
+        assert exc_info.value.code == 1
+        assert "git work tree" in capsys.readouterr().err
+
+    def test_cli_rejects_negative_jobs(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that a negative --jobs value is rejected."""
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", "-j", "-2", str(tmp_path)])
+
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+
+        assert exc_info.value.code == 1
+        assert "--jobs" in capsys.readouterr().err
 
     def test_full_integration_workflow(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
         """Test complete workflow from CLI to file processing."""
@@ -489,4 +561,120 @@ class TestCLIEdgeCases:
             cli.main()
             
         finally:
-            os.chdir(original_cwd)
\ No newline at end of file
+            os.chdir(original_cwd)
+
+
+class TestCheckMode:
+    """Tests for --check and --diff."""
+
+    def test_check_reports_stale_files_without_writing(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Stale files are listed, nothing is written and the exit code is 1."""
+        stale = tmp_path / "stale.py"
+        stale.write_text("def a(): pass\n")
+        cache_file = tmp_path / "cache.json"
+        monkeypatch.setattr(
+            sys, "argv", ["agent-docstrings", str(tmp_path), "--check", "--jobs", "2", "--cache", str(cache_file)]
+        )
+        with patch.object(Path, "write_text", side_effect=AssertionError("file written")):
+            with pytest.raises(SystemExit) as exc_info:
+                cli.main()
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert f"Would update Python: {stale.resolve()}" in captured.out
+        assert "1 file(s) would be updated." in captured.err
+        assert stale.read_text() == "def a(): pass\n"
+        assert not cache_file.exists()
+
+    def test_check_passes_when_current(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Up-to-date files pass the check."""
+        (tmp_path / "a.py").write_text("def a(): pass\n")
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(tmp_path)])
+        cli.main()
+        capsys.readouterr()
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(tmp_path), "--check"])
+        cli.main()
+        assert capsys.readouterr().out == "Done.\n"
+
+    def test_diff_prints_applicable_patch(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """--diff prints only a unified diff that produces the processed file."""
+        target = tmp_path / "src" / "a.py"
+        target.parent.mkdir()
+        target.write_text("def a(): pass")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(target), "--diff"])
+        with pytest.raises(SystemExit):
+            cli.main()
+        patch_text = capsys.readouterr().out
+        assert patch_text.startswith("--- a/src/a.py\n+++ b/src/a.py\n")
+        assert "\\ No newline at end of file" in patch_text
+        assert target.read_text() == "def a(): pass"
+
+        patch_file = tmp_path / "header.patch"
+        patch_file.write_text(patch_text)
+        git = shutil.which("git")
+        if git is None:
+            pytest.skip("git is not installed")
+        subprocess.run([git, "apply", "--check", str(patch_file)], cwd=tmp_path, check=True)
+        subprocess.run([git, "apply", str(patch_file)], cwd=tmp_path, check=True)
+        processed = tmp_path / "expected.py"
+        processed.write_text("def a(): pass")
+        process_file(processed)
+        assert target.read_text() == processed.read_text()
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_diff_keeps_messages_off_stdout(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture, jobs: str
+    ) -> None:
+        """Errors, skipped files and verbose output go to stderr, so stdout is only the patch."""
+        (tmp_path / "a.py").write_text("def a(): pass\n")
+        (tmp_path / "b.js").write_text("function b() {}\n")
+        (tmp_path / "c.py").write_bytes(b"\x00binary\n")
+        (tmp_path / "d.py").write_text("x = 1\n")
+
+        def _fail(lines: object) -> None:
+            raise ValueError("unparsable")
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setitem(LANG_PARSERS, "javascript", _fail)
+        monkeypatch.setattr(
+            sys, "argv", ["agent-docstrings", ".", "--diff", "--verbose", "--profile", "--jobs", jobs]
+        )
+        with pytest.raises(SystemExit):
+            cli.main()
+        captured = capsys.readouterr()
+        assert captured.out.startswith("--- a/a.py\n+++ b/a.py\n")
+        assert all(line[:1] in ("-", "+", "@", " ") for line in captured.out.splitlines())
+        for message in ("Error processing", "Skipped 1 file(s)", "No changes for", "Stage"):
+            assert message in captured.err
+        assert ("Worker " in captured.err) == (jobs == "2")
+
+    @pytest.mark.parametrize("mode", ["--check", "--diff"])
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_failed_files_fail_the_check(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture, mode: str, jobs: str
+    ) -> None:
+        """Files that cannot be parsed make the check fail instead of passing it."""
+        (tmp_path / "a.py").write_text("def a(): pass\n")
+        (tmp_path / "b.py").write_text("def b(): pass\n")
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(tmp_path)])
+        cli.main()
+        capsys.readouterr()
+
+        def _fail(lines: object) -> None:
+            raise ValueError("unparsable")
+
+        monkeypatch.setitem(LANG_PARSERS, "python", _fail)
+        monkeypatch.setattr(sys, "argv", ["agent-docstrings", str(tmp_path), mode, "--jobs", jobs])
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main()
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert "Error processing" in captured.err
+        assert "Error processing" not in captured.out
+        assert "2 file(s) could not be processed." in captured.err
@@ -249,6 +249,18 @@ class FirstClass:
         assert "class SomeClass:" in result
         assert DOCSTRING_START_MARKER in result
 
+    def test_header_after_leading_comment_is_kept(self) -> None:
+        """A marker outside the opening comment does not strip the code before it."""
+        content = f"/* License */\nint a;\n/*\n * {DOCSTRING_START_MARKER}\n * {DOCSTRING_END_MARKER}\n */\nint b;\n"
+        assert remove_agent_docstring(content, "c") == content
+
+    def test_closing_after_end_marker(self) -> None:
+        """The first closing after the end marker ends the header, in either spacing."""
+        header = f"/**\n * {DOCSTRING_START_MARKER}\n * {DOCSTRING_END_MARKER}\n"
+        assert remove_agent_docstring(header + " */\n\nclass A {}\n", "java") == "class A {}\n"
+        assert remove_agent_docstring(header + "*/\nclass A {}\n", "java") == "class A {}\n"
+        assert remove_agent_docstring(header + "class A {}\n", "java") == header + "class A {}\n"
+
     @pytest.mark.parametrize("language", ["python", "kotlin", "javascript", "typescript", "csharp", "cpp"])
     def test_invalid_language_patterns(self, language: str) -> None:
         invalid_contents = [
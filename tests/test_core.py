@@ -52,17 +52,27 @@ import os
 import tempfile
 from pathlib import Path
 from textwrap import dedent
+from typing import Dict
 from unittest.mock import patch, mock_open
 
 import pytest
 
 from agent_docstrings import __version__
+from agent_docstrings.languages import go
 from agent_docstrings.core import (
     EXT_TO_LANG,
+    FINGERPRINT_LABEL,
     LANG_PARSERS,
     _format_header,
+    _header_line_count,
+    _Lines,
+    _render_toc,
     process_file,
     discover_and_process_files,
+    language_for,
+    locate_header,
+    render,
+    render_batch,
 )
 from agent_docstrings.languages.common import (
     ClassInfo,
@@ -241,6 +251,39 @@ class TestHeaderFormatting:
         assert "  - Functions:" not in header
 
 
+class TestSinglePassHeader:
+    """Tests for rendering the header without counting its lines first."""
+
+    CLASSES = [
+        ClassInfo("Outer", 3, [SignatureInfo("run(self)", 4)], [
+            ClassInfo("Inner", 6, [SignatureInfo("a(self)", 7), SignatureInfo("b(self)", 9)], [
+                ClassInfo("Deepest", 11, [], []),
+            ]),
+        ]),
+    ]
+    FUNCTIONS = [SignatureInfo("helper()", 1), SignatureInfo("main()", 20)]
+
+    @pytest.mark.parametrize("language", sorted(LANG_PARSERS))
+    def test_line_count_matches_rendered_header(self, language: str) -> None:
+        """The analytic count equals the length of the rendered header."""
+        rendered = _format_header(self.CLASSES, self.FUNCTIONS, language, 0)
+        assert _header_line_count(self.CLASSES, self.FUNCTIONS, language) == len(rendered.splitlines())
+
+    def test_matches_two_pass_rendering(self) -> None:
+        """Line numbers equal those of rendering once to count and once to format."""
+        count = len(_format_header(self.CLASSES, self.FUNCTIONS, "java", 0).splitlines())
+        expected = _format_header(self.CLASSES, self.FUNCTIONS, "java", count + 2).split("\n")[1:-1]
+        assert _render_toc(self.CLASSES, self.FUNCTIONS, "java", lambda n: n + 2) == expected
+
+    def test_multiline_signature(self) -> None:
+        """Signatures spanning several lines are counted after rendering."""
+        functions = [SignatureInfo("f(a,\n  b)", 1)]
+        count = len(_format_header([], functions, "python", 0).splitlines())
+        assert _header_line_count([], functions, "python") == count - 1
+        lines = _render_toc([], functions, "python", lambda n: n)
+        assert f"(line {1 + count})" in "\n".join(lines)
+
+
 class TestProcessFile:
     """Tests for process_file function."""
 
@@ -487,6 +530,14 @@ class TestDiscoverAndProcessFiles:
         assert "Warning:" in captured.out
         assert "is not a valid path" in captured.out
 
+    def test_discover_invalid_directory_with_diff(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """With --diff the warning goes to stderr, leaving stdout to the patch."""
+        discover_and_process_files(["/this/path/does/not/exist"], diff=True)
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "is not a valid path" in captured.err
+
     def test_discover_mixed_valid_invalid_directories(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
         """Test handling mix of valid and invalid directories."""
         (tmp_path / "valid.py").write_text("def valid(): pass")
@@ -552,6 +603,251 @@ class TestDiscoverAndProcessFiles:
         assert (tmp_path / "readme.txt").read_text() == "No code here"
         assert (tmp_path / "config.json").read_text() == '{"key": "value"}'
 
+    def test_discover_parallel_matches_serial(self, tmp_path: Path) -> None:
+        """Test that a process pool produces the same output as a serial run."""
+        serial_dir = tmp_path / "serial"
+        parallel_dir = tmp_path / "parallel"
+        for directory in (serial_dir, parallel_dir):
+            directory.mkdir()
+            for i in range(12):
+                (directory / f"mod{i:02d}.py").write_text(
+                    f"class C{i}:\n    def m(self): pass\n\ndef f{i}(): pass\n"
+                )
+
+        discover_and_process_files([str(serial_dir)])
+        stats = discover_and_process_files([str(parallel_dir)], jobs=2)
+
+        for i in range(12):
+            name = f"mod{i:02d}.py"
+            assert (parallel_dir / name).read_text() == (serial_dir / name).read_text()
+        assert sum(s.files for s in stats.values()) == 12
+
+    def test_discover_parallel_verbose_output_is_ordered(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that verbose logs from worker processes keep the sorted file order."""
+        for i in range(10):
+            (tmp_path / f"file{i}.py").write_text(f"def func{i}(): pass")
+
+        discover_and_process_files([str(tmp_path)], verbose=True, jobs=3)
+
+        captured = capsys.readouterr()
+        logged = [line.rsplit("file", 1)[1] for line in captured.out.splitlines()]
+        assert logged == [f"{i}.py" for i in range(10)]
+
+    def test_discover_returns_serial_stats(self, tmp_path: Path) -> None:
+        """Test that a serial run reports a single worker."""
+        (tmp_path / "a.py").write_text("def a(): pass")
+        (tmp_path / "b.py").write_text("def b(): pass")
+
+        stats = discover_and_process_files([str(tmp_path)])
+
+        assert list(stats) == [os.getpid()]
+        assert stats[os.getpid()].files == 2
+
+    def test_discover_batches_go_files(self, tmp_path: Path) -> None:
+        """Test that Go files are parsed by one batched parser invocation."""
+        for i in range(5):
+            (tmp_path / f"f{i}.go").write_text(f"package p\n\nfunc F{i}() {{}}\n")
+
+        with patch("agent_docstrings.languages.go.parse_go_sources", wraps=go.parse_go_sources) as batch, \
+                patch.object(go._GO_PARSER_POOL, "parse", side_effect=AssertionError("not batched")):
+            discover_and_process_files([str(tmp_path)])
+
+        batch.assert_called_once()
+        assert len(batch.call_args.args[0]) == 5
+        for i in range(5):
+            assert f"func F{i}()" in (tmp_path / f"f{i}.go").read_text()
+
+
+class TestRender:
+    """Tests for the in-memory render API."""
+
+    def test_matches_process_file(self, sample_files_by_language: Dict[str, Path]) -> None:
+        """Rendering produces exactly what process_file writes to disk."""
+        for language, path in sample_files_by_language.items():
+            original = path.read_text()
+            process_file(path)
+            assert render(original, language).text == path.read_text(), language
+
+    def test_toc_and_idempotence(self) -> None:
+        """The toc lists the symbols and rendering the output changes nothing."""
+        text, toc = render("class A:\n    def run(self):\n        pass\n", "python")
+        assert "- A (line" in toc and "- run() (line" in toc
+        assert DOCSTRING_START_MARKER in toc and not toc.startswith('"""')
+        assert render(text, "python") == (text, toc)
+
+    def test_does_not_touch_disk(self) -> None:
+        """No file is read or written."""
+        with patch("builtins.open", side_effect=AssertionError("disk access")), \
+                patch.object(Path, "write_text", side_effect=AssertionError("disk access")):
+            assert render("def f():\n    pass\n", "python").toc
+
+    def test_empty_and_unsupported(self) -> None:
+        """Empty text is returned as-is and unknown languages are rejected."""
+        assert render("  \n", "python") == ("  \n", "")
+        with pytest.raises(ValueError):
+            render("x", "cobol")
+
+    def test_language_for(self) -> None:
+        """Languages are derived from file extensions."""
+        assert language_for("src/Main.JAVA") == "java"
+        assert language_for("a.h") == "cpp"
+        assert language_for("README") is None
+
+    def test_batch(self) -> None:
+        """Batches keep their order and leave unsupported files unchanged."""
+        items = [("b.js", "function b() {}"), ("notes.txt", "text"), ("a.py", "def a(): pass")]
+        results = render_batch(iter(items))
+        assert [name for name, _ in results] == ["b.js", "notes.txt", "a.py"]
+        assert results[1][1] == ("text", "")
+        assert results[0][1] == render("function b() {}", "javascript")
+        assert "- a() (line" in results[2][1].toc
+
+    def test_batch_primes_go_parser(self) -> None:
+        """Go sources in a batch are parsed by one parser invocation."""
+        items = [(f"f{i}.go", f"package p\n\nfunc F{i}() {{}}\n") for i in range(3)]
+        with patch.object(go, "prime_go_parser", wraps=go.prime_go_parser) as prime:
+            results = render_batch(items)
+        prime.assert_called_once()
+        assert len(prime.call_args.args[0]) == 3
+        assert all(f"F{i}()" in result.toc for i, (_, result) in enumerate(results))
+
+
+class TestFingerprint:
+    """Tests for the optional header fingerprint."""
+
+    SOURCE = "import os\n\n\nclass A:\n    def run(self):\n        pass\n"
+
+    def _parsers_fail(self):
+        failing = {language: _fail_parse for language in LANG_PARSERS}
+        return patch.dict(LANG_PARSERS, failing)
+
+    def test_unchanged_files_are_not_parsed(self, sample_files_by_language: Dict[str, Path]) -> None:
+        """A header with a matching fingerprint is returned without parsing."""
+        for language, path in sample_files_by_language.items():
+            text, toc = render(path.read_text(), language, fingerprint=True)
+            assert FINGERPRINT_LABEL in toc, language
+            with self._parsers_fail():
+                assert render(text, language, fingerprint=True) == (text, toc), language
+
+    def test_edit_invalidates_fingerprint(self) -> None:
+        """Changing the code outside the header forces a reparse."""
+        text, _ = render(self.SOURCE, "python", fingerprint=True)
+        edited = text + "\ndef added():\n    pass\n"
+        with self._parsers_fail(), pytest.raises(AssertionError):
+            render(edited, "python", fingerprint=True)
+        assert "- added() (line" in render(edited, "python", fingerprint=True).toc
+
+    def test_other_version_is_regenerated(self) -> None:
+        """Headers written by another version are never trusted."""
+        text, _ = render(self.SOURCE, "python", fingerprint=True)
+        old = text.replace(f"v{__version__}", "v0.0.1")
+        with self._parsers_fail(), pytest.raises(AssertionError):
+            render(old, "python", fingerprint=True)
+
+    def test_flag_off_drops_fingerprint(self) -> None:
+        """Without the flag the header is the regular one again."""
+        plain = render(self.SOURCE, "python").text
+        text = render(self.SOURCE, "python", fingerprint=True).text
+        assert FINGERPRINT_LABEL not in plain
+        assert len(text.splitlines()) == len(plain.splitlines()) + 1
+        assert render(text, "python").text == plain
+
+    def test_process_files_with_cache_options(self, tmp_path: Path) -> None:
+        """The flag is applied to discovered files and idempotent on disk."""
+        target = tmp_path / "a.py"
+        target.write_text(self.SOURCE)
+        discover_and_process_files([str(tmp_path)], fingerprint=True)
+        first = target.read_text()
+        assert FINGERPRINT_LABEL in first
+        with self._parsers_fail():
+            discover_and_process_files([str(tmp_path)], fingerprint=True)
+        assert target.read_text() == first
+
+    def test_go_prefetch_skips_current_files(self, tmp_path: Path) -> None:
+        """Go files with a current fingerprint are not sent to the Go parser."""
+        (tmp_path / "a.go").write_text("package p\n\nfunc A() {}\n")
+        discover_and_process_files([str(tmp_path)], fingerprint=True)
+        with patch.object(go, "prime_go_parser") as prime:
+            discover_and_process_files([str(tmp_path)], fingerprint=True)
+        prime.assert_called_once_with([])
+
+
+class TestHeaderLocator:
+    """Tests for locating the preserved prefix and the generated header."""
+
+    def test_regions(self) -> None:
+        """The prefix, the header and the code body are located by offset."""
+        text = render("#!/usr/bin/env python\nimport os\n\n\ndef f():\n    pass\n", "python").text
+        layout = locate_header(text, "python")
+        assert layout.has_header and layout.header_end_line == 1
+        assert text[:layout.prefix_end] == "#!/usr/bin/env python"
+        header = text[layout.body_start:layout.header_end]
+        assert header.startswith('"""') and DOCSTRING_END_MARKER in header
+        assert layout.cleaned_body(text).lstrip().startswith("import os")
+
+    @pytest.mark.parametrize("text", ["", "a", "a\nb", "a\n\nb\n"])
+    def test_lines_view(self, text: str) -> None:
+        """The lazy line view behaves like the list of split lines."""
+        lines = _Lines(text)
+        expected = text.split("\n")
+        assert len(lines) == len(expected) and list(lines) == expected
+        assert [lines[i] for i in range(len(expected))] == expected
+        assert lines[1:] == expected[1:] and lines[::-1] == expected[::-1]
+        with pytest.raises(IndexError):
+            lines[len(expected)]
+
+    def test_without_header(self) -> None:
+        """Files without a generated header have an empty header range."""
+        layout = locate_header("def f():\n    pass\n", "python")
+        assert not layout.has_header
+        assert layout.header_end == layout.body_start == 0
+
+    @pytest.mark.parametrize("docstring", [
+        '"""Module doc."""\n\n\n',
+        '"""\nModule doc.\n"""\n',
+        "#!/usr/bin/env python\n'''Module doc.'''\n",
+    ])
+    def test_merged_docstring(self, docstring: str) -> None:
+        """A header merged into the module docstring is idempotent and numbered correctly."""
+        text = render(docstring + "def f():\n    pass\n", "python").text
+        assert render(text, "python").text == text
+        assert text.count(DOCSTRING_START_MARKER) == 1 and "Module doc." in text
+        line = text.split("\n").index("def f():") + 1
+        assert f"- f() (line {line})" in text
+
+    def test_empty_docstring_is_not_merged(self) -> None:
+        """An empty module docstring gets a separate header, which is replaced on the next run."""
+        text = render('""""""\ndef f():\n    pass\n', "python").text
+        assert render(text, "python").text == text
+        assert text.count(DOCSTRING_START_MARKER) == 1 and '""""""' in text
+
+    @pytest.mark.parametrize("source,language,signature", [
+        ("\n\ndef f():\n    pass\n", "python", "def f():"),
+        ("#!/usr/bin/env python\n\n\ndef f():\n    pass\n", "python", "def f():"),
+        ("\n\nfunction f(a) {}\n", "javascript", "function f(a) {}"),
+        ("package a\n\n\nfun f(x: Int) {}\n", "kotlin", "fun f(x: Int) {}"),
+    ])
+    def test_line_numbers_after_dropped_blank_lines(self, source: str, language: str, signature: str) -> None:
+        """Listed line numbers count the blank lines dropped between the prefix and the code."""
+        text = render(source, language).text
+        line = text.split("\n").index(signature) + 1
+        assert f"(line {line})" in text
+
+    @pytest.mark.parametrize("source,language", [
+        ("import x from 'x';\n\nfunction f() {}\n", "javascript"),
+        ("/* c */\n// x\n\nclass A {}\n", "java"),
+        ("/**\n * doc\n */\nfunction f(a) {}\n", "javascript"),
+    ])
+    def test_header_after_preserved_lines(self, source: str, language: str) -> None:
+        """A header following preserved lines is replaced, not duplicated."""
+        text = render(source, language).text
+        assert render(text, language).text == text
+        assert text.count(DOCSTRING_START_MARKER) == 1
+
+
+def _fail_parse(lines):
+    raise AssertionError("parsed a file with a current fingerprint")
+
 
 class TestErrorHandling:
     """Tests for error handling in core functions."""
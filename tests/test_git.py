@@ -0,0 +1,187 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _git(repo: Path, *args: str) -> str (line 42)
+        - _relative(paths: List[Path], root: Path) -> List[str] (line 49)
+        - repo(tmp_path: Path) -> Path (line 54)
+        - TestReadIndex (line 72):
+            - test_matches_ls_files(repo: Path, version: str) -> None (line 76)
+            - test_skip_worktree_entries_are_left_out(repo: Path) -> None (line 82)
+            - test_missing_or_invalid_index(tmp_path: Path) -> None (line 87)
+        - TestGitDiscovery (line 94):
+            - test_lists_tracked_and_untracked_files(repo: Path) -> None (line 97)
+            - test_subdirectory_and_blacklist(repo: Path) -> None (line 108)
+            - test_falls_back_to_index_without_git(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None (line 119)
+            - test_falls_back_to_walk_outside_repository(tmp_path: Path) -> None (line 126)
+            - test_unknown_mode(tmp_path: Path) -> None (line 131)
+        - _commit(repo: Path, message: str) -> None (line 136)
+        - history(repo: Path) -> Path (line 141)
+        - TestChangedFiles (line 151):
+            - test_changed_since_includes_commits_worktree_and_untracked(history: Path) -> None (line 154)
+            - test_staged(history: Path) -> None (line 163)
+            - test_explicit_files_are_intersected(history: Path) -> None (line 171)
+            - test_errors(history: Path, tmp_path: Path) -> None (line 176)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for git-aware file discovery.
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from agent_docstrings import git
+from agent_docstrings.core import discover_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo: Path, *args: str) -> str:
+    """Runs a git command in *repo* and returns its output."""
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _relative(paths: List[Path], root: Path) -> List[str]:
+    return [p.relative_to(root.resolve()).as_posix() for p in paths]
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A repository with tracked, untracked and ignored files."""
+    root = tmp_path / "repo"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "out").mkdir()
+    (root / "build").mkdir()
+    _git(root, "init", "-q")
+    (root / ".gitignore").write_text("out/\n")
+    (root / "src" / "a.py").write_text("def a(): pass")
+    (root / "src" / "pkg" / "b.py").write_text("def b(): pass")
+    (root / "src" / "name with spaces.py").write_text("def c(): pass")
+    (root / "build" / "tracked.py").write_text("def d(): pass")
+    (root / "out" / "generated.py").write_text("def e(): pass")
+    _git(root, "add", ".")
+    (root / "src" / "untracked.py").write_text("def f(): pass")
+    return root
+
+
+class TestReadIndex:
+    """Tests for the direct index reader."""
+
+    @pytest.mark.parametrize("version", ["2", "3", "4"])
+    def test_matches_ls_files(self, repo: Path, version: str) -> None:
+        """Every supported index version lists the same files as git."""
+        _git(repo, "update-index", "--index-version", version)
+        expected = [name for name in _git(repo, "ls-files", "-z").split("\0") if name]
+        assert git.read_index(repo / ".git") == expected
+
+    def test_skip_worktree_entries_are_left_out(self, repo: Path) -> None:
+        """Entries that are not checked out are not listed."""
+        _git(repo, "update-index", "--skip-worktree", "src/a.py")
+        assert "src/a.py" not in git.read_index(repo / ".git")
+
+    def test_missing_or_invalid_index(self, tmp_path: Path) -> None:
+        """A missing or corrupt index yields None."""
+        assert git.read_index(tmp_path) is None
+        (tmp_path / "index").write_bytes(b"DIRC\x00\x00\x00\x09")
+        assert git.read_index(tmp_path) is None
+
+
+class TestGitDiscovery:
+    """Tests for discover_files with discovery='git'."""
+
+    def test_lists_tracked_and_untracked_files(self, repo: Path) -> None:
+        """Ignored and default-ignored directories are never listed."""
+        found = discover_files([str(repo)], discovery="git")
+        assert _relative(found, repo) == [
+            ".gitignore",
+            "src/a.py",
+            "src/name with spaces.py",
+            "src/pkg/b.py",
+            "src/untracked.py",
+        ]
+
+    def test_subdirectory_and_blacklist(self, repo: Path) -> None:
+        """Scanning a subdirectory applies its own blacklist."""
+        (repo / "src" / ".agent-docstrings-ignore").write_text("pkg/*\n")
+        found = discover_files([str(repo / "src")], discovery="git")
+        assert _relative(found, repo / "src") == [
+            ".agent-docstrings-ignore",
+            "a.py",
+            "name with spaces.py",
+            "untracked.py",
+        ]
+
+    def test_falls_back_to_index_without_git(self, repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without a git executable only the files in the index are listed."""
+        monkeypatch.setattr(git.shutil, "which", lambda name: None)
+        found = discover_files([str(repo / "src")], discovery="git")
+        assert "untracked.py" not in _relative(found, repo / "src")
+        assert "a.py" in _relative(found, repo / "src")
+
+    def test_falls_back_to_walk_outside_repository(self, tmp_path: Path) -> None:
+        """Directories outside a work tree are walked."""
+        (tmp_path / "a.py").write_text("def a(): pass")
+        assert _relative(discover_files([str(tmp_path)], discovery="git"), tmp_path) == ["a.py"]
+
+    def test_unknown_mode(self, tmp_path: Path) -> None:
+        """An unknown discovery mode is rejected."""
+        with pytest.raises(ValueError):
+            discover_files([str(tmp_path)], discovery="find")
+
+def _commit(repo: Path, message: str) -> None:
+    _git(repo, "-c", "user.name=Test", "-c", "user.email=test@example.com", "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def history(repo: Path) -> Path:
+    """A repository with a base commit and a feature branch on top of it."""
+    _commit(repo, "base")
+    _git(repo, "branch", "base")
+    (repo / "src" / "a.py").write_text("def a(): return 1")
+    _git(repo, "add", "src/a.py")
+    _commit(repo, "change a")
+    return repo
+
+
+class TestChangedFiles:
+    """Tests for --changed-since and --staged discovery."""
+
+    def test_changed_since_includes_commits_worktree_and_untracked(self, history: Path) -> None:
+        """Committed, uncommitted and untracked changes are listed; deletions are not."""
+        (history / "src" / "pkg" / "b.py").write_text("def b(): return 2")
+        (history / "src" / "name with spaces.py").unlink()
+
+        found = discover_files([str(history)], changed_since="base")
+
+        assert _relative(found, history) == ["src/a.py", "src/pkg/b.py", "src/untracked.py"]
+
+    def test_staged(self, history: Path) -> None:
+        """Only files with staged changes are listed."""
+        (history / "src" / "pkg" / "b.py").write_text("def b(): return 2")
+        (history / "src" / "name with spaces.py").write_text("def c(): return 3")
+        _git(history, "add", "src/pkg/b.py")
+
+        assert _relative(discover_files([str(history / "src")], staged=True), history / "src") == ["pkg/b.py"]
+
+    def test_explicit_files_are_intersected(self, history: Path) -> None:
+        """Files passed explicitly are kept only if they changed."""
+        paths = [str(history / "src" / "a.py"), str(history / "src" / "pkg" / "b.py")]
+        assert _relative(discover_files(paths, changed_since="base"), history) == ["src/a.py"]
+
+    def test_errors(self, history: Path, tmp_path: Path) -> None:
+        """Invalid revisions and paths outside a repository raise GitError."""
+        with pytest.raises(git.GitError):
+            discover_files([str(history)], changed_since="no-such-ref")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        with pytest.raises(git.GitError):
+            discover_files([str(outside)], staged=True)
+        with pytest.raises(ValueError):
+            discover_files([str(history)], changed_since="base", staged=True)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _reference_ignored(rel_path: str, is_dir: bool, patterns: Set[str]) -> bool (line 54)
+        - TestIgnoreRules (line 65):
+            - test_matches_fnmatch_loop(rel_path: str, is_dir: bool) -> None (line 69)
+            - test_compile_globs() -> None (line 74)
+            - test_whitelist_and_blacklist() -> None (line 82)
+            - test_legacy_functions_use_compiled_rules(tmp_path: Path) -> None (line 90)
+        - TestScanDirectory (line 101):
+            - test_prunes_ignored_directories(tmp_path: Path) -> None (line 104)
+            - test_does_not_follow_directory_symlinks(tmp_path: Path) -> None (line 122)
+        - TestGitignore (line 136):
+            - test_rule_matching(pattern: str, rel_path: str, is_dir: bool, expected: object) -> None (line 162)
+            - test_last_matching_rule_wins() -> None (line 166)
+            - test_nested_gitignore_is_scoped(tmp_path: Path) -> None (line 172)
+            - test_ancestor_gitignore_applies_to_subdirectory_scan(tmp_path: Path) -> None (line 192)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the compiled ignore rules.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import Set
+
+import pytest
+
+from agent_docstrings.core import discover_files, is_path_ignored, should_process_file
+from agent_docstrings.ignore import Gitignore, IgnoreRules, compile_globs
+
+PATTERNS = {"*.log", "build/", "docs/*.md", "secret?.py", "[abc]x.py", "vendor/", "*.min.js", "tmp"}
+PATHS = [
+    ("app.log", False),
+    ("src/app.log", False),
+    ("build", True),
+    ("build", False),
+    ("src/build", True),
+    ("docs/readme.md", False),
+    ("docs/sub/readme.md", False),
+    ("secret1.py", False),
+    ("secret10.py", False),
+    ("ax.py", False),
+    ("dx.py", False),
+    ("vendor", True),
+    ("lib/app.min.js", False),
+    ("tmp", True),
+    ("tmp", False),
+    ("src/main.py", False),
+]
+
+
+def _reference_ignored(rel_path: str, is_dir: bool, patterns: Set[str]) -> bool:
+    """The per-pattern fnmatch loop the compiled rules replace."""
+    for pattern in patterns:
+        if pattern.endswith("/") and is_dir:
+            if fnmatch.fnmatch(rel_path + "/", pattern):
+                return True
+        elif fnmatch.fnmatch(rel_path, pattern.rstrip("/")):
+            return True
+    return False
+
+
+class TestIgnoreRules:
+    """Tests for IgnoreRules and compile_globs."""
+
+    @pytest.mark.parametrize("rel_path,is_dir", PATHS)
+    def test_matches_fnmatch_loop(self, rel_path: str, is_dir: bool) -> None:
+        """The combined regex agrees with matching every pattern separately."""
+        rules = IgnoreRules(PATTERNS)
+        assert rules.is_ignored(rel_path, is_dir) == _reference_ignored(rel_path, is_dir, PATTERNS)
+
+    def test_compile_globs(self) -> None:
+        """A compiled pattern set matches if any of its patterns matches."""
+        match = compile_globs(["*.py", "src/*"])
+        assert match("a.py")
+        assert match("src/a.js")
+        assert not match("a.js")
+        assert not compile_globs([])("anything")
+
+    def test_whitelist_and_blacklist(self) -> None:
+        """Whitelist restricts, blacklist and gitignore exclude."""
+        rules = IgnoreRules({"*.log"}, blacklist={"tests/*"}, whitelist={"*.py", "*.log"})
+        assert rules.should_process("src/main.py")
+        assert not rules.should_process("tests/test_main.py")
+        assert not rules.should_process("src/main.js")
+        assert not rules.should_process("app.log")
+
+    def test_legacy_functions_use_compiled_rules(self, tmp_path: Path) -> None:
+        """is_path_ignored and should_process_file keep their behaviour."""
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build.py").write_text("")
+        assert is_path_ignored(tmp_path / "build", {"build/"}, tmp_path)
+        assert not is_path_ignored(tmp_path / "build.py", {"build/"}, tmp_path)
+        assert not is_path_ignored(Path("/elsewhere/a.py"), {"*.py"}, tmp_path)
+        assert should_process_file(tmp_path / "build.py", tmp_path, set(), set(), {"*.py"})
+        assert not should_process_file(tmp_path / "build.py", tmp_path, set(), {"build*"}, set())
+
+
+class TestScanDirectory:
+    """Tests for the scandir-based discovery walk."""
+
+    def test_prunes_ignored_directories(self, tmp_path: Path) -> None:
+        """Ignored and default-ignored directories are not descended into."""
+        (tmp_path / ".gitignore").write_text("generated/\n*.tmp.py\n")
+        for directory in ("src/pkg", "generated", "node_modules"):
+            (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "a.py").write_text("")
+        (tmp_path / "src" / "b.tmp.py").write_text("")
+        (tmp_path / "generated" / "c.py").write_text("")
+        (tmp_path / "node_modules" / "d.js").write_text("")
+
+        found = discover_files([str(tmp_path)])
+
+        assert [p.relative_to(tmp_path.resolve()).as_posix() for p in found] == [
+            ".gitignore",
+            "src/pkg/a.py",
+        ]
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks not supported")
+    def test_does_not_follow_directory_symlinks(self, tmp_path: Path) -> None:
+        """Symbolic links to directories are skipped, as with os.walk."""
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "a.py").write_text("")
+        root = tmp_path / "root"
+        root.mkdir()
+        try:
+            os.symlink(target, root / "link", target_is_directory=True)
+        except OSError:
+            pytest.skip("cannot create symlinks")
+
+        assert discover_files([str(root)]) == []
+
+class TestGitignore:
+    """Tests for gitignore semantics."""
+
+    @pytest.mark.parametrize(
+        "pattern,rel_path,is_dir,expected",
+        [
+            ("*.log", "a/b/c.log", False, True),
+            ("/build/", "build", True, True),
+            ("/build/", "src/build", True, None),
+            ("build/", "src/build", True, True),
+            ("build/", "build", False, None),
+            ("docs/*.md", "docs/a.md", False, True),
+            ("docs/*.md", "docs/sub/a.md", False, None),
+            ("docs/*.md", "src/docs/a.md", False, None),
+            ("**/gen", "a/b/gen", True, True),
+            ("a/**/b", "a/b", False, True),
+            ("a/**/b", "a/x/y/b", False, True),
+            ("a/**", "a/x/y", False, True),
+            ("a/**", "a", True, None),
+            ("[!a]x.py", "bx.py", False, True),
+            ("[!a]x.py", "ax.py", False, None),
+            ("\\#file", "#file", False, True),
+            ("# comment", "# comment", False, None),
+            ("!keep.log", "keep.log", False, False),
+        ],
+    )
+    def test_rule_matching(self, pattern: str, rel_path: str, is_dir: bool, expected: object) -> None:
+        """Single rules follow git's anchoring, ``**`` and negation rules."""
+        assert Gitignore([pattern]).match(rel_path, is_dir) is expected
+
+    def test_last_matching_rule_wins(self) -> None:
+        """A later rule overrides an earlier one in the same file."""
+        gitignore = Gitignore(["*.log", "!keep.log", "keep.log"])
+        assert gitignore.match("keep.log") is True
+        assert Gitignore(["*.log", "!keep.log"]).match("keep.log") is False
+
+    def test_nested_gitignore_is_scoped(self, tmp_path: Path) -> None:
+        """Nested .gitignore files apply to their subtree and can negate."""
+        (tmp_path / ".gitignore").write_text("*.gen.py\nvendor/\n")
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / ".gitignore").write_text("!keep.gen.py\n/local.py\n")
+        (tmp_path / "b").mkdir()
+        for name in ("a/keep.gen.py", "a/x.gen.py", "a/local.py", "b/local.py", "b/keep.gen.py"):
+            (tmp_path / name).write_text("")
+        (tmp_path / "a" / "vendor").mkdir()
+        (tmp_path / "a" / "vendor" / "lib.py").write_text("")
+
+        found = discover_files([str(tmp_path)])
+
+        assert [p.relative_to(tmp_path.resolve()).as_posix() for p in found] == [
+            ".gitignore",
+            "a/.gitignore",
+            "a/keep.gen.py",
+            "b/local.py",
+        ]
+
+    def test_ancestor_gitignore_applies_to_subdirectory_scan(self, tmp_path: Path) -> None:
+        """Anchored rules of a parent .gitignore apply when scanning a subdirectory."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".gitignore").write_text("/src/generated/\n")
+        generated = tmp_path / "src" / "generated"
+        generated.mkdir(parents=True)
+        (generated / "a.py").write_text("")
+        (tmp_path / "src" / "b.py").write_text("")
+
+        found = discover_files([str(tmp_path / "src")])
+
+        assert [p.name for p in found] == ["b.py"]
\ No newline at end of file
@@ -1,29 +1,35 @@
 """
     --- AUTO-GENERATED DOCSTRING ---
-    Table of content is automatically generated by Agent Docstrings v1.3.0
+    Table of content is automatically generated by Agent Docstrings v1.3.2
     
     Classes/Functions:
-        - TestPythonParser (line 41):
-            - test_parse_python_file(source: str, expected_classes: list[ClassInfo], expected_funcs: list[SignatureInfo]) -> None (line 102)
-            - test_complex_python_structure() -> None (line 108)
-        - TestKotlinParser (line 140):
-            - test_basic_kotlin_parsing() -> None (line 143)
-            - test_kotlin_with_modifiers() -> None (line 165)
-        - TestGenericParser (line 184):
-            - test_empty_file(language: str) -> None (line 188)
-            - test_javascript_parsing() -> None (line 194)
-            - test_csharp_parsing() -> None (line 217)
-            - test_cpp_parsing() -> None (line 239)
-            - test_unsupported_language() -> None (line 258)
-        - TestErrorHandling (line 265):
-            - test_malformed_python_code() -> None (line 268)
-            - test_very_long_lines() -> None (line 281)
-        - TestMoreLanguages (line 291):
-            - test_c_parsing() (line 294)
-            - test_java_parsing() (line 315)
-            - test_go_parsing() (line 345)
-            - test_powershell_parsing() (line 368)
-            - test_delphi_parsing() (line 392)
+        - TestPythonParser (line 49):
+            - test_parse_python_file(source: str, expected_classes: list[ClassInfo], expected_funcs: list[SignatureInfo]) -> None (line 110)
+            - test_complex_python_structure() -> None (line 116)
+        - TestKotlinParser (line 148):
+            - test_basic_kotlin_parsing() -> None (line 151)
+            - test_kotlin_with_modifiers() -> None (line 173)
+        - TestGenericParser (line 192):
+            - test_empty_file(language: str) -> None (line 196)
+            - test_javascript_parsing() -> None (line 202)
+            - test_csharp_parsing() -> None (line 225)
+            - test_cpp_parsing() -> None (line 247)
+            - test_unsupported_language() -> None (line 266)
+        - TestErrorHandling (line 273):
+            - test_malformed_python_code() -> None (line 276)
+            - test_very_long_lines() -> None (line 289)
+        - TestMoreLanguages (line 299):
+            - test_c_parsing() (line 302)
+            - test_java_parsing() (line 323)
+            - test_go_parsing() (line 353)
+            - test_powershell_parsing() (line 376)
+            - test_delphi_parsing() (line 400)
+        - TestMultiLineSignatures (line 444):
+            - test_csharp_method() -> None (line 447)
+            - test_cpp_prototype() -> None (line 471)
+            - test_java_method() -> None (line 477)
+            - test_kotlin_class_and_function() -> None (line 493)
+            - test_delphi_routines() -> None (line 519)
     --- END AUTO-GENERATED DOCSTRING ---
 """
 from __future__ import annotations
@@ -35,6 +41,8 @@ import pytest
 from agent_docstrings.languages.python import parse_python_file
 from agent_docstrings.languages.kotlin import parse_kotlin_file
 from agent_docstrings.languages.generic import parse_generic_file
+from agent_docstrings.languages.java import parse_java_file
+from agent_docstrings.languages.delphi import parse_delphi_file
 from agent_docstrings.languages.common import ClassInfo, SignatureInfo
 
 
@@ -430,4 +438,99 @@ class TestMoreLanguages:
                 ],
                 inner_classes=[],
             )
-        ]
\ No newline at end of file
+        ]
+
+
+class TestMultiLineSignatures:
+    """Tests for signatures whose parameters span several lines."""
+
+    def test_csharp_method(self) -> None:
+        """A C# method with one parameter per line is reported on its first line."""
+        source = dedent("""
+            public class Repository
+            {
+                public Task<User> FindAsync(
+                    int id,   // primary key
+                    CancellationToken token)
+                {
+                    return null;
+                }
+            }
+        """).strip()
+        classes, funcs = parse_generic_file(source.splitlines(), "csharp")
+        assert funcs == []
+        assert classes == [
+            ClassInfo(
+                name="Repository",
+                line=1,
+                methods=[SignatureInfo(signature="public Task<User> FindAsync(int id, CancellationToken token)", line=3)],
+                inner_classes=[],
+            )
+        ]
+
+    def test_cpp_prototype(self) -> None:
+        """A C prototype split after a comma is joined into one signature."""
+        source = "int copy_buffer(char *dst, const char *src,\n                size_t size);"
+        _, funcs = parse_generic_file(source.splitlines(), "cpp")
+        assert funcs == [SignatureInfo(signature="int copy_buffer(char *dst, const char *src, size_t size);", line=1)]
+
+    def test_java_method(self) -> None:
+        """A Java method with wrapped parameters is attributed to its class."""
+        source = dedent("""
+            public class Mailer {
+                public void send(String to,
+                                 String body) throws IOException {
+                }
+                public void close() {}
+            }
+        """).strip()
+        classes, _ = parse_java_file(source.splitlines())
+        assert classes[0].methods == [
+            SignatureInfo(signature="public void send(String to, String body) throws IOException", line=2),
+            SignatureInfo(signature="public void close()", line=5),
+        ]
+
+    def test_kotlin_class_and_function(self) -> None:
+        """A Kotlin primary constructor and function spanning lines keep their scopes."""
+        source = dedent("""
+            class Account(
+                val id: Long,
+                val owner: String,
+            ) {
+                fun transfer(
+                    target: Account,
+                    amount: Long,
+                ): Boolean {
+                    return true
+                }
+            }
+        """).strip()
+        classes, funcs = parse_kotlin_file(source.splitlines())
+        assert funcs == []
+        assert classes == [
+            ClassInfo(
+                name="Account",
+                line=1,
+                methods=[SignatureInfo(signature="fun transfer(target: Account, amount: Long,): Boolean", line=5)],
+                inner_classes=[],
+            )
+        ]
+
+    def test_delphi_routines(self) -> None:
+        """Delphi routine headers are joined up to the closing parenthesis."""
+        source = dedent("""
+            type
+              TParser = class
+              public
+                function Parse(const AText: string;
+                  AStrict: Boolean): Integer;
+              end;
+
+            procedure Log(
+              const AMessage: string);
+        """).strip()
+        classes, funcs = parse_delphi_file(source.splitlines())
+        assert classes[0].methods == [
+            SignatureInfo(signature="function Parse(const AText: string; AStrict: Boolean): Integer;", line=4)
+        ]
+        assert funcs == [SignatureInfo(signature="procedure Log(const AMessage: string);", line=8)]
@@ -0,0 +1,114 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - TestProfiler (line 28):
+            - test_stage_accumulates_time_and_calls() -> None (line 31)
+            - test_null_stage_records_nothing() -> None (line 41)
+            - test_keeps_only_the_slowest_files() -> None (line 46)
+            - test_merge() -> None (line 55)
+            - test_report_formats() -> None (line 70)
+        - TestCoreInstrumentation (line 81):
+            - test_process_file_records_stages(tmp_path: Path) -> None (line 84)
+            - test_discovery_records_walk_and_ignore(tmp_path: Path) -> None (line 94)
+            - test_parallel_run_merges_worker_profiles(tmp_path: Path) -> None (line 103)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the per-stage profiler.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agent_docstrings.core import discover_and_process_files, discover_files, process_file
+from agent_docstrings.profiling import Profiler, stage
+
+
+class TestProfiler:
+    """Tests for the Profiler class."""
+
+    def test_stage_accumulates_time_and_calls(self) -> None:
+        """Every timed block adds to its stage."""
+        profiler = Profiler()
+        with profiler.stage("parse"):
+            pass
+        with stage(profiler, "parse"):
+            pass
+        assert profiler.calls["parse"] == 2
+        assert profiler.stages["parse"] >= 0.0
+
+    def test_null_stage_records_nothing(self) -> None:
+        """Without a profiler the stage helper is a no-op."""
+        with stage(None, "parse"):
+            pass
+
+    def test_keeps_only_the_slowest_files(self) -> None:
+        """Only the *top* slowest files are kept, slowest first."""
+        profiler = Profiler(top=2)
+        for i, seconds in enumerate([0.3, 0.1, 0.5, 0.2]):
+            profiler.record_file(f"f{i}.py", "python", seconds)
+        data = profiler.to_dict()
+        assert [entry["path"] for entry in data["slowest_files"]] == ["f2.py", "f0.py"]
+        assert data["languages"]["python"] == {"files": 4, "seconds": pytest.approx(1.1)}
+
+    def test_merge(self) -> None:
+        """Worker measurements are merged into the parent profiler."""
+        parent, worker = Profiler(top=2), Profiler(top=2)
+        parent.add("read", 1.0)
+        parent.record_file("a.py", "python", 0.1)
+        worker.add("read", 2.0, calls=3)
+        worker.record_file("b.go", "go", 0.4)
+        worker.record_file("c.go", "go", 0.2)
+        parent.merge(worker)
+
+        assert parent.stages["read"] == 3.0
+        assert parent.calls["read"] == 4
+        assert parent.languages["go"] == [2, pytest.approx(0.6)]
+        assert [entry[1] for entry in sorted(parent.slowest, reverse=True)] == ["b.go", "c.go"]
+
+    def test_report_formats(self) -> None:
+        """The report is available as a table and as JSON."""
+        profiler = Profiler()
+        profiler.add("walk", 0.5)
+        profiler.record_file("a.py", "python", 0.25)
+        profiler.stop()
+        table = profiler.format_table()
+        assert "walk" in table and "python" in table and "a.py" in table
+        assert json.loads(json.dumps(profiler.to_dict()))["stages"]["walk"]["calls"] == 1
+
+
+class TestCoreInstrumentation:
+    """Tests for the profiler hooks in core."""
+
+    def test_process_file_records_stages(self, tmp_path: Path) -> None:
+        """Processing a file records every stage it goes through."""
+        source = tmp_path / "a.py"
+        source.write_text("def a(): pass")
+        profiler = Profiler()
+        process_file(source, profiler=profiler)
+
+        assert {"read", "remove", "parse", "format", "write"} <= set(profiler.stages)
+        assert profiler.languages["python"][0] == 1
+
+    def test_discovery_records_walk_and_ignore(self, tmp_path: Path) -> None:
+        """Discovery splits its time into walking and ignore checks."""
+        (tmp_path / "a.py").write_text("def a(): pass")
+        profiler = Profiler()
+        discover_files([str(tmp_path)], profiler)
+
+        assert profiler.calls["walk"] == 1
+        assert profiler.calls["ignore"] >= 1
+
+    def test_parallel_run_merges_worker_profiles(self, tmp_path: Path) -> None:
+        """Files processed in worker processes are reported by the parent."""
+        for name in ("a.py", "b.js", "c.py"):
+            (tmp_path / name).write_text("function x() {}" if name.endswith(".js") else "def x(): pass")
+        profiler = Profiler()
+        discover_and_process_files([str(tmp_path)], jobs=2, profiler=profiler)
+
+        assert profiler.languages["python"][0] == 2
+        assert profiler.languages["javascript"][0] == 1
+        assert profiler.calls["parse"] >= 3
\ No newline at end of file
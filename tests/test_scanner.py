@@ -0,0 +1,162 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _braces(source: str, language: str) -> List[str] (line 38)
+        - TestScanLines (line 42):
+            - test_ignores_braces_in_comments_and_literals(language: str, source: str, expected: List[str]) -> None (line 59)
+            - test_code_keeps_columns_and_line_numbers() -> None (line 63)
+            - test_spans_continue_across_batches() -> None (line 71)
+            - test_unterminated_string_ends_at_the_line() -> None (line 77)
+        - _statements(source: str, language: str) -> List[tuple] (line 82)
+        - TestJoinStatements (line 86):
+            - test_joins_until_parentheses_balance() -> None (line 89)
+            - test_signature_drops_block_comments(language: str, source: str, expected: str) -> None (line 102)
+            - test_stops_at_a_callback_body() -> None (line 107)
+            - test_gives_up_on_unbalanced_parentheses() -> None (line 112)
+        - TestClassScopes (line 119):
+            - test_allman_braces_and_nested_classes() -> None (line 122)
+            - test_class_without_body_encloses_nothing() -> None (line 151)
+            - test_commented_out_code_is_ignored() -> None (line 158)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the lexical brace scanner shared by the C-style parsers.
+"""
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from agent_docstrings.languages.common import MAX_STATEMENT_LINES, ClassInfo, SignatureInfo
+from agent_docstrings.languages.generic import parse_generic_file
+from agent_docstrings.languages.java import parse_java_file
+from agent_docstrings.languages.kotlin import parse_kotlin_file
+from agent_docstrings.languages.scanner import SCAN_BATCH_LINES, join_statements, scan_lines, signature_of
+
+
+def _braces(source: str, language: str) -> List[str]:
+    return [scanned.braces for scanned in scan_lines(source.splitlines(), language)]
+
+
+class TestScanLines:
+    """Tests for the per-line code, braces and depth."""
+
+    @pytest.mark.parametrize(
+        "language, source, expected",
+        [
+            ("javascript", 'f("{", \'}\', `${a}`) {', ["{"]),
+            ("javascript", "x = 1; // }\n/* { */ y = {", ["{"]),
+            ("javascript", "a = /[}]\\/{/g; b = c / d / { e }", ["{}"]),
+            ("javascript", "return /}/.test(s) ? {} : x", ["{}"]),
+            ("typescript", "s = `line {\nstill ${\"}\"} string\n` + {}", ["{}"]),
+            ("cpp", 'auto s = R"x(")}\n{)x"; int n = 1\'000; {', ["{"]),
+            ("csharp", 'var p = @"C:\\{dir}\\" + @"say ""}""" + "}"; {', ["{"]),
+            ("java", 'String t = """\n  "{" \\""" }\n  """; {', ["{"]),
+            ("kotlin", "/* outer /* { */ } */ val s = \"\"\"\\\"{\"\"\" + '}' {", ["{"]),
+        ],
+    )
+    def test_ignores_braces_in_comments_and_literals(self, language: str, source: str, expected: List[str]) -> None:
+        """Braces inside comments, strings and regex literals are not counted."""
+        assert [braces for braces in _braces(source, language) if braces] == expected
+
+    def test_code_keeps_columns_and_line_numbers(self) -> None:
+        """Blanked code lines up with the source and blank lines are skipped."""
+        lines = ["int f(char *s) { // }", "", "  /* {", "  } */", '  return s == "}";', "}"]
+        scanned = list(scan_lines(lines, "c"))
+        assert [(s.number, s.braces, s.depth) for s in scanned] == [(1, "{", 0), (5, "", 1), (6, "}", 1)]
+        assert all(len(s.code) == len(s.line) for s in scanned)
+        assert scanned[0].code.rstrip() == "int f(char *s) {"
+
+    def test_spans_continue_across_batches(self) -> None:
+        """A comment opened at the end of a batch is closed in the next one."""
+        lines = ["int x;"] * (SCAN_BATCH_LINES - 1) + ["/* {", "} */ {", "}"]
+        scanned = [s for s in scan_lines(lines, "cpp") if s.braces]
+        assert [(s.number, s.braces) for s in scanned] == [(SCAN_BATCH_LINES + 1, "{"), (SCAN_BATCH_LINES + 2, "}")]
+
+    def test_unterminated_string_ends_at_the_line(self) -> None:
+        """An unclosed quote does not swallow the following lines."""
+        assert _braces("char c = '{;\nint f() {\n}", "c") == ["", "{", "}"]
+
+
+def _statements(source: str, language: str) -> List[tuple]:
+    return [(s.number, s.code.strip(), s.braces) for s in join_statements(scan_lines(source.splitlines(), language))]
+
+
+class TestJoinStatements:
+    """Tests for joining the lines of statements with open parentheses."""
+
+    def test_joins_until_parentheses_balance(self) -> None:
+        """Continuation lines are joined, without their comments, into the first."""
+        source = "int add(int a, // first\n        int b) {\n  return a + b;\n}"
+        assert _statements(source, "c") == [(1, "int add(int a, int b) {", "{"), (3, "return a + b;", ""), (4, "}", "}")]
+
+    @pytest.mark.parametrize(
+        "language, source, expected",
+        [
+            ("java", "public void foo(int a /* one */, // first\n    int b /* second */) {\n}", "public void foo(int a, int b)"),
+            ("cpp", "int f(/* none */\n      int b /* x */ = 0) {\n}", "int f(int b = 0)"),
+            ("javascript", "function f(a = \"/* keep */\", /* c */\n  b = '// x') {\n}", "function f(a = \"/* keep */\", b = '// x')"),
+        ],
+    )
+    def test_signature_drops_block_comments(self, language: str, source: str, expected: str) -> None:
+        """Comments inside a multi-line parameter list are left out of the signature, literals are not."""
+        (scanned, _) = join_statements(scan_lines(source.splitlines(), language))
+        assert signature_of(scanned) == expected
+
+    def test_stops_at_a_callback_body(self) -> None:
+        """A call whose argument opens a block does not swallow the block."""
+        source = 'describe("suite",\n  () => {\n    it("works", () => {});\n  });'
+        assert [number for number, _, _ in _statements(source, "javascript")] == [1, 3, 4]
+
+    def test_gives_up_on_unbalanced_parentheses(self) -> None:
+        """Lines after an unclosed parenthesis are passed on once, unjoined."""
+        lines = ["#define OPEN ("] + [f"int f{i}();" for i in range(MAX_STATEMENT_LINES + 5)]
+        numbers = [s.number for s in join_statements(scan_lines(lines, "cpp"))]
+        assert numbers == list(range(1, len(lines) + 1))
+
+
+class TestClassScopes:
+    """Tests for attributing methods to the classes that enclose them."""
+
+    def test_allman_braces_and_nested_classes(self) -> None:
+        """A class body opening on the next line still encloses its methods."""
+        source = "\n".join(
+            [
+                "public class Outer",
+                "{",
+                '    public string Name() { return "}"; }',
+                "    class Inner",
+                "    {",
+                "        public void Run() { }",
+                "    }",
+                "    public void Stop() { }",
+                "}",
+                "public class Other { }",
+            ]
+        )
+        classes, funcs = parse_generic_file(source.splitlines(), "csharp")
+        inner = ClassInfo("Inner", 4, [SignatureInfo("public void Run()", 6)], [])
+        assert classes == [
+            ClassInfo(
+                "Outer",
+                1,
+                [SignatureInfo("public string Name()", 3), SignatureInfo("public void Stop()", 8)],
+                [inner],
+            ),
+            ClassInfo("Other", 10, [], []),
+        ]
+        assert funcs == []
+
+    def test_class_without_body_encloses_nothing(self) -> None:
+        """A Kotlin data class without a body does not capture later functions."""
+        source = "data class Point(val x: Int, val y: Int)\n\nfun distance(a: Point, b: Point): Int {\n    return 0\n}"
+        classes, funcs = parse_kotlin_file(source.splitlines())
+        assert classes == [ClassInfo("Point", 1, [], [])]
+        assert funcs == [SignatureInfo("fun distance(a: Point, b: Point): Int", 3)]
+
+    def test_commented_out_code_is_ignored(self) -> None:
+        """Classes and methods inside block comments are not reported."""
+        source = "/*\nclass Old {\n  public void gone() {}\n}\n*/\nclass New {\n  public void kept() { } // trailing\n}"
+        classes, _ = parse_java_file(source.splitlines())
+        assert classes == [ClassInfo("New", 6, [SignatureInfo("public void kept()", 7)], [])]
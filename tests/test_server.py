@@ -0,0 +1,203 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - TestHandleRequest (line 46):
+            - test_ping() -> None (line 49)
+            - test_toc_renders_buffer_without_disk_access() -> None (line 54)
+            - test_toc_by_language() -> None (line 63)
+            - test_process(tmp_path: Path) -> None (line 70)
+            - test_invalid_requests(request_data: dict) -> None (line 90)
+        - socket_path() -> Iterator[Path] (line 97)
+        - running_server(socket_path: Path) -> Iterator[Path] (line 104)
+        - TestSocketServer (line 117):
+            - test_requests_over_one_connection(running_server: Path, tmp_path: Path) -> None (line 120)
+            - test_refuses_second_server(running_server: Path) -> None (line 132)
+            - test_replaces_stale_socket(socket_path: Path) -> None (line 137)
+            - test_does_not_replace_other_files(socket_path: Path) -> None (line 146)
+        - TestClientMain (line 154):
+            - test_uses_server(running_server: Path, tmp_path: Path, capsys: pytest.CaptureFixture) -> None (line 157)
+            - test_toc_from_stdin(running_server: Path, capsys: pytest.CaptureFixture) -> None (line 164)
+            - test_falls_back_without_server(socket_path: Path, tmp_path: Path) -> None (line 171)
+            - test_no_fallback(socket_path: Path, tmp_path: Path) -> None (line 178)
+        - test_default_socket_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None (line 185)
+        - test_cli_dispatches_serve_subcommand(tmp_path: Path) -> None (line 194)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the resident server and its client.
+"""
+from __future__ import annotations
+
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from agent_docstrings import cli, client, server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not supported")
+
+SOURCE = "def hello():\n    pass\n"
+
+
+class TestHandleRequest:
+    """Tests for the request dispatcher."""
+
+    def test_ping(self) -> None:
+        """The server reports its version."""
+        response = server.handle_request({"op": "ping"})
+        assert response["ok"] and response["version"]
+
+    def test_toc_renders_buffer_without_disk_access(self) -> None:
+        """The header is generated from the buffer alone."""
+        with patch.object(Path, "write_text") as write_text:
+            response = server.handle_request({"op": "toc", "text": SOURCE, "name": "a.py"})
+        write_text.assert_not_called()
+        assert response["ok"]
+        assert "- hello() (line" in response["toc"]
+        assert response["text"].startswith('"""') and response["text"].endswith(SOURCE)
+
+    def test_toc_by_language(self) -> None:
+        """The language can be given instead of a file name."""
+        response = server.handle_request(
+            {"op": "toc", "text": "class A {\n  void run() {}\n}\n", "language": "java"}
+        )
+        assert response["ok"] and "A" in response["toc"]
+
+    def test_process(self, tmp_path: Path) -> None:
+        """Paths are processed on disk and the printed output is returned."""
+        target = tmp_path / "a.py"
+        target.write_text(SOURCE)
+        response = server.handle_request({"op": "process", "paths": [str(tmp_path)], "verbose": True})
+        assert response["ok"]
+        assert "Processed Python" in response["output"]
+        assert "AUTO-GENERATED" in target.read_text()
+
+    @pytest.mark.parametrize(
+        "request_data",
+        [
+            {"op": "unknown"},
+            {"op": "process"},
+            {"op": "process", "paths": "src"},
+            {"op": "process", "paths": ["src"], "max_file_size": "4M"},
+            {"op": "process", "paths": ["/" + "a" * 5000]},
+            {"op": "toc", "text": SOURCE},
+            {"op": "toc", "text": SOURCE, "name": "a.unknown"},
+            {"op": "toc", "text": 1, "name": "a.py"},
+        ],
+    )
+    def test_invalid_requests(self, request_data: dict) -> None:
+        """Malformed requests are answered with an error."""
+        response = server.handle_request(request_data)
+        assert response["ok"] is False and response["error"]
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # * tmp_path can exceed the length limit of Unix socket paths
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory) / "s.sock"
+
+
+@pytest.fixture
+def running_server(socket_path: Path) -> Iterator[Path]:
+    """A server running in a thread; shut down through the socket afterwards."""
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve, args=(socket_path, ready), daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    yield socket_path
+    with client.Client(socket_path) as c:
+        c.request("shutdown")
+    thread.join(10)
+    assert not socket_path.exists()
+
+
+class TestSocketServer:
+    """End-to-end tests over a Unix domain socket."""
+
+    def test_requests_over_one_connection(self, running_server: Path, tmp_path: Path) -> None:
+        """A connection serves any number of requests."""
+        target = tmp_path / "a.py"
+        target.write_text(SOURCE)
+        with client.Client(running_server) as c:
+            assert c.request("ping")["ok"]
+            assert "- hello()" in c.toc(SOURCE, "a.py")["toc"]
+            c.process([str(tmp_path)])
+            with pytest.raises(client.ServerError):
+                c.request("unknown")
+        assert "AUTO-GENERATED" in target.read_text()
+
+    def test_refuses_second_server(self, running_server: Path) -> None:
+        """A socket with a live server is not taken over."""
+        with pytest.raises(OSError):
+            server.Server(running_server)
+
+    def test_replaces_stale_socket(self, socket_path: Path) -> None:
+        """A socket left behind by a dead server is replaced and removed on close."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(socket_path))
+        stale.close()
+        with server.Server(socket_path):
+            pass
+        assert not socket_path.exists()
+
+    def test_does_not_replace_other_files(self, socket_path: Path) -> None:
+        """A path that is not a socket is never deleted."""
+        socket_path.write_text("data")
+        with pytest.raises(OSError):
+            server.Server(socket_path)
+        assert socket_path.read_text() == "data"
+
+
+class TestClientMain:
+    """Tests for the agent-docstrings-client entry point."""
+
+    def test_uses_server(self, running_server: Path, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        """Paths are processed by the server and its output is printed."""
+        target = tmp_path / "a.py"
+        target.write_text(SOURCE)
+        client.main([str(target), "--verbose", "--socket", str(running_server)])
+        assert "Processed Python" in capsys.readouterr().out
+
+    def test_toc_from_stdin(self, running_server: Path, capsys: pytest.CaptureFixture) -> None:
+        """--toc prints the table of contents of stdin."""
+        with patch.object(sys, "stdin") as stdin:
+            stdin.read.return_value = SOURCE
+            client.main(["--toc", "a.py", "--socket", str(running_server)])
+        assert "- hello()" in capsys.readouterr().out
+
+    def test_falls_back_without_server(self, socket_path: Path, tmp_path: Path) -> None:
+        """Without a server the paths are processed in-process."""
+        target = tmp_path / "a.py"
+        target.write_text(SOURCE)
+        client.main([str(target), "--socket", str(socket_path)])
+        assert "AUTO-GENERATED" in target.read_text()
+
+    def test_no_fallback(self, socket_path: Path, tmp_path: Path) -> None:
+        """--no-fallback fails when no server is running."""
+        with pytest.raises(SystemExit) as exc_info:
+            client.main([str(tmp_path), "--socket", str(socket_path), "--no-fallback"])
+        assert exc_info.value.code == 2
+
+
+def test_default_socket_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """The environment selects the default socket."""
+    monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "x.sock"))
+    assert client.default_socket_path() == tmp_path / "x.sock"
+    monkeypatch.delenv(client.SOCKET_ENV)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert client.default_socket_path() == tmp_path / "agent-docstrings.sock"
+
+
+def test_cli_dispatches_serve_subcommand(tmp_path: Path) -> None:
+    """``agent-docstrings serve`` starts the server."""
+    argv = ["agent-docstrings", "serve", "--socket", str(tmp_path / "s.sock")]
+    with patch.object(sys, "argv", argv), patch.object(server, "serve") as mock_serve:
+        cli.main()
+    mock_serve.assert_called_once_with(tmp_path / "s.sock")
\ No newline at end of file
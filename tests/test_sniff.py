@@ -0,0 +1,121 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - TestSniffFile (line 34):
+            - test_accepts_source(tmp_path: Path) -> None (line 37)
+            - test_rejects_binary_and_minified(tmp_path: Path) -> None (line 43)
+            - test_rejects_large_files(tmp_path: Path) -> None (line 52)
+            - test_reads_only_the_sample(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None (line 59)
+            - test_unreadable_files_are_left_to_processing(tmp_path: Path) -> None (line 68)
+        - test_skips_are_reported(tmp_path: Path, capsys: pytest.CaptureFixture) -> None (line 73)
+        - test_fresh_files_are_not_opened(tmp_path: Path, capsys: pytest.CaptureFixture) -> None (line 92)
+        - test_parse_size(text: str, size: int) -> None (line 112)
+        - test_parse_size_rejects_garbage() -> None (line 117)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for skipping binary, minified and oversized files before processing.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agent_docstrings import cli, core
+
+SOURCE = "function f(a) {\n  return a;\n}\n"
+MINIFIED = "function f(a){return a}" * 400
+
+
+class TestSniffFile:
+    """Tests for the pre-read sniff of a single file."""
+
+    def test_accepts_source(self, tmp_path: Path) -> None:
+        """Ordinary source, also with one long line, is processed."""
+        path = tmp_path / "a.js"
+        path.write_text(SOURCE + "var data = '" + "x" * 2000 + "';\n" + SOURCE * 100)
+        assert core.sniff_file(path) is None
+
+    def test_rejects_binary_and_minified(self, tmp_path: Path) -> None:
+        """NUL bytes and long average lines are detected in the first bytes."""
+        path = tmp_path / "a.js"
+        path.write_bytes(SOURCE.encode() + b"\0")
+        assert core.sniff_file(path) == "binary content"
+        path.write_text(MINIFIED)
+        assert core.sniff_file(path) == "minified (long lines)"
+        assert core.sniff_file(path, content=False) is None
+
+    def test_rejects_large_files(self, tmp_path: Path) -> None:
+        """Files above the limit are rejected from their size alone."""
+        path = tmp_path / "a.js"
+        path.write_text(SOURCE)
+        assert core.sniff_file(path, max_file_size=len(SOURCE)) is None
+        assert core.sniff_file(path, max_file_size=10) == f"larger than 10 bytes ({len(SOURCE)} bytes)"
+
+    def test_reads_only_the_sample(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Only SNIFF_SIZE bytes are read, also where os.pread is missing."""
+        path = tmp_path / "a.js"
+        path.write_text(SOURCE * 1000 + "\0")
+        assert core.sniff_file(path) is None
+        path.write_text(SOURCE + "\0")
+        monkeypatch.delattr(core.os, "pread")
+        assert core.sniff_file(path) == "binary content"
+
+    def test_unreadable_files_are_left_to_processing(self, tmp_path: Path) -> None:
+        """Missing files are not rejected by the sniff."""
+        assert core.sniff_file(tmp_path / "missing.js") is None
+
+
+def test_skips_are_reported(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Skipped files are left untouched and listed after the run."""
+    (tmp_path / "a.js").write_text(SOURCE)
+    (tmp_path / "b.min.js").write_text(MINIFIED)
+    (tmp_path / "c.js").write_text(SOURCE * 1000)
+    core.discover_and_process_files([str(tmp_path)], max_file_size=16 * 1024)
+    assert "f(a)" in (tmp_path / "a.js").read_text()
+    assert (tmp_path / "b.min.js").read_text() == MINIFIED
+    assert (tmp_path / "c.js").read_text() == SOURCE * 1000
+    out = capsys.readouterr().out
+    assert "Skipped 2 file(s):" in out
+    assert f"  {tmp_path / 'b.min.js'}: minified (long lines)" in out
+    assert f"  {tmp_path / 'c.js'}: larger than 16384 bytes" in out
+
+    core.discover_and_process_files([str(tmp_path)], diff=True, max_file_size=16 * 1024, sniff=False)
+    captured = capsys.readouterr()
+    assert "b.min.js" in captured.out and "Skipped" in captured.err
+
+
+def test_fresh_files_are_not_opened(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Files fresh in the cache skip the content sniff but keep the size limit."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.js").write_text(SOURCE)
+    (src / "b.js").write_text(SOURCE * 100)
+    core.discover_and_process_files([str(src)])
+    for path in src.iterdir():
+        # * Predate the cache file, so that the files count as fresh
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 60 * 10**9))
+    cache_file = str(tmp_path / "cache.json")
+    core.discover_and_process_files([str(src)], cache_file=cache_file)
+    capsys.readouterr()
+    with patch.object(core.os, "pread", side_effect=AssertionError("file sniffed")):
+        core.discover_and_process_files([str(src)], cache_file=cache_file, max_file_size=2000)
+    assert "b.js: larger than" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text, size", [("2000", 2000), ("512k", 512 * 1024), ("4M", 4 * 1024 ** 2)])
+def test_parse_size(text: str, size: int) -> None:
+    """Sizes accept an optional K, M or G suffix."""
+    assert cli.parse_size(text) == size
+
+
+def test_parse_size_rejects_garbage() -> None:
+    """Anything else is an argparse error."""
+    for text in ("", "4MB", "-1", "1.5M"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            cli.parse_size(text)
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - TestMappedSource (line 38):
+            - test_head_ends_after_a_newline(tmp_path: Path) -> None (line 41)
+            - test_streams_equal_read_text(tmp_path: Path) -> None (line 52)
+        - _fail_read_text(*args: object, **kwargs: object) -> str (line 64)
+        - large_files() -> Iterator[None] (line 70)
+        - _process_in_memory(path: Path, **kwargs: object) -> str (line 76)
+        - TestLargeFiles (line 84):
+            - test_matches_in_memory_processing(sample_files_by_language: Dict[str, Path], tmp_path: Path) -> None (line 87)
+            - test_preserved_prefix_and_crlf(tmp_path: Path) -> None (line 101)
+            - test_manual_python_docstring_falls_back(tmp_path: Path) -> None (line 111)
+            - test_header_beyond_head_limit_falls_back(tmp_path: Path) -> None (line 122)
+            - test_check_does_not_write(tmp_path: Path, capsys: pytest.CaptureFixture) -> None (line 133)
+            - test_cache_and_fingerprint(tmp_path: Path) -> None (line 142)
+        - test_go_prefetch_skips_large_files(tmp_path: Path) -> None (line 159)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for processing large files from a memory-mapped view.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator
+from unittest.mock import patch
+
+import pytest
+
+from agent_docstrings import core, stream
+from agent_docstrings.cache import HeaderCache, content_digest
+
+MIXED = b"class A {\r\n  void run() {}\r\n}\x0c\nint f(int a) {\n  return a;\n}\xff\rtail"
+
+
+class TestMappedSource:
+    """Tests for the memory-mapped file view."""
+
+    def test_head_ends_after_a_newline(self, tmp_path: Path) -> None:
+        """The head holds complete lines and decodes CRLF like read_text."""
+        path = tmp_path / "a.java"
+        path.write_bytes(MIXED)
+        with stream.MappedSource(path) as source:
+            text, end = source.head(16)
+            assert (text, end) == ("class A {\n", 11)
+            assert source.head(1000) == (path.read_text(encoding="utf-8", errors="ignore"), len(MIXED))
+            assert source.find("int f") == MIXED.index(b"int f")
+            assert source.find("class", 1) == -1
+
+    def test_streams_equal_read_text(self, tmp_path: Path) -> None:
+        """Chunks join to the text and lines match str.splitlines()."""
+        path = tmp_path / "a.java"
+        path.write_bytes(MIXED)
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        with patch.object(stream, "CHUNK_SIZE", 7):
+            assert "".join(stream.read_chunks(path)) == text
+            assert "".join(stream.read_chunks(path, 11)) == text[10:]
+        assert list(stream.read_lines(path)) == text.splitlines()
+        assert content_digest(stream.read_chunks(path)) == content_digest(text)
+
+
+def _fail_read_text(*args: object, **kwargs: object) -> str:
+    # * pytest.fail() is not swallowed by the error handling of process_file()
+    pytest.fail("a large file was read whole")
+
+
+@pytest.fixture
+def large_files() -> Iterator[None]:
+    """Treat every file as large and start with a tiny head."""
+    with patch.object(core, "LARGE_FILE_SIZE", 1), patch.object(core, "HEAD_SIZE", 32):
+        yield
+
+
+def _process_in_memory(path: Path, **kwargs: object) -> str:
+    # * Still a large file, so it is parsed without a syntax tree like the streamed one
+    with patch.object(core, "_process_large_file", return_value=None):
+        core.process_file(path, **kwargs)
+    return path.read_text()
+
+
+@pytest.mark.usefixtures("large_files")
+class TestLargeFiles:
+    """Tests for the streaming path of process_file."""
+
+    def test_matches_in_memory_processing(
+        self, sample_files_by_language: Dict[str, Path], tmp_path: Path
+    ) -> None:
+        """New and regenerated headers equal those of the in-memory path."""
+        for language, path in sample_files_by_language.items():
+            copy = tmp_path / f"copy{path.suffix}"
+            copy.write_bytes(path.read_bytes())
+            for _ in range(2):
+                with patch.object(Path, "read_text", _fail_read_text):
+                    core.process_file(path)
+                assert path.read_text() == _process_in_memory(copy), language
+                path.write_text(path.read_text() + "\n")
+                copy.write_text(copy.read_text() + "\n")
+
+    def test_preserved_prefix_and_crlf(self, tmp_path: Path) -> None:
+        """Imports stay above the header and the body is decoded like read_text."""
+        source = b"package a;\r\nimport x.Y;\r\n\r\n" + b"class A {\r\n  void run() {}\r\n}\r\n" * 50
+        path, copy = tmp_path / "A.java", tmp_path / "B.java"
+        path.write_bytes(source)
+        copy.write_bytes(source)
+        core.process_file(path)
+        assert path.read_text() == _process_in_memory(copy)
+        assert path.read_text().startswith("package a;\nimport x.Y;\n/**")
+
+    def test_manual_python_docstring_falls_back(self, tmp_path: Path) -> None:
+        """Module docstrings are merged by the in-memory path."""
+        path, copy = tmp_path / "a.py", tmp_path / "b.py"
+        for p in (path, copy):
+            p.write_text('"""Manual."""\n\ndef f():\n    pass\n')
+        with patch.object(core, "_compose_content", wraps=core._compose_content) as compose:
+            core.process_file(path)
+        compose.assert_called_once()
+        assert path.read_text() == _process_in_memory(copy)
+        assert "Manual." in path.read_text()
+
+    def test_header_beyond_head_limit_falls_back(self, tmp_path: Path) -> None:
+        """A header that cannot be located near the start is handled in memory."""
+        path = tmp_path / "a.js"
+        path.write_text("\n" * 200 + "function f() {}\n")
+        with patch.object(core, "MAX_HEAD_SIZE", 64), patch.object(
+            Path, "read_text", wraps=path.read_text
+        ) as read_text:
+            core.process_file(path)
+        read_text.assert_called()
+        assert "f() (line" in path.read_text()
+
+    def test_check_does_not_write(self, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+        """Stale large files are reported without being replaced."""
+        path = tmp_path / "a.js"
+        path.write_text("function f() {}\n")
+        with patch.object(core, "write_atomic") as write_atomic:
+            assert core.process_file(path, check=True)
+        write_atomic.assert_not_called()
+        assert "Would update Javascript" in capsys.readouterr().out
+
+    def test_cache_and_fingerprint(self, tmp_path: Path) -> None:
+        """Cached and fingerprinted large files are not parsed again."""
+        path = tmp_path / "a.js"
+        path.write_text("function f() {}\n")
+        cache = HeaderCache(tmp_path / "cache")
+        core.process_file(path, cache=cache)
+        assert cache.matches(path, path.read_text())
+        failing = {"javascript": lambda lines: pytest.fail("parsed")}
+        os.utime(path, ns=(0, 0))
+        with patch.dict(core.LANG_PARSERS, failing):
+            assert core.process_file(path, cache=cache) is False
+
+        _process_in_memory(path, fingerprint=True)
+        with patch.dict(core.LANG_PARSERS, failing), patch.object(Path, "read_text", _fail_read_text):
+            assert core.process_file(path, fingerprint=True) is False
+
+
+def test_go_prefetch_skips_large_files(tmp_path: Path) -> None:
+    """Large Go files are not read whole by the batched Go parser."""
+    path = tmp_path / "a.go"
+    path.write_text("package p\n\nfunc A() {}\n")
+    with patch.object(core, "LARGE_FILE_SIZE", 1), patch.object(core.go, "prime_go_parser") as prime:
+        core._prefetch_go_files([path])
+    prime.assert_called_once_with([])
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _requires_grammar(language: str) -> None (line 42)
+        - TestEditRange (line 49):
+            - test_edit_range(old: bytes, new: bytes, expected: object) -> None (line 63)
+        - TestFallback (line 71):
+            - test_uses_fallback_without_grammar() -> None (line 74)
+            - test_missing_grammar_is_cached() -> None (line 81)
+            - test_large_files_are_parsed_without_trees(tmp_path: Path, diff: bool) -> None (line 91)
+            - test_large_text_is_measured_in_bytes() -> None (line 101)
+            - test_switching_backends_discards_cache(tmp_path: Path) -> None (line 109)
+            - test_registered_for_regex_languages() -> None (line 124)
+        - TestExtraction (line 130):
+            - test_cpp() -> None (line 133)
+            - test_java_annotations() -> None (line 156)
+            - test_typescript() -> None (line 166)
+            - test_kotlin() -> None (line 192)
+            - test_comments_match_fallback(language: str, source: List[str]) -> None (line 221)
+        - TestIncremental (line 228):
+            - test_parser_is_reused() -> None (line 231)
+            - test_incremental_matches_full_parse() -> None (line 236)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for the optional tree-sitter parser backend.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_docstrings import core
+from agent_docstrings.languages import treesitter
+from agent_docstrings.languages.common import ClassInfo, SignatureInfo
+from agent_docstrings.languages.treesitter import TreeSitterParser, edit_range
+
+
+def _requires_grammar(language: str) -> None:
+    pytest.importorskip("tree_sitter")
+    pytest.importorskip(treesitter.GRAMMARS[language].module)
+    if treesitter.load_language(language) is None:
+        pytest.skip(f"the {language} grammar does not match the installed tree_sitter")
+
+
+class TestEditRange:
+    """Tests for locating the change between two versions of a file."""
+
+    @pytest.mark.parametrize(
+        "old, new, expected",
+        [
+            (b"abc", b"abc", None),
+            (b"int f();", b"int fg();", (5, 5, 6)),
+            (b"a\nb\nc", b"a\nc", (2, 4, 2)),
+            (b"aaaa", b"aaaaaa", (4, 4, 6)),
+            (b"x", b"", (0, 1, 0)),
+            (b"prefix-old-suffix", b"prefix-new!-suffix", (7, 10, 11)),
+        ],
+    )
+    def test_edit_range(self, old: bytes, new: bytes, expected: object) -> None:
+        """The range covers exactly the bytes between the common prefix and suffix."""
+        assert edit_range(old, new) == expected
+        if expected is not None:
+            start, old_end, new_end = expected
+            assert old[:start] + new[start:new_end] + old[old_end:] == new
+
+
+class TestFallback:
+    """Tests for parsing without the tree-sitter grammars."""
+
+    def test_uses_fallback_without_grammar(self) -> None:
+        """The regex parser handles the file when no parser can be created."""
+        expected = ([], [SignatureInfo(signature="fallback", line=1)])
+        parser = TreeSitterParser("javascript", lambda lines: expected)
+        with patch.object(treesitter, "_parser", return_value=None):
+            assert parser(["function f() {}"]) is expected
+
+    def test_missing_grammar_is_cached(self) -> None:
+        """A grammar that cannot be imported is looked up only once."""
+        with patch.dict(treesitter._languages, clear=True), patch.object(
+            treesitter.importlib, "import_module", side_effect=ImportError
+        ) as import_module:
+            assert treesitter.load_language("kotlin") is None
+            assert treesitter.load_language("kotlin") is None
+        assert import_module.call_count <= 1
+
+    @pytest.mark.parametrize("diff", [False, True])
+    def test_large_files_are_parsed_without_trees(self, tmp_path: Path, diff: bool) -> None:
+        """Files of at least LARGE_FILE_SIZE bytes use the regex parser, streamed or in memory."""
+        path = tmp_path / "big.js"
+        path.write_text("function f(a) {\n  return a;\n}\n", encoding="utf-8")
+        with patch.object(core, "LARGE_FILE_SIZE", 1), patch.object(
+            treesitter, "_parser", return_value=object()
+        ), patch.object(treesitter, "_parse", side_effect=AssertionError("a syntax tree was built")):
+            assert core.process_file(path, diff=diff)
+            assert "function f(a)" in core.render("function f(a) {\n}\n", "javascript").toc
+
+    def test_large_text_is_measured_in_bytes(self) -> None:
+        """render() compares the UTF-8 size of the text with LARGE_FILE_SIZE, like the file paths."""
+        text = "// größe\nfunction f(a) {\n}\n"
+        with patch.object(core, "LARGE_FILE_SIZE", len(text.encode("utf-8"))), patch.object(
+            treesitter, "_parser", return_value=object()
+        ), patch.object(treesitter, "_parse", side_effect=AssertionError("a syntax tree was built")):
+            assert "function f(a)" in core.render(text, "javascript").toc
+
+    def test_switching_backends_discards_cache(self, tmp_path: Path) -> None:
+        """A cache written with the tree-sitter grammars is not used without them."""
+        _requires_grammar("java")
+        source = tmp_path / "A.java"
+        source.write_text("class A {\n  public void run() {}\n}\n", encoding="utf-8")
+        cache_file = tmp_path / "cache.json"
+        core.discover_and_process_files([str(source)], cache_file=str(cache_file))
+
+        fallback = MagicMock(return_value=([], []))
+        with patch.dict(core.LANG_PARSERS, {"java": TreeSitterParser("java", fallback)}), patch.object(
+            treesitter, "load_language", return_value=None
+        ), patch.object(treesitter, "_parser", return_value=None):
+            core.discover_and_process_files([str(source)], cache_file=str(cache_file))
+        fallback.assert_called_once()
+
+    def test_registered_for_regex_languages(self) -> None:
+        """The C-style languages are parsed through the tree-sitter backend."""
+        for language in ("javascript", "typescript", "csharp", "cpp", "c", "java", "kotlin"):
+            assert isinstance(core.LANG_PARSERS[language], TreeSitterParser)
+
+
+class TestExtraction:
+    """Tests for the classes and functions read from syntax trees."""
+
+    def test_cpp(self) -> None:
+        """Prototypes, definitions and methods are listed; forward declarations are not."""
+        _requires_grammar("cpp")
+        source = [
+            "class Forward;",
+            "namespace io {",
+            "class Reader {",
+            " public:",
+            "  int read(char *buf,",
+            "           int size) const;",
+            "};",
+            "}",
+            "int (*handler)(int);",
+            "#ifdef DEBUG",
+            'void trace(const char *msg) { puts("}"); }',
+            "#endif",
+        ]
+        classes, funcs = core.LANG_PARSERS["cpp"](source)
+        assert classes == [
+            ClassInfo(name="Reader", line=3, methods=[SignatureInfo("int read(char *buf, int size) const;", 5)], inner_classes=[])
+        ]
+        assert funcs == [SignatureInfo("void trace(const char *msg)", 11)]
+
+    def test_java_annotations(self) -> None:
+        """Annotations are left out of signatures and line numbers."""
+        _requires_grammar("java")
+        source = ["public class Service {", "  @Override", "  public String toString() {", '    return "{";', "  }", "}"]
+        classes, funcs = core.LANG_PARSERS["java"](source)
+        assert classes == [
+            ClassInfo(name="Service", line=1, methods=[SignatureInfo("public String toString()", 3)], inner_classes=[])
+        ]
+        assert funcs == []
+
+    def test_typescript(self) -> None:
+        """Exported declarations, arrow functions and immediately invoked wrappers are searched."""
+        _requires_grammar("typescript")
+        source = [
+            "export class Store<T> {",
+            "  get(key: string): T | undefined { return undefined; }",
+            "}",
+            "export const load = async (url: string): Promise<void> => {};",
+            "const double = (x: number) => x * 2;",
+            "(function () {",
+            "  function setup() {",
+            "    function nested() {}",
+            "  }",
+            "})();",
+            'describe("store", () => { function helper() {} });',
+        ]
+        classes, funcs = core.LANG_PARSERS["typescript"](source)
+        assert classes == [
+            ClassInfo(name="Store", line=1, methods=[SignatureInfo("get(key: string): T | undefined", 2)], inner_classes=[])
+        ]
+        assert funcs == [
+            SignatureInfo("export const load = async (url: string): Promise<void>", 4),
+            SignatureInfo("const double = (x: number)", 5),
+            SignatureInfo("function setup()", 7),
+        ]
+
+    def test_kotlin(self) -> None:
+        """Companion object functions belong to their class; interfaces are not classes."""
+        _requires_grammar("kotlin")
+        source = [
+            "class Account(val id: Long) {",
+            "    companion object {",
+            "        fun create(): Account = Account(0)",
+            "    }",
+            "}",
+            "",
+            "interface Named {",
+            "    fun name(): String",
+            "}",
+            "",
+            "fun main() {}",
+        ]
+        classes, funcs = core.LANG_PARSERS["kotlin"](source)
+        assert classes == [ClassInfo(name="Account", line=1, methods=[SignatureInfo("fun create(): Account", 3)], inner_classes=[])]
+        assert funcs == [SignatureInfo("fun main()", 11)]
+
+    @pytest.mark.parametrize(
+        "language, source",
+        [
+            ("java", ["class A {", "  public void foo(int a /* one */, // first", "      int b) {", "  }", "}"]),
+            ("cpp", ["int f(int a, /* x */", "      /* y */ int b = 0) {", "}"]),
+            ("javascript", ['function f(a = "/* keep */", // c', "  b = '// x') {", "}"]),
+            ("kotlin", ["fun f(a: Int /* x */, // y", "      b: Int) {", "}"]),
+        ],
+    )
+    def test_comments_match_fallback(self, language: str, source: List[str]) -> None:
+        """Comments inside a parameter list are left out of the signature as by the regex parser."""
+        _requires_grammar(language)
+        parser = core.LANG_PARSERS[language]
+        assert parser(source) == parser.fallback(source)
+
+
+class TestIncremental:
+    """Tests for reusing parsers and trees across parses."""
+
+    def test_parser_is_reused(self) -> None:
+        """Each thread creates one parser per language."""
+        _requires_grammar("csharp")
+        assert treesitter._parser("csharp") is treesitter._parser("csharp")
+
+    def test_incremental_matches_full_parse(self) -> None:
+        """Reparsing edited sources against the previous tree gives the full parse result."""
+        _requires_grammar("java")
+        parser = core.LANG_PARSERS["java"]
+        versions: List[List[str]] = [
+            ["class A {", "  public void run() {}", "}"],
+            ["class A {", "  public void run() {}", "  public int size() { return 0; }", "}"],
+            ["class A {", "  public int size() { return 0; }", "}", "class B {", "  public void stop() {}", "}"],
+            ["class A {", "  public int size() { return 0; }", "}", "class B {", "  public void stop() {}", "}"],
+        ]
+        with treesitter.incremental("A.java"):
+            results = [parser(lines) for lines in versions]
+        assert treesitter._local.documents["A.java"].source == "\n".join(versions[-1]).encode()
+        assert results == [parser(lines) for lines in versions]
+        assert [info.name for info in results[2][0]] == ["A", "B"]
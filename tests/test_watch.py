@@ -0,0 +1,285 @@
+"""
+    --- AUTO-GENERATED DOCSTRING ---
+    Table of content is automatically generated by Agent Docstrings v1.3.2
+    
+    Classes/Functions:
+        - _wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> bool (line 45)
+        - FakeWatcher (line 54):
+            - read(timeout: float) -> Optional[Set[Path]] (line 62)
+            - close() -> None (line 68)
+        - TestPathFilter (line 72):
+            - test_applies_discovery_rules(tmp_path: Path) -> None (line 75)
+            - test_nested_rules_are_scoped(tmp_path: Path) -> None (line 92)
+            - test_reload(tmp_path: Path) -> None (line 101)
+            - test_single_file_root(tmp_path: Path) -> None (line 109)
+        - TestCollectChanges (line 118):
+            - test_merges_burst(tmp_path: Path) -> None (line 121)
+            - test_overflow(tmp_path: Path) -> None (line 127)
+            - test_max_wait_bounds_delay(tmp_path: Path) -> None (line 132)
+        - _run_watch(tmp_path: Path, **kwargs: object) -> threading.Event (line 141)
+        - test_watch_regenerates_saved_files(tmp_path: Path, polling: bool) -> None (line 154)
+        - test_own_writes_are_not_reprocessed(tmp_path: Path) -> None (line 183)
+        - test_saved_files_are_parsed_incrementally(tmp_path: Path) -> None (line 213)
+        - test_oversized_saves_are_skipped(tmp_path: Path) -> None (line 240)
+        - test_cli_dispatches_watch_subcommand(tmp_path: Path) -> None (line 270)
+    --- END AUTO-GENERATED DOCSTRING ---
+Tests for watch mode.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+from unittest.mock import patch
+
+import pytest
+
+from agent_docstrings import cli, watch
+from agent_docstrings.languages import treesitter
+
+SOURCE = "def hello():\n    pass\n"
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class FakeWatcher:
+    """Returns queued batches of events, then nothing."""
+
+    backend = "fake"
+
+    def __init__(self, batches: List[Optional[Set[Path]]]) -> None:
+        self.batches = batches
+
+    def read(self, timeout: float) -> Optional[Set[Path]]:
+        if self.batches:
+            return self.batches.pop(0)
+        time.sleep(timeout)
+        return set()
+
+    def close(self) -> None:
+        pass
+
+
+class TestPathFilter:
+    """Tests for the ignore rules applied to events."""
+
+    def test_applies_discovery_rules(self, tmp_path: Path) -> None:
+        """Default ignored directories, gitignore and the blacklist are honoured."""
+        (tmp_path / ".gitignore").write_text("generated/\n")
+        (tmp_path / ".agent-docstrings-ignore").write_text("skip.py\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / ".gitignore").write_text("*.tmp.py\n")
+        path_filter = watch.PathFilter(tmp_path)
+
+        assert path_filter.accepts(tmp_path / "src" / "a.py")
+        assert path_filter.accepts(tmp_path / "src", True)
+        assert not path_filter.accepts(tmp_path / "src" / "a.tmp.py")
+        assert path_filter.accepts(tmp_path / "a.tmp.py")
+        assert not path_filter.accepts(tmp_path / "skip.py")
+        assert not path_filter.accepts(tmp_path / "generated" / "a.py")
+        assert not path_filter.accepts(tmp_path / "node_modules" / "a.js")
+        assert not path_filter.accepts(tmp_path.parent / "other.py")
+
+    def test_nested_rules_are_scoped(self, tmp_path: Path) -> None:
+        """A nested .gitignore applies only to its own subtree."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / ".gitignore").write_text("*.gen.py\n")
+        path_filter = watch.PathFilter(tmp_path)
+
+        assert not path_filter.accepts(tmp_path / "a" / "x.gen.py")
+        assert path_filter.accepts(tmp_path / "x.gen.py")
+
+    def test_reload(self, tmp_path: Path) -> None:
+        """Changed configuration files take effect after a reload."""
+        path_filter = watch.PathFilter(tmp_path)
+        assert path_filter.accepts(tmp_path / "a.py")
+        (tmp_path / ".gitignore").write_text("a.py\n")
+        path_filter.reload()
+        assert not path_filter.accepts(tmp_path / "a.py")
+
+    def test_single_file_root(self, tmp_path: Path) -> None:
+        """Watching a file accepts only that file."""
+        target = tmp_path / "a.py"
+        target.write_text(SOURCE)
+        path_filter = watch.PathFilter(target)
+        assert path_filter.accepts(target)
+        assert not path_filter.accepts(tmp_path / "b.py")
+
+
+class TestCollectChanges:
+    """Tests for the debouncing of event bursts."""
+
+    def test_merges_burst(self, tmp_path: Path) -> None:
+        """Events arriving within the debounce window form one batch."""
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        fake = FakeWatcher([{b}, {a}])
+        assert watch.collect_changes(fake, {a}, debounce=0.05) == {a, b}
+
+    def test_overflow(self, tmp_path: Path) -> None:
+        """Lost events are reported as None."""
+        fake = FakeWatcher([None])
+        assert watch.collect_changes(fake, {tmp_path / "a.py"}, debounce=0.05) is None
+
+    def test_max_wait_bounds_delay(self, tmp_path: Path) -> None:
+        """A continuous stream of events cannot postpone processing forever."""
+        a = tmp_path / "a.py"
+        fake = FakeWatcher([{a}] * 1000)
+        start = time.monotonic()
+        watch.collect_changes(fake, {a}, debounce=0.05, max_wait=0.1)
+        assert time.monotonic() - start < 1.0
+
+
+def _run_watch(tmp_path: Path, **kwargs: object) -> threading.Event:
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch.watch,
+        args=([str(tmp_path)],),
+        kwargs={"debounce": 0.02, "stop_event": stop, **kwargs},
+        daemon=True,
+    )
+    thread.start()
+    return stop
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_watch_regenerates_saved_files(tmp_path: Path, polling: bool) -> None:
+    """Saved files get their header regenerated; ignored files are left alone."""
+    if not polling:
+        try:
+            watch.InotifyWatcher([watch.PathFilter(tmp_path)]).close()
+        except (OSError, AttributeError):
+            pytest.skip("inotify is not available")
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    existing = tmp_path / "existing.py"
+    existing.write_text(SOURCE)
+    stop = _run_watch(tmp_path, polling=polling, interval=0.05)
+    try:
+        assert _wait_for(lambda: "AUTO-GENERATED" in existing.read_text())
+        time.sleep(0.2)
+
+        (tmp_path / "pkg").mkdir()
+        created = tmp_path / "pkg" / "created.py"
+        created.write_text(SOURCE)
+        ignored = tmp_path / "ignored.py"
+        ignored.write_text(SOURCE)
+        existing.write_text(SOURCE + "\ndef world():\n    pass\n")
+
+        assert _wait_for(lambda: "- world()" in existing.read_text())
+        assert _wait_for(lambda: "AUTO-GENERATED" in created.read_text())
+        assert ignored.read_text() == SOURCE
+    finally:
+        stop.set()
+
+
+def test_own_writes_are_not_reprocessed(tmp_path: Path) -> None:
+    """Files written by the watcher do not trigger another pass."""
+    target = tmp_path / "a.py"
+    target.write_text(SOURCE)
+    fake = FakeWatcher([{target}, {target}])
+    stop = threading.Event()
+    calls = []
+
+    def process(path: Path, verbose: bool, beta: bool) -> None:
+        calls.append(path)
+        if len(calls) == 1:
+            target.write_text("# processed\n" + SOURCE)
+
+    with patch.object(watch, "create_watcher", return_value=fake), patch.object(
+        watch.core, "process_file", side_effect=process
+    ):
+        thread = threading.Thread(
+            target=watch.watch,
+            args=([str(tmp_path)],),
+            kwargs={"debounce": 0.01, "initial": False, "stop_event": stop},
+        )
+        thread.start()
+        _wait_for(lambda: not fake.batches)
+        time.sleep(0.1)
+        stop.set()
+        thread.join(5)
+
+    assert calls == [target.resolve()]
+
+
+def test_saved_files_are_parsed_incrementally(tmp_path: Path) -> None:
+    """Each saved file is processed with tree-sitter reparsing keyed by its path."""
+    target = tmp_path / "A.java"
+    target.write_text("class A {}\n")
+    fake = FakeWatcher([{target}])
+    stop = threading.Event()
+    keys = []
+
+    def process(path: Path, verbose: bool, beta: bool) -> None:
+        keys.append(getattr(treesitter._local, "key", None))
+
+    with patch.object(watch, "create_watcher", return_value=fake), patch.object(
+        watch.core, "process_file", side_effect=process
+    ):
+        thread = threading.Thread(
+            target=watch.watch,
+            args=([str(tmp_path)],),
+            kwargs={"debounce": 0.01, "initial": False, "stop_event": stop},
+        )
+        thread.start()
+        _wait_for(lambda: keys)
+        stop.set()
+        thread.join(5)
+
+    assert keys == [str(target.resolve())]
+
+
+def test_oversized_saves_are_skipped(tmp_path: Path) -> None:
+    """Saved files above the size limit are not processed."""
+    small = tmp_path / "small.py"
+    small.write_text(SOURCE)
+    large = tmp_path / "large.py"
+    large.write_text(SOURCE * 100)
+    fake = FakeWatcher([{large, small}])
+    stop = threading.Event()
+    calls = []
+
+    def process(path: Path, verbose: bool, beta: bool) -> None:
+        calls.append(path)
+
+    with patch.object(watch, "create_watcher", return_value=fake), patch.object(
+        watch.core, "process_file", side_effect=process
+    ):
+        thread = threading.Thread(
+            target=watch.watch,
+            args=([str(tmp_path)],),
+            kwargs={"debounce": 0.01, "initial": False, "stop_event": stop, "max_file_size": len(SOURCE)},
+        )
+        thread.start()
+        _wait_for(lambda: calls)
+        time.sleep(0.1)
+        stop.set()
+        thread.join(5)
+
+    assert calls == [small.resolve()]
+
+
+def test_cli_dispatches_watch_subcommand(tmp_path: Path) -> None:
+    """``agent-docstrings watch`` runs the watcher with the parsed options."""
+    argv = ["agent-docstrings", "watch", str(tmp_path), "--poll", "--debounce", "100", "--max-file-size", "1M"]
+    with patch.object(sys, "argv", argv), patch.object(watch, "watch") as mock_watch:
+        cli.main()
+    mock_watch.assert_called_once_with(
+        [str(tmp_path)],
+        verbose=False,
+        beta=False,
+        debounce=0.1,
+        polling=True,
+        interval=watch.DEFAULT_POLL_INTERVAL,
+        initial=True,
+        max_file_size=1024 ** 2,
+        sniff=True,
+    )
\ No newline at end of file
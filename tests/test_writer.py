@@ -1,17 +1,37 @@
 """
     --- AUTO-GENERATED DOCSTRING ---
-    Table of content is automatically generated by Agent Docstrings v1.3.0
+    Table of content is automatically generated by Agent Docstrings v1.3.2
     
     Classes/Functions:
-        - test_process_file_inserts_header(source_processor) -> None (line 17)
+        - test_process_file_inserts_header(source_processor) -> None (line 34)
+        - TestWriteAtomic (line 50):
+            - test_keeps_mode_and_line_endings(tmp_path: Path) -> None (line 53)
+            - test_detect_newline(tmp_path: Path) -> None (line 63)
+            - test_failure_keeps_original(tmp_path: Path) -> None (line 70)
+            - test_symlink_is_kept(tmp_path: Path) -> None (line 84)
+        - TestFileWriter (line 95):
+            - test_writes_and_notifies(tmp_path: Path) -> None (line 98)
+            - test_fsync_is_batched(tmp_path: Path) -> None (line 112)
+            - test_failures_are_collected(tmp_path: Path) -> None (line 128)
+        - test_process_file_keeps_crlf(tmp_path: Path) -> None (line 141)
+        - test_write_failures_are_reported(tmp_path: Path, capsys: pytest.CaptureFixture) -> None (line 152)
     --- END AUTO-GENERATED DOCSTRING ---
+Tests for writing processed files.
 """
 from __future__ import annotations
 
+import errno
+import os
+import stat
 from pathlib import Path
 from textwrap import dedent
+from unittest.mock import patch
 
-from agent_docstrings.core import process_file
+import pytest
+
+from agent_docstrings import writer
+from agent_docstrings.core import discover_and_process_files, process_file
+from agent_docstrings.writer import FileWriter, detect_newline, write_atomic
 
 
 def test_process_file_inserts_header(source_processor) -> None:
@@ -27,4 +47,132 @@ def test_process_file_inserts_header(source_processor) -> None:
     new_content, _, _ = source_processor("greet.py", file_content)
 
     assert new_content.startswith('"""')  # * The generated docstring should be at the top.
-    assert "Greeter" in new_content
\ No newline at end of file
+    assert "Greeter" in new_content
+
+
+class TestWriteAtomic:
+    """Tests for replacing a file atomically."""
+
+    def test_keeps_mode_and_line_endings(self, tmp_path: Path) -> None:
+        """The new file keeps the permission bits and CRLF line endings."""
+        path = tmp_path / "run.py"
+        path.write_bytes(b"old\r\n")
+        path.chmod(0o751)
+        write_atomic(path, iter(["new\n", "content\n"]))
+        assert path.read_bytes() == b"new\r\ncontent\r\n"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o751
+        assert [p.name for p in tmp_path.iterdir()] == ["run.py"]
+
+    def test_fsync_read_only_file(self, tmp_path: Path) -> None:
+        """A read-only file can be replaced with fsync as without it."""
+        path = tmp_path / "frozen.py"
+        path.write_text("old\n")
+        path.chmod(0o444)
+        os_open = os.open
+
+        def _open(name: str, flags: int, *args: int) -> int:
+            # * Enforce the permission check that root bypasses
+            if flags & (os.O_WRONLY | os.O_RDWR) and os.path.exists(name) and not os.stat(name).st_mode & stat.S_IWUSR:
+                raise PermissionError(errno.EACCES, "Permission denied", name)
+            return os_open(name, flags, *args)
+
+        with patch.object(writer.os, "open", side_effect=_open):
+            write_atomic(path, "new\n", fsync=True)
+        assert path.read_text() == "new\n"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o444
+
+    def test_detect_newline(self, tmp_path: Path) -> None:
+        """The first line break decides the line ending."""
+        path = tmp_path / "a.txt"
+        for data, newline in ((b"a\r\nb\n", "\r\n"), (b"a\rb\n", "\r"), (b"a\nb\r\n", "\n"), (b"a", "\n")):
+            path.write_bytes(data)
+            assert detect_newline(path) == newline
+
+    def test_failure_keeps_original(self, tmp_path: Path) -> None:
+        """An interrupted write leaves the original file and no temporary file."""
+        path = tmp_path / "a.py"
+        path.write_text("old\n")
+
+        def interrupted():
+            yield "new\n"
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            write_atomic(path, interrupted())
+        assert path.read_text() == "old\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["a.py"]
+
+    def test_symlink_is_kept(self, tmp_path: Path) -> None:
+        """The target of a symbolic link is replaced, not the link."""
+        target = tmp_path / "a.py"
+        target.write_text("old\n")
+        link = tmp_path / "link.py"
+        link.symlink_to(target)
+        write_atomic(link, "new\n", fsync=True)
+        assert link.is_symlink()
+        assert target.read_text() == "new\n"
+
+
+class TestFileWriter:
+    """Tests for the background writer stage."""
+
+    def test_writes_and_notifies(self, tmp_path: Path) -> None:
+        """Queued files are written by close() and their callbacks run."""
+        written = []
+        paths = [tmp_path / f"{i}.py" for i in range(10)]
+        for path in paths:
+            path.write_text("old\n")
+        with FileWriter(queue_size=2) as file_writer:
+            for path in paths:
+                file_writer.submit(path, f"{path.name}\n", lambda path=path: written.append(path))
+        assert written == paths
+        assert all(path.read_text() == f"{path.name}\n" for path in paths)
+        with pytest.raises(RuntimeError):
+            file_writer.submit(paths[0], "")
+
+    def test_fsync_is_batched(self, tmp_path: Path) -> None:
+        """Each file is flushed once and the directory once per batch."""
+        paths = [tmp_path / f"{i}.py" for i in range(5)]
+        for path in paths:
+            path.write_text("old\n")
+        file_writer = FileWriter(fsync=True)
+        file_writer.close()
+        # * Queue every file before the writer loop runs, on this thread
+        for path in paths:
+            file_writer._queue.put((path, "new\n", None))
+        file_writer._queue.put(None)
+        with patch.object(writer.os, "fsync") as fsync:
+            file_writer._run()
+        assert fsync.call_count == len(paths) + 1
+        assert all(path.read_text() == "new\n" for path in paths)
+
+    def test_failures_are_collected(self, tmp_path: Path) -> None:
+        """A failed write is reported and does not stop the others."""
+        missing, path = tmp_path / "missing.py", tmp_path / "a.py"
+        path.write_text("old\n")
+        for fsync in (False, True):
+            with FileWriter(fsync) as file_writer:
+                file_writer.submit(missing, "new\n", lambda: pytest.fail("notified"))
+                file_writer.submit(path, "new\n")
+            assert [failure.path for failure in file_writer.failures] == [missing]
+            assert isinstance(file_writer.failures[0].error, OSError)
+            assert path.read_text() == "new\n"
+
+
+def test_process_file_keeps_crlf(tmp_path: Path) -> None:
+    """Files with CRLF line endings keep them after the header is inserted."""
+    path = tmp_path / "a.js"
+    path.write_bytes(b"function f() {\r\n  return 1;\r\n}\r\n")
+    with FileWriter() as file_writer:
+        assert process_file(path, writer=file_writer)
+    data = path.read_bytes()
+    assert b"f()" in data
+    assert data.count(b"\n") == data.count(b"\r\n")
+
+
+def test_write_failures_are_reported(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Files the fsync writer stage could not replace are reported after the run."""
+    (tmp_path / "a.js").write_text("function f() {}\n")
+    with patch.object(writer, "_stage", side_effect=OSError("disk full")):
+        discover_and_process_files([str(tmp_path)], fsync=True)
+    assert f"Error processing {tmp_path / 'a.js'}: disk full" in capsys.readouterr().out
\ No newline at end of file